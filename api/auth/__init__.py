@@ -1,9 +1,11 @@
 from .roles import Role
-from .models import User, UserCreate, UserInDB, Token, TokenData
+from .models import User, UserCreate, UserUpdate, UserInDB, Token, TokenData
 from .oauth2 import (
-    authenticate_user, create_access_token, 
+    authenticate_user, authenticate_user_async, create_access_token, 
     get_current_user, get_current_active_user, 
-    get_password_hash, verify_password, get_user
+    get_password_hash, verify_password, verify_password_async, get_user,
+    verify_and_update_password, verify_and_update_password_async, build_crypt_context,
+    get_principal, get_principal_async, invalidate_principal, get_principal_cache_stats
 )
 from .api_oauth import (
     RoleChecker, require_employee, require_dispatcher,
@@ -17,10 +19,12 @@ from .cookie_auth import (
 
 __all__ = [
     'Role',
-    'User', 'UserCreate', 'UserInDB', 'Token', 'TokenData',
-    'authenticate_user', 'create_access_token',
+    'User', 'UserCreate', 'UserUpdate', 'UserInDB', 'Token', 'TokenData',
+    'authenticate_user', 'authenticate_user_async', 'create_access_token',
     'get_current_user', 'get_current_active_user',
-    'get_password_hash', 'verify_password', 'get_user',
+    'get_password_hash', 'verify_password', 'verify_password_async', 'get_user',
+    'verify_and_update_password', 'verify_and_update_password_async', 'build_crypt_context',
+    'get_principal', 'get_principal_async', 'invalidate_principal', 'get_principal_cache_stats',
     'RoleChecker', 'require_employee', 'require_dispatcher',
     'require_admin', 'require_supervisor', 'allow_guest',
     'get_token_from_cookie', 'get_current_user_from_cookie',
@@ -8,7 +8,7 @@ from jose import JWTError, jwt
 from api.auth.oauth2 import SECRET_KEY, ALGORITHM
 from api.auth.models import User, TokenData
 from api.auth.roles import Role
-from api.auth import get_user
+from api.auth.oauth2 import get_principal_async
 from api.exceptions.auth import AuthenticationException
 
 async def get_token_from_cookie(
@@ -39,17 +39,11 @@ async def get_current_user_from_cookie(token: Optional[str] = Depends(get_token_
         person_id: str = payload.get("person_id")
         token_data = TokenData(username=username, role=Role(role_str) if role_str else None, person_id=person_id)
         
-        user = get_user(token_data.username)
+        user = await get_principal_async(token_data.username, token)
         if user is None or user.disabled:
             return None
         
-        result_user = User(
-            username=user.username,
-            person_id=user.person_id,
-            role=user.role,
-            disabled=user.disabled
-        )
-        return result_user
+        return user
         
     except Exception as e:
         return None
@@ -26,6 +26,11 @@ class UserCreate(UserBase):
     person_id: UUID4
     role: Role = Role.EMPLOYEE
 
+class UserUpdate(BaseModel):
+    """Modell zur Änderung von Rolle oder Status eines Benutzers."""
+    role: Optional[Role] = None
+    disabled: Optional[bool] = None
+
 class UserInDB(UserBase):
     """Modell für einen Benutzer wie er in der Datenbank gespeichert ist."""
     hashed_password: str
@@ -1,29 +1,160 @@
+import asyncio
 import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from pony.orm import db_session
+from starlette.concurrency import run_in_threadpool
 
 from api.auth.models import TokenData, User, UserInDB
 from api.auth.roles import Role
 from database.models.auth import User as DBUser
 from database.models.entities import Person as DBPerson
+from api.utils.cache import TTLCache
+from api.exceptions.auth import LoginThrottledException
 
 # Konfigurationsvariablen
 SECRET_KEY = os.environ.get("SECRET_KEY", "your-secret-key-for-development-only")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Cache der angemeldeten Benutzer, Schlüssel: (Benutzername, Token, Version der Benutzerdaten)
+PRINCIPAL_CACHE_SIZE = int(os.environ.get("AUTH_PRINCIPAL_CACHE_SIZE", "1024"))
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.environ.get("AUTH_PRINCIPAL_CACHE_TTL", "60"))
+_principal_cache = TTLCache(
+    maxsize=PRINCIPAL_CACHE_SIZE, ttl=PRINCIPAL_CACHE_TTL_SECONDS, name="auth_principal"
+)
+
+# Höchstalter der im Speicher gehaltenen Version der Benutzerdaten in Sekunden (höchstens die
+# TTL); so lange kann eine Änderung in einem anderen Worker dort unbemerkt bleiben
+PRINCIPAL_VERSION_CHECK_SECONDS = min(
+    float(os.environ.get("AUTH_PRINCIPAL_VERSION_CHECK", "5")), PRINCIPAL_CACHE_TTL_SECONDS
+)
+_users_version_lock = threading.Lock()
+_users_version: Dict[str, Any] = {"version": None, "checked_at": 0.0, "generation": 0}
+
+# Hash-Verfahren für Passwörter, z.B. "argon2,bcrypt". Das erste wird für neue Hashes verwendet;
+# Hashes anderer Verfahren oder mit abweichenden Kosten werden bei der nächsten Anmeldung ersetzt.
+PASSWORD_SCHEMES = [
+    scheme.strip()
+    for scheme in os.environ.get("PASSWORD_SCHEMES", "bcrypt").split(",")
+    if scheme.strip()
+]
+
+# Kostenfaktor für bcrypt (2^rounds Iterationen)
+BCRYPT_ROUNDS = int(os.environ.get("BCRYPT_ROUNDS", "12"))
+
+# Kosten für argon2 (erfordert argon2-cffi): Durchläufe, Speicher in KiB, Parallelität
+ARGON2_TIME_COST = int(os.environ.get("ARGON2_TIME_COST", "3"))
+ARGON2_MEMORY_COST = int(os.environ.get("ARGON2_MEMORY_COST", "65536"))
+ARGON2_PARALLELISM = int(os.environ.get("ARGON2_PARALLELISM", "4"))
+
+def build_crypt_context(
+    schemes: Optional[List[str]] = None,
+    bcrypt_rounds: Optional[int] = None,
+    argon2_time_cost: Optional[int] = None,
+    argon2_memory_cost: Optional[int] = None,
+    argon2_parallelism: Optional[int] = None
+) -> CryptContext:
+    """
+    Erstellt den Passwort-Hashing-Kontext für die angegebenen Verfahren und Kosten.
+    
+    bcrypt bleibt immer als Verfahren bekannt, damit bestehende Hashes geprüft und ersetzt
+    werden können. Nicht angegebene Werte werden aus der Konfiguration übernommen.
+    
+    Args:
+        schemes: Optional. Die Verfahren, das erste für neue Hashes
+        bcrypt_rounds: Optional. Kostenfaktor für bcrypt
+        argon2_time_cost: Optional. Anzahl der Durchläufe für argon2
+        argon2_memory_cost: Optional. Speicherbedarf für argon2 in KiB
+        argon2_parallelism: Optional. Parallelität für argon2
+        
+    Returns:
+        Der konfigurierte CryptContext
+        
+    Raises:
+        RuntimeError: Wenn argon2 konfiguriert, aber kein argon2-Backend installiert ist
+    """
+    schemes = list(schemes or PASSWORD_SCHEMES)
+    if "bcrypt" not in schemes:
+        schemes.append("bcrypt")
+    
+    # Gleiche Unter- und Obergrenze, damit Hashes mit abweichenden Kosten ersetzt werden
+    rounds = bcrypt_rounds or BCRYPT_ROUNDS
+    settings = {
+        "bcrypt__default_rounds": rounds,
+        "bcrypt__min_rounds": rounds,
+        "bcrypt__max_rounds": rounds,
+    }
+    if "argon2" in schemes:
+        from passlib.hash import argon2
+        if not argon2.has_backend():
+            raise RuntimeError(
+                "PASSWORD_SCHEMES enthält argon2, aber argon2-cffi ist nicht installiert "
+                "(pip install 'passlib[argon2]')."
+            )
+        time_cost = argon2_time_cost or ARGON2_TIME_COST
+        settings.update({
+            "argon2__default_rounds": time_cost,
+            "argon2__min_rounds": time_cost,
+            "argon2__max_rounds": time_cost,
+            "argon2__memory_cost": argon2_memory_cost or ARGON2_MEMORY_COST,
+            "argon2__parallelism": argon2_parallelism or ARGON2_PARALLELISM,
+        })
+    
+    return CryptContext(schemes=schemes, deprecated="auto", **settings)
+
 # Passwort-Hashing-Kontext
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = build_crypt_context()
+
+# Eigener, begrenzter Thread-Pool für Passwort-Hashing und -Prüfung. bcrypt gibt den GIL frei,
+# blockiert aber je Aufruf einen Thread für die volle Rechenzeit. Der Pool hält diese Last vom
+# Event-Loop und vom allgemeinen Thread-Pool der Routen fern. Sind alle Worker belegt und die
+# Warteschlange voll, wird sofort abgelehnt statt weiter zu stauen.
+PASSWORD_HASH_WORKERS = int(
+    os.environ.get("PASSWORD_HASH_WORKERS", str(max(1, (os.cpu_count() or 2) // 2)))
+)
+PASSWORD_HASH_QUEUE_SIZE = int(os.environ.get("PASSWORD_HASH_QUEUE_SIZE", "32"))
+PASSWORD_HASH_RETRY_AFTER_SECONDS = int(os.environ.get("PASSWORD_HASH_RETRY_AFTER", "2"))
+_password_hash_executor = ThreadPoolExecutor(
+    max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+)
+_password_hash_slots = threading.BoundedSemaphore(PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE_SIZE)
 
 # OAuth2-Schema für die Token-Extraktion
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/token")
 
+def _submit_password_task(func: Callable, *args) -> Future:
+    """
+    Reiht eine Hash-Berechnung in den Passwort-Pool ein.
+    
+    Args:
+        func: Die auszuführende Funktion
+        *args: Argumente für die Funktion
+        
+    Returns:
+        Future mit dem Ergebnis
+        
+    Raises:
+        LoginThrottledException: Wenn alle Worker belegt und die Warteschlange voll ist
+    """
+    if not _password_hash_slots.acquire(blocking=False):
+        raise LoginThrottledException(retry_after=PASSWORD_HASH_RETRY_AFTER_SECONDS)
+    try:
+        future = _password_hash_executor.submit(func, *args)
+    except BaseException:
+        _password_hash_slots.release()
+        raise
+    future.add_done_callback(lambda _: _password_hash_slots.release())
+    return future
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Überprüft, ob ein Klartext-Passwort zu einem Hash passt.
@@ -34,8 +165,70 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         
     Returns:
         True, wenn das Passwort übereinstimmt, sonst False
+        
+    Raises:
+        LoginThrottledException: Wenn die Warteschlange für Passwortprüfungen voll ist
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return _submit_password_task(pwd_context.verify, plain_password, hashed_password).result()
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Überprüft ein Passwort im Passwort-Pool, ohne den Event-Loop zu blockieren.
+    
+    Args:
+        plain_password: Das Klartext-Passwort
+        hashed_password: Der gespeicherte Passwort-Hash
+        
+    Returns:
+        True, wenn das Passwort übereinstimmt, sonst False
+        
+    Raises:
+        LoginThrottledException: Wenn die Warteschlange für Passwortprüfungen voll ist
+    """
+    return await asyncio.wrap_future(
+        _submit_password_task(pwd_context.verify, plain_password, hashed_password)
+    )
+
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Überprüft ein Passwort und erzeugt bei Bedarf einen Hash mit dem aktuellen Verfahren.
+    
+    Args:
+        plain_password: Das Klartext-Passwort
+        hashed_password: Der gespeicherte Passwort-Hash
+        
+    Returns:
+        Tupel aus Prüfergebnis und neuem Hash; der neue Hash ist None, wenn der gespeicherte
+        Hash aktuell ist oder das Passwort nicht stimmt
+        
+    Raises:
+        LoginThrottledException: Wenn die Warteschlange für Passwortprüfungen voll ist
+    """
+    return _submit_password_task(
+        pwd_context.verify_and_update, plain_password, hashed_password
+    ).result()
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Wie verify_and_update_password, ohne den Event-Loop zu blockieren.
+    
+    Args:
+        plain_password: Das Klartext-Passwort
+        hashed_password: Der gespeicherte Passwort-Hash
+        
+    Returns:
+        Tupel aus Prüfergebnis und neuem Hash oder None
+        
+    Raises:
+        LoginThrottledException: Wenn die Warteschlange für Passwortprüfungen voll ist
+    """
+    return await asyncio.wrap_future(
+        _submit_password_task(pwd_context.verify_and_update, plain_password, hashed_password)
+    )
 
 def get_password_hash(password: str) -> str:
     """
@@ -46,8 +239,11 @@ def get_password_hash(password: str) -> str:
         
     Returns:
         Der generierte Passwort-Hash
+        
+    Raises:
+        LoginThrottledException: Wenn die Warteschlange für Passwortprüfungen voll ist
     """
-    return pwd_context.hash(password)
+    return _submit_password_task(pwd_context.hash, password).result()
 
 @db_session
 def get_user(username: str) -> Optional[UserInDB]:
@@ -72,23 +268,207 @@ def get_user(username: str) -> Optional[UserInDB]:
         return UserInDB(**user_dict)
     return None
 
+def _known_users_version() -> Optional[int]:
+    """
+    Liefert die Version der Benutzerdaten aus dem Speicher, sofern sie nicht älter als
+    PRINCIPAL_VERSION_CHECK_SECONDS ist, sonst None.
+    """
+    with _users_version_lock:
+        if time.monotonic() - _users_version["checked_at"] < PRINCIPAL_VERSION_CHECK_SECONDS:
+            return _users_version["version"]
+    return None
+
+def _read_users_version() -> int:
+    """
+    Liest die Version der Benutzerdaten aus der Datenbank und merkt sie sich im Speicher.
+    
+    Wurde während des Lesens invalidate_principal aufgerufen, wird die gelesene Version nicht
+    übernommen, da sie vor der Änderung gelesen worden sein kann.
+    """
+    from api.services.data_version_service import DataVersionService, USERS_SCOPE
+    
+    with _users_version_lock:
+        generation = _users_version["generation"]
+    checked_at = time.monotonic()
+    version = DataVersionService.get_versions([USERS_SCOPE])[USERS_SCOPE][0]
+    with _users_version_lock:
+        if _users_version["generation"] == generation:
+            _users_version.update(version=version, checked_at=checked_at)
+    return version
+
+def _load_principal(username: str, token: str, version: int) -> Optional[User]:
+    """
+    Lädt den Benutzer aus der Datenbank und legt ihn unter der angegebenen Version im Cache ab.
+    """
+    user = get_user(username)
+    if user is None:
+        return None
+    
+    principal = User(
+        username=user.username,
+        person_id=user.person_id,
+        role=user.role,
+        disabled=user.disabled
+    )
+    _principal_cache.set((username, token, version), principal)
+    return principal
+
+def get_principal(username: str, token: str) -> Optional[User]:
+    """
+    Liefert den Benutzer zu einem bereits geprüften Token, nach Möglichkeit aus dem Cache.
+    
+    Die Signatur und Gültigkeit des Tokens muss der Aufrufer vorher prüfen. Der Cache-Schlüssel
+    enthält den Änderungszähler der Benutzer. Dieser wird im Speicher gehalten und höchstens
+    alle PRINCIPAL_VERSION_CHECK_SECONDS aus der Datenbank gelesen, sodass ein Treffer ohne
+    Datenbankzugriff auskommt. Ändert ein Worker Rolle oder Status eines Benutzers, verfehlen
+    die übrigen Worker ihre alten Einträge spätestens nach diesem Intervall, der ändernde Worker
+    sofort (siehe invalidate_principal). Ein Eintrag, der nach der Änderung mit veralteten Daten
+    geschrieben wird, liegt unter der alten Version und wird nicht mehr getroffen.
+    
+    Args:
+        username: Der Benutzername aus dem Token
+        token: Das JWT-Token
+        
+    Returns:
+        Ein User-Objekt, wenn der Benutzer gefunden wurde, sonst None
+    """
+    version = _known_users_version()
+    if version is None:
+        version = _read_users_version()
+    principal = _principal_cache.get((username, token, version))
+    if principal is not None:
+        return principal
+    return _load_principal(username, token, version)
+
+async def get_principal_async(username: str, token: str) -> Optional[User]:
+    """
+    Wie get_principal, ohne den Event-Loop zu blockieren.
+    
+    Ein Treffer bei aktueller Version im Speicher wird direkt beantwortet; muss die Version oder
+    der Benutzer aus der Datenbank gelesen werden, geschieht das im Thread-Pool.
+    
+    Args:
+        username: Der Benutzername aus dem Token
+        token: Das JWT-Token
+        
+    Returns:
+        Ein User-Objekt, wenn der Benutzer gefunden wurde, sonst None
+    """
+    version = _known_users_version()
+    if version is None:
+        return await run_in_threadpool(get_principal, username, token)
+    principal = _principal_cache.get((username, token, version))
+    if principal is not None:
+        return principal
+    return await run_in_threadpool(_load_principal, username, token, version)
+
+def invalidate_principal(username: Optional[str] = None) -> int:
+    """
+    Verwirft gecachte Benutzer dieses Workers, z.B. nach Deaktivierung oder Rollenänderung.
+    
+    Muss nach dem Speichern der Änderung aufgerufen werden. Die Version der Benutzerdaten wird
+    beim nächsten Zugriff neu gelesen; für andere Worker wirkt eine Änderung über den
+    Änderungszähler der Benutzer (siehe get_principal).
+    
+    Args:
+        username: Optional. Nur Einträge dieses Benutzers verwerfen; ohne Angabe alle
+        
+    Returns:
+        Anzahl der verworfenen Einträge
+    """
+    with _users_version_lock:
+        _users_version.update(checked_at=0.0, generation=_users_version["generation"] + 1)
+    if username is None:
+        return _principal_cache.invalidate()
+    return _principal_cache.invalidate(lambda key, principal: key[0] == username)
+
+def get_principal_cache_stats() -> Dict[str, Any]:
+    """
+    Gibt Treffer- und Fehlschlagzähler des Benutzer-Caches zurück.
+    
+    Returns:
+        Dictionary mit der Cache-Statistik
+    """
+    return _principal_cache.stats()
+
 @db_session
+def update_password_hash(username: str, old_hash: str, new_hash: str) -> bool:
+    """
+    Ersetzt den Passwort-Hash eines Benutzers nach einer Anmeldung mit veraltetem Hash.
+    
+    Wurde der Hash zwischenzeitlich geändert (z.B. neues Passwort), bleibt er unverändert.
+    
+    Args:
+        username: Der Benutzername
+        old_hash: Der bei der Anmeldung geprüfte Hash
+        new_hash: Der neue Hash
+        
+    Returns:
+        True, wenn der Hash ersetzt wurde, sonst False
+    """
+    db_user = DBUser.get(username=username)
+    if db_user is None or db_user.hashed_password != old_hash:
+        return False
+    db_user.hashed_password = new_hash
+    return True
+
 def authenticate_user(username: str, password: str) -> Union[User, bool]:
     """
     Authentifiziert einen Benutzer anhand von Benutzername und Passwort.
     
+    Die Datenbanksitzung wird nur für das Laden des Benutzers gehalten, nicht während der
+    Passwortprüfung. Ein veralteter Hash wird nach erfolgreicher Prüfung ersetzt.
+    
     Args:
         username: Der Benutzername
         password: Das Passwort
         
     Returns:
         Ein User-Objekt bei erfolgreicher Authentifizierung, sonst False
+        
+    Raises:
+        LoginThrottledException: Wenn die Warteschlange für Passwortprüfungen voll ist
     """
     user = get_user(username)
     if not user:
         return False
-    if not verify_password(password, user.hashed_password):
+    valid, new_hash = verify_and_update_password(password, user.hashed_password)
+    if not valid:
+        return False
+    if new_hash:
+        update_password_hash(user.username, user.hashed_password, new_hash)
+    return User(
+        username=user.username,
+        person_id=user.person_id,
+        role=user.role,
+        disabled=user.disabled
+    )
+
+async def authenticate_user_async(username: str, password: str) -> Union[User, bool]:
+    """
+    Authentifiziert einen Benutzer, ohne den Event-Loop zu blockieren.
+    
+    Der Benutzer wird im allgemeinen Thread-Pool geladen, das Passwort im Passwort-Pool geprüft.
+    Ein veralteter Hash wird nach erfolgreicher Prüfung ersetzt.
+    
+    Args:
+        username: Der Benutzername
+        password: Das Passwort
+        
+    Returns:
+        Ein User-Objekt bei erfolgreicher Authentifizierung, sonst False
+        
+    Raises:
+        LoginThrottledException: Wenn die Warteschlange für Passwortprüfungen voll ist
+    """
+    user = await run_in_threadpool(get_user, username)
+    if not user:
+        return False
+    valid, new_hash = await verify_and_update_password_async(password, user.hashed_password)
+    if not valid:
         return False
+    if new_hash:
+        await run_in_threadpool(update_password_hash, user.username, user.hashed_password, new_hash)
     return User(
         username=user.username,
         person_id=user.person_id,
@@ -145,16 +525,11 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
     except JWTError:
         raise credentials_exception
     
-    user = get_user(token_data.username)
+    user = await get_principal_async(token_data.username, token)
     if user is None:
         raise credentials_exception
     
-    return User(
-        username=user.username,
-        person_id=user.person_id,
-        role=user.role,
-        disabled=user.disabled
-    )
+    return user
 
 async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
     """
@@ -4,7 +4,8 @@ from .base import (
 )
 from .appointment import (
     AppointmentNotFoundException, AppointmentOverlapException,
-    InvalidAppointmentDateException, AppointmentUpdateConflictException
+    InvalidAppointmentDateException, AppointmentUpdateConflictException,
+    InvalidCursorException, InvalidImportBodyException
 )
 from .location import (
     LocationNotFoundException, LocationInUseException,
@@ -33,6 +34,8 @@ __all__ = [
     'AppointmentOverlapException',
     'InvalidAppointmentDateException',
     'AppointmentUpdateConflictException',
+    'InvalidCursorException',
+    'InvalidImportBodyException',
     
     # Location exceptions
     'LocationNotFoundException',
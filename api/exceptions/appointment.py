@@ -56,6 +56,33 @@ class InvalidAppointmentDateException(ValidationException):
         )
 
 
+class InvalidCursorException(ValidationException):
+    """Exception für ungültige oder manipulierte Seiten-Cursor."""
+    
+    def __init__(self, cursor: str):
+        super().__init__(
+            message=(
+                "Der Cursor ist ungültig. Bitte den Wert aus X-Next-Cursor bzw. Link unverändert "
+                "übernehmen."
+            ),
+            errors={"cursor": "Ungültiger Cursor"},
+            details={"invalid_value": cursor},
+        )
+
+
+class InvalidImportBodyException(ValidationException):
+    """Exception für Importdaten, die weder ein JSON-Array noch NDJSON sind."""
+    
+    def __init__(self, reason: str):
+        super().__init__(
+            message=(
+                "Die Importdaten müssen ein JSON-Array von Terminen oder NDJSON (ein Termin je "
+                "Zeile) sein."
+            ),
+            errors={"body": reason},
+        )
+
+
 class AppointmentUpdateConflictException(ConflictException):
     """Exception für Konflikte beim Aktualisieren von Terminen."""
     
@@ -35,4 +35,15 @@ class PersonNotFoundException(AppBaseException):
     def __init__(self, person_id: UUID, **kwargs):
         details = kwargs.pop("details", {})
         details.update({"person_id": str(person_id)})
-        super().__init__(details=details, **kwargs)
\ No newline at end of file
+        super().__init__(details=details, **kwargs)
+
+
+class LoginThrottledException(AppBaseException):
+    """Exception, wenn die Warteschlange für Passwortprüfungen voll ist."""
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_message = "Zu viele gleichzeitige Anmeldungen. Bitte in Kürze erneut versuchen."
+    
+    def __init__(self, retry_after: int, **kwargs):
+        details = kwargs.pop("details", {})
+        details.update({"retry_after": retry_after})
+        super().__init__(details=details, **kwargs)
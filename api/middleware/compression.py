@@ -0,0 +1,215 @@
+"""
+Komprimierung von HTML-, JSON- und anderen Textantworten mit brotli oder gzip.
+
+Wie Starlettes GZipMiddleware, aber mit Auswahl des Verfahrens anhand von Accept-Encoding
+(brotli nur mit installiertem Paket "brotli", siehe Extra "brotli" in pyproject.toml) und nur
+für komprimierbare Inhaltstypen. Gestreamte Antworten (z.B. NDJSON) werden blockweise
+komprimiert und nach jedem Block geleert, damit der Client sie weiterhin fortlaufend erhält.
+Antworten mit gesetztem Content-Encoding (z.B. vorkomprimierte statische Dateien) bleiben
+unverändert.
+"""
+import os
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optionale Abhängigkeit
+    brotli = None
+
+# Antworten unterhalb dieser Größe (Bytes) werden unkomprimiert gesendet
+COMPRESSION_MINIMUM_SIZE = int(os.environ.get("COMPRESSION_MINIMUM_SIZE", "1000"))
+GZIP_COMPRESSLEVEL = int(os.environ.get("GZIP_COMPRESSLEVEL", "6"))
+# Niedrige Stufen sind für dynamische Antworten schnell genug und komprimieren besser als gzip
+BROTLI_QUALITY = int(os.environ.get("BROTLI_QUALITY", "4"))
+
+COMPRESSIBLE_MEDIA_TYPES = frozenset({
+    "text/html", "text/plain", "text/css", "text/javascript", "application/javascript",
+    "application/json", "application/x-ndjson", "image/svg+xml",
+})
+
+
+def parse_accept_encoding(accept_encoding: str) -> dict:
+    """
+    Liest die Verfahren samt Gewichtung aus einem Accept-Encoding-Header.
+
+    Args:
+        accept_encoding: Der Header, z.B. "br;q=1.0, gzip;q=0.8, *;q=0.1"
+
+    Returns:
+        Dictionary Verfahren -> Gewichtung (q); Verfahren mit q=0 fehlen
+    """
+    encodings = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if quality > 0:
+            encodings[name.strip().lower()] = quality
+    return encodings
+
+
+def choose_encoding(
+    accept_encoding: str, brotli_available: bool = brotli is not None
+) -> Optional[str]:
+    """
+    Wählt das Verfahren für eine Antwort: brotli vor gzip bei gleicher Gewichtung.
+
+    Args:
+        accept_encoding: Der Accept-Encoding-Header der Anfrage
+        brotli_available: Ob brotli verwendet werden kann
+
+    Returns:
+        "br", "gzip" oder None
+    """
+    encodings = parse_accept_encoding(accept_encoding)
+    candidates = (["br"] if brotli_available else []) + ["gzip"]
+    accepted = [name for name in candidates if encodings.get(name, encodings.get("*", 0)) > 0]
+    if not accepted:
+        return None
+    return max(accepted, key=lambda name: encodings.get(name, encodings.get("*", 0)))
+
+
+class _GzipCompressor:
+    def __init__(self, level: int):
+        # wbits=31: gzip-Format mit Header und Prüfsumme
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliCompressor:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+class CompressionMiddleware:
+    """
+    ASGI-Middleware, die Textantworten ab einer Mindestgröße mit brotli oder gzip komprimiert.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = COMPRESSION_MINIMUM_SIZE,
+        gzip_level: int = GZIP_COMPRESSLEVEL,
+        brotli_quality: int = BROTLI_QUALITY
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+            if encoding is not None:
+                responder = _CompressionResponder(self.app, encoding, self)
+                await responder(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+    def create_compressor(self, encoding: str):
+        if encoding == "br":
+            return _BrotliCompressor(self.brotli_quality)
+        return _GzipCompressor(self.gzip_level)
+
+
+class _CompressionResponder:
+    def __init__(self, app: ASGIApp, encoding: str, middleware: CompressionMiddleware) -> None:
+        self.app = app
+        self.encoding = encoding
+        self.middleware = middleware
+        self.send: Optional[Send] = None
+        self.initial_message: Message = {}
+        self.started = False
+        self.passthrough = False
+        self.compressor = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    def _should_compress(self, message: Message) -> bool:
+        headers = Headers(raw=message["headers"])
+        if "content-encoding" in headers or message.get("status", 200) in (204, 206, 304):
+            return False
+        # Teilantworten beziehen sich auf Byte-Bereiche der unkomprimierten Darstellung
+        if "content-range" in headers:
+            return False
+        media_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        return media_type in COMPRESSIBLE_MEDIA_TYPES
+
+    def _set_encoding_headers(self, content_length: Optional[int]) -> None:
+        headers = MutableHeaders(raw=self.initial_message["headers"])
+        headers["Content-Encoding"] = self.encoding
+        if content_length is None:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(content_length)
+        headers.add_vary_header("Accept-Encoding")
+
+    async def send_compressed(self, message: Message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            # Header erst senden, wenn feststeht, ob komprimiert wird
+            self.initial_message = message
+            self.passthrough = not self._should_compress(message)
+            return
+        if message_type != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.passthrough:
+            if not self.started:
+                self.started = True
+                await self.send(self.initial_message)
+            await self.send(message)
+            return
+
+        if not self.started:
+            self.started = True
+            if len(body) < self.middleware.minimum_size and not more_body:
+                # Kleine Antworten unkomprimiert senden
+                self.passthrough = True
+                await self.send(self.initial_message)
+                await self.send(message)
+                return
+
+            self.compressor = self.middleware.create_compressor(self.encoding)
+            if not more_body:
+                body = self.compressor.finish(body)
+                self._set_encoding_headers(len(body))
+            else:
+                body = self.compressor.compress(body)
+                self._set_encoding_headers(None)
+            await self.send(self.initial_message)
+            await self.send({**message, "body": body})
+            return
+
+        # Weitere Blöcke einer gestreamten Antwort
+        body = self.compressor.compress(body) if more_body else self.compressor.finish(body)
+        await self.send({**message, "body": body})
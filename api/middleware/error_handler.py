@@ -55,9 +55,9 @@ def _is_web_request(request: Request) -> bool:
     Returns:
         True, wenn es sich um eine Web-Anfrage handelt, sonst False.
     """
-    # Browser-Anfrage erkennen: Pfade ohne /api/ sind Web-Anfragen
+    # Browser-Anfrage erkennen: Pfade ohne /api/ sind Web-Anfragen, außer /metrics für Prometheus
     path = request.url.path
-    return not path.startswith("/api/")
+    return not path.startswith("/api/") and path != "/metrics"
 
 
 async def exception_handler(request: Request, exc: Exception):
@@ -91,21 +91,19 @@ async def exception_handler(request: Request, exc: Exception):
                     
                     # Bei 401 auf der Startseite nur 200 zurückgeben und Template rendern
                     # (das Login-Modal wird vom Template angezeigt)
-                    from api.services import CalendarService
+                    from api.services import CalendarService, DataVersionService
                     calendar_service = CalendarService()
                     
                     # Aktuelles Datum
                     from datetime import date
                     today = date.today()
                     
-                    # Kalenderdaten für den aktuellen Monat erstellen
-                    calendar_weeks = calendar_service.get_calendar_data(today.year, today.month)
+                    # Änderungen anderer Worker erkennen, bevor der Monatscache gelesen wird
+                    DataVersionService.refresh_month(today.year, today.month)
                     
-                    # Termine in den Kalender einfügen ohne Filter
-                    calendar_weeks = calendar_service.fill_calendar_with_appointments(calendar_weeks)
-                    
-                    # Filter-Optionen laden
-                    filter_options = calendar_service.get_filter_options()
+                    # Kalenderdaten und Filter-Optionen für den aktuellen Monat laden (ohne Filter)
+                    page = calendar_service.get_calendar_page(today.year, today.month)
+                    filter_options = page["filter_options"]
                     
                     response = templates.TemplateResponse(
                         "index.html",
@@ -113,16 +111,17 @@ async def exception_handler(request: Request, exc: Exception):
                             "request": request,
                             "show_login_modal": True,
                             "required_role": getattr(request.state, "required_role", None),
-                            "calendar_weeks": calendar_weeks,
+                            "calendar_weeks": page["calendar_weeks"],
                             "year": today.year,
                             "month": today.month,
-                            "month_name": calendar_service.get_month_name(today.month),
+                            "month_name": page["month_name"],
                             "today": today,
-                            "active_filters": {},
+                            "active_filters": page["active_filters"],
                             "filter_person_id": None,
                             "filter_location_id": None,
                             "all_persons": filter_options["all_persons"],
                             "all_locations": filter_options["all_locations"],
+                            "filter_options_version": filter_options["version"],
                             "menu_section": MenuDisplaySection.NONE
                         }
                     )
@@ -181,9 +180,11 @@ async def exception_handler(request: Request, exc: Exception):
                 details=exc.details
             )
         else:
+            retry_after = exc.details.get("retry_after")
             return JSONResponse(
                 status_code=exc.status_code,
-                content=exc.to_dict()
+                content=exc.to_dict(),
+                headers={"Retry-After": str(retry_after)} if retry_after is not None else None
             )
     
     # Bei Validierungsfehlern (Pydantic)
@@ -0,0 +1,93 @@
+"""
+Misst jede HTTP-Anfrage (Antwortzeit, SQL-Anweisungen, Renderzeit der Templates) und setzt den
+Server-Timing-Header, sodass die Werte in den Entwicklerwerkzeugen des Browsers erscheinen.
+
+Überschreitet eine Anfrage SQL_STATEMENT_WARN_THRESHOLD Anweisungen, wird sie protokolliert;
+das deutet meist auf N+1-Abfragen hin (z.B. Lazy Loading in einer Schleife).
+"""
+import logging
+import os
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api.utils.metrics import MetricsRegistry, RequestMetrics, end_request, registry, start_request
+
+logger = logging.getLogger(__name__)
+
+# Server-Timing-Header senden; in Produktion ggf. abschalten, da er interne Zeiten offenlegt
+SERVER_TIMING_ENABLED = os.environ.get("SERVER_TIMING_ENABLED", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+# Ab dieser Anzahl SQL-Anweisungen je Anfrage wird eine Warnung protokolliert; 0 = deaktiviert
+SQL_STATEMENT_WARN_THRESHOLD = int(os.environ.get("SQL_STATEMENT_WARN_THRESHOLD", "50"))
+
+# Label für Anfragen ohne passende Route (404, statische Dateien)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def server_timing_header(metrics: RequestMetrics) -> str:
+    """
+    Args:
+        metrics: Die Messwerte der Anfrage
+
+    Returns:
+        Der Wert des Server-Timing-Headers, Dauern in Millisekunden
+    """
+    return (
+        f'db;dur={metrics.sql_seconds * 1000:.1f};desc="{metrics.sql_count} SQL", '
+        f"tpl;dur={metrics.template_seconds * 1000:.1f}, "
+        f"app;dur={metrics.elapsed() * 1000:.1f}"
+    )
+
+
+class MetricsMiddleware:
+    """
+    ASGI-Middleware, die die Messwerte jeder Anfrage in die Metrik-Registry überträgt.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        metrics_registry: MetricsRegistry = registry,
+        server_timing: bool = SERVER_TIMING_ENABLED,
+        warn_threshold: int = SQL_STATEMENT_WARN_THRESHOLD
+    ) -> None:
+        self.app = app
+        self.registry = metrics_registry
+        self.server_timing = server_timing
+        self.warn_threshold = warn_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics, token = start_request()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.server_timing:
+                    MutableHeaders(scope=message).append(
+                        "Server-Timing", server_timing_header(metrics)
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            end_request(token)
+            # Das Pfadmuster setzt FastAPI beim Routing in den Scope
+            route = getattr(scope.get("route"), "path", None) or UNMATCHED_ROUTE
+            self.registry.observe_request(scope["method"], route, status_code, metrics)
+            if self.warn_threshold and metrics.sql_count >= self.warn_threshold:
+                logger.warning(
+                    f"{metrics.sql_count} SQL-Anweisungen ({metrics.sql_seconds * 1000:.0f} ms) "
+                    f"für {scope['method']} {route}"
+                )
@@ -2,7 +2,7 @@ from datetime import datetime, date, time, timedelta
 from typing import List, Optional, Any
 from uuid import UUID
 
-from pydantic import BaseModel, Json, Field, field_validator, ConfigDict
+from pydantic import BaseModel, Json, Field, field_validator, model_validator, ConfigDict
 
 
 class BaseSchema(BaseModel):
@@ -123,3 +123,131 @@ class PlanDetail(BaseSchema):
     @field_validator('appointments')
     def set_to_list(cls, v):
         return list(v)
+
+
+class PlanSummary(BaseSchema):
+    """Plan mit Kennzahlen seiner Termine für Übersichten, ohne die Termine selbst."""
+    name: str
+    notes: str = ""
+    plan_period: PlanPeriod
+    appointment_count: int = 0
+    person_count: int = 0
+    first_date: Optional[date] = None
+    last_date: Optional[date] = None
+
+
+class ConflictEntry(BaseModel):
+    """Überschneidung zweier Termine an einem Arbeitsort oder bei einer Person."""
+    kind: str
+    resource_id: UUID
+    first_appointment_id: UUID
+    second_appointment_id: UUID
+    overlap_start: datetime
+    overlap_end: datetime
+
+
+class PlanPeriodConflictReport(BaseModel):
+    """Konfliktbericht für alle Termine einer Planungsperiode."""
+    plan_period_id: UUID
+    appointment_count: int
+    location_conflict_count: int
+    person_conflict_count: int
+    conflicts: List[ConflictEntry]
+    truncated: bool = False
+
+
+class AppointmentImportRow(BaseModel):
+    """Eine Zeile des Terminimports; die Dauer wird als delta oder über end_time angegeben."""
+    date: date
+    start_time: time
+    delta: Optional[timedelta] = None
+    end_time: Optional[time] = None
+    location_id: UUID
+    person_ids: List[UUID] = Field(default_factory=list)
+    guests: list[str] = Field(default_factory=list)
+    notes: str = ""
+
+    @model_validator(mode='after')
+    def set_delta(self):
+        """
+        Ermittelt die Dauer aus der Endzeit; liegt sie nicht nach der Startzeit, endet der Termin
+        am Folgetag.
+        """
+        if self.delta is None:
+            if self.end_time is None:
+                raise ValueError("Entweder delta oder end_time muss angegeben werden")
+            start = datetime.combine(self.date, self.start_time)
+            end = datetime.combine(self.date, self.end_time)
+            self.delta = end - start if end > start else end + timedelta(days=1) - start
+        if self.delta <= timedelta(0):
+            raise ValueError("Die Dauer muss positiv sein")
+        return self
+
+
+class AppointmentImportError(BaseModel):
+    """Fehler einer einzelnen Importzeile; die übrigen Zeilen werden trotzdem importiert."""
+    row: int
+    message: str
+    field: Optional[str] = None
+    details: Optional[dict[str, Any]] = None
+
+
+class AppointmentImportResult(BaseModel):
+    """Ergebnis eines Terminimports."""
+    plan_period_id: UUID
+    received: int
+    created: int
+    failed: int
+    created_ids: List[UUID]
+    errors: List[AppointmentImportError]
+
+
+class PlanPeriodSyncAppointment(BaseModel):
+    """
+    Termin einer synchronisierten Planungsperiode mit dem stabilen Schlüssel des externen Systems.
+    """
+    external_id: str = Field(min_length=1, max_length=255)
+    date: date
+    start_time: time
+    delta: timedelta
+    location_id: UUID
+    person_ids: List[UUID] = Field(default_factory=list)
+    guests: list[str] = Field(default_factory=list)
+    notes: str = ""
+
+
+class PlanPeriodSyncPlan(BaseModel):
+    """
+    Plan einer synchronisierten Planungsperiode; ohne appointment_external_ids umfasst er alle
+    Termine.
+    """
+    external_id: str = Field(min_length=1, max_length=255)
+    name: str
+    notes: str = ""
+    appointment_external_ids: Optional[List[str]] = None
+
+
+class PlanPeriodSync(BaseModel):
+    """Vollständiger Stand einer Planungsperiode aus einem externen System."""
+    external_id: str = Field(min_length=1, max_length=255)
+    name: str
+    start_date: date
+    end_date: date
+    plan: Optional[PlanPeriodSyncPlan] = None
+    appointments: List[PlanPeriodSyncAppointment] = Field(default_factory=list)
+
+
+class PlanPeriodSyncResult(BaseModel):
+    """Ergebnis eines Abgleichs: ausgeführte Änderungen je Entität und Verknüpfung."""
+    plan_period_id: UUID
+    plan_id: Optional[UUID] = None
+    period: str
+    plan: Optional[str] = None
+    appointments_created: int = 0
+    appointments_updated: int = 0
+    appointments_deleted: int = 0
+    appointments_unchanged: int = 0
+    person_links_added: int = 0
+    person_links_removed: int = 0
+    plan_links_added: int = 0
+    plan_links_removed: int = 0
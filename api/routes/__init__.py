@@ -1,4 +1,5 @@
 from .api import router as api_router
 from .web import router as web_router
+from .metrics import router as metrics_router
 
-__all__ = ['api_router', 'web_router']
+__all__ = ['api_router', 'web_router', 'metrics_router']
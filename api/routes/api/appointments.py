@@ -2,34 +2,67 @@ from datetime import date
 from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Query, Path, HTTPException, Depends
+from fastapi import APIRouter, Query, Path, HTTPException, Depends, Request
+from fastapi.responses import StreamingResponse
 
 from api.models import schemas
-from api.services import AppointmentService
+from api.services import AppointmentService, DataVersionService
+from api.services.appointment_service import APPOINTMENT_PAGE_SIZE, APPOINTMENT_PAGE_SIZE_MAX
+from api.utils.json_response import model_json_response
 
 router = APIRouter()
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
 
 @router.get("/", response_model=List[schemas.Appointment])
 def get_appointments(
+    request: Request,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     location_id: Optional[UUID] = None,
     person_id: Optional[UUID] = None,
-    plan_period_id: Optional[UUID] = None
+    plan_period_id: Optional[UUID] = None,
+    cursor: Optional[str] = Query(
+        None, description="Cursor der Folgeseite aus X-Next-Cursor bzw. Link"
+    ),
+    limit: int = Query(
+        APPOINTMENT_PAGE_SIZE, ge=1, le=APPOINTMENT_PAGE_SIZE_MAX, description="Termine je Seite"
+    ),
 ):
     """
-    Liefert eine Liste aller Termine, die den Filterkriterien entsprechen.
+    Liefert die Termine, die den Filterkriterien entsprechen, seitenweise nach Datum, Startzeit
+    und ID.
+    
+    Ist eine weitere Seite vorhanden, enthalten die Header X-Next-Cursor und Link (rel="next")
+    deren Cursor bzw. URL. Mit "Accept: application/x-ndjson" werden stattdessen alle Termine ab
+    dem Cursor als NDJSON gestreamt (ein Termin je Zeile, limit entfällt).
     """
     # AppointmentService nutzen
     appointment_service = AppointmentService()
-    return appointment_service.get_appointments(
+    filters = dict(
         start_date=start_date,
         end_date=end_date,
         location_id=location_id,
         person_id=person_id,
         plan_period_id=plan_period_id
     )
+    
+    if NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+        appointments = appointment_service.iter_appointments(**filters, cursor=cursor)
+        return StreamingResponse(
+            (appointment.model_dump_json() + "\n" for appointment in appointments),
+            media_type=NDJSON_MEDIA_TYPE
+        )
+    
+    appointments, next_cursor = appointment_service.get_appointments_page(
+        **filters, cursor=cursor, limit=limit
+    )
+    headers = {}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+        headers["Link"] = f'<{request.url.include_query_params(cursor=next_cursor)}>; rel="next"'
+    return model_json_response(appointments, List[schemas.Appointment], headers=headers)
 
 
 @router.get("/{appointment_id}", response_model=schemas.AppointmentDetail)
@@ -44,10 +77,10 @@ def get_appointment(appointment_id: UUID = Path(...)):
     if not appointment:
         raise HTTPException(status_code=404, detail="Termin nicht gefunden")
     
-    return appointment
+    return model_json_response(appointment, schemas.AppointmentDetail)
 
 
-@router.get("/by-date/{date_str}", response_model=List[schemas.Appointment])
+@router.get("/by-date/{date_str}", response_model=List[schemas.AppointmentDetail])
 def get_appointments_by_date(date_str: str = Path(...)):
     """
     Liefert alle Termine für ein bestimmtes Datum.
@@ -64,13 +97,22 @@ def get_appointments_by_date(date_str: str = Path(...)):
     
     # AppointmentService nutzen
     appointment_service = AppointmentService()
-    return appointment_service.get_appointments_by_date(date_str)
+    return model_json_response(
+        appointment_service.get_appointments_by_date(date_str), List[schemas.AppointmentDetail]
+    )
 
 
 @router.get("/by-month/{year}/{month}", response_model=List[schemas.Appointment])
-def get_appointments_by_month(year: int = Path(...), month: int = Path(...)):
+def get_appointments_by_month(
+    request: Request,
+    year: int = Path(...),
+    month: int = Path(...)
+):
     """
     Liefert alle Termine für einen bestimmten Monat.
+    
+    Unterstützt bedingte Anfragen: Bei unverändertem Monat (If-None-Match bzw.
+    If-Modified-Since) wird 304 ohne Laden und Serialisieren geliefert.
     """
     if not (1 <= month <= 12):
         raise HTTPException(
@@ -78,6 +120,14 @@ def get_appointments_by_month(year: int = Path(...), month: int = Path(...)):
             detail="Ungültiger Monat. Der Monat muss zwischen 1 und 12 liegen."
         )
     
+    validators = DataVersionService.get_validators(
+        [DataVersionService.month_scope(year, month)], request.url.path
+    )
+    if validators.is_fresh(request):
+        return validators.not_modified()
+    
     # AppointmentService nutzen
     appointment_service = AppointmentService()
-    return appointment_service.get_appointments_by_month(year, month)
+    return validators.apply(model_json_response(
+        appointment_service.get_appointments_by_month(year, month), List[schemas.Appointment]
+    ))
@@ -1,10 +1,12 @@
 from datetime import timedelta
+from typing import Any, Dict
+
 from fastapi import APIRouter, Depends
 from fastapi.security import OAuth2PasswordRequestForm
 
 from api.auth import (
-    authenticate_user, create_access_token,
-    Token, User, UserCreate, require_admin, require_employee
+    authenticate_user_async, create_access_token,
+    Token, User, UserCreate, UserUpdate, require_admin, require_employee
 )
 from api.services import AuthService
 from api.exceptions.auth import AuthenticationException
@@ -12,11 +14,12 @@ from api.exceptions.auth import AuthenticationException
 router = APIRouter()
 
 @router.post("/token", response_model=Token)
-def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends()):
+async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends()):
     """
     Endpoint zum Abrufen eines Access-Tokens.
+    Ist die Warteschlange für Passwortprüfungen voll, wird mit 503 und Retry-After geantwortet.
     """
-    user = authenticate_user(form_data.username, form_data.password)
+    user = await authenticate_user_async(form_data.username, form_data.password)
     if not user:
         raise AuthenticationException(
             message="Ungültiger Benutzername oder Passwort",
@@ -44,3 +47,19 @@ def read_users_me(current_user: User = Depends(require_employee)):
     Gibt den aktuellen Benutzer zurück.
     """
     return current_user
+
+@router.patch("/users/{username}", response_model=User)
+def update_user(username: str, user_data: UserUpdate, current_user: User = Depends(require_admin)):
+    """
+    Ändert Rolle oder Status eines Benutzers.
+    Nur Administratoren können Benutzer ändern.
+    """
+    return AuthService.update_user(username, user_data)
+
+@router.get("/principal-cache", response_model=Dict[str, Any])
+def read_principal_cache_stats(current_user: User = Depends(require_admin)):
+    """
+    Gibt die Statistik des Caches der angemeldeten Benutzer zurück (Treffer, Fehlschläge,
+    Trefferquote).
+    """
+    return AuthService.get_principal_cache_stats()
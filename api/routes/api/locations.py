@@ -5,6 +5,7 @@ from fastapi import APIRouter, Path, HTTPException
 
 from api.models import schemas
 from api.services import LocationService
+from api.utils.json_response import model_json_response
 
 router = APIRouter()
 
@@ -15,7 +16,9 @@ def get_locations():
     """
     # LocationService nutzen, um alle Arbeitsorte zu laden
     location_service = LocationService()
-    return location_service.get_all_locations()
+    return model_json_response(
+        location_service.get_all_locations(), List[schemas.LocationOfWorkDetail]
+    )
 
 
 @router.get("/{location_id}", response_model=schemas.LocationOfWorkDetail)
@@ -30,4 +33,4 @@ def get_location(location_id: UUID = Path(...)):
     if not location:
         raise HTTPException(status_code=404, detail="Arbeitsort nicht gefunden")
     
-    return location
+    return model_json_response(location, schemas.LocationOfWorkDetail)
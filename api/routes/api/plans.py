@@ -1,25 +1,169 @@
-from typing import List, Optional
+import json
+from typing import Any, Iterable, Iterator, List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Path, HTTPException
+from anyio import from_thread
+from fastapi import APIRouter, Path, Query, HTTPException, Depends, Request
+from fastapi.concurrency import run_in_threadpool
 
 from api.models import schemas
-from api.services import PlanService
+from api.services import PlanService, AppointmentImportService
+from api.services.appointment_import_service import UnparsableRow
+from api.exceptions.appointment import InvalidImportBodyException
+from api.auth import require_dispatcher
+from api.utils.json_response import model_json_response
 
 router = APIRouter()
 
-@router.get("/", response_model=List[schemas.Plan])
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def iter_request_chunks(request: Request) -> Iterator[bytes]:
+    """
+    Liest den Anfragekörper stückweise aus einem Worker-Thread (run_in_threadpool).
+
+    Jedes Teilstück wird erst vom Event-Loop angefordert, wenn das vorherige verarbeitet ist; der
+    Körper liegt daher nie vollständig im Speicher.
+    """
+    stream = request.stream()
+    while True:
+        chunk = from_thread.run(anext, stream, None)
+        if chunk is None:
+            return
+        if chunk:
+            yield chunk
+
+
+def iter_ndjson_rows(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """
+    Liest die Zeilen eines NDJSON-Imports, sobald sie in den Teilstücken vollständig vorliegen.
+
+    Ungültige Zeilen werden als UnparsableRow weitergegeben und als Fehler dieser Zeile
+    gemeldet. Leerzeilen werden übersprungen.
+    """
+    def parse(lines: List[bytes]) -> Iterator[Any]:
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                yield UnparsableRow(f"Ungültiges JSON: {e}")
+
+    pending = b""
+    for chunk in chunks:
+        # Nur die unvollständige letzte Zeile bis zum nächsten Teilstück aufheben
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        yield from parse(lines)
+    yield from parse([pending])
+
+
+def iter_json_array_rows(body: bytes) -> Iterator[Any]:
+    """
+    Liest die Zeilen eines Terminimports aus einem JSON-Array.
+
+    Raises:
+        InvalidImportBodyException: Wenn kein gültiges JSON-Array vorliegt
+    """
+    try:
+        rows = json.loads(body)
+    except ValueError as e:
+        raise InvalidImportBodyException(reason=f"Ungültiges JSON: {e}")
+    if not isinstance(rows, list):
+        raise InvalidImportBodyException(reason="Es wird ein JSON-Array erwartet")
+    return iter(rows)
+
+
+@router.get("/", response_model=List[schemas.PlanSummary])
 def get_plans(plan_period_id: Optional[UUID] = None):
     """
-    Liefert eine Liste aller Pläne, optional gefiltert nach Planungsperiode.
+    Liefert eine Übersicht aller Pläne mit Kennzahlen ihrer Termine, optional gefiltert nach
+    Planungsperiode. Die Termine eines Plans liefert /api/plans/{plan_id}.
     """
     # PlanService nutzen
     plan_service = PlanService()
     
     if plan_period_id:
-        return plan_service.get_plans_by_period(plan_period_id)
+        plans = plan_service.get_plans_by_period(plan_period_id)
     else:
-        return plan_service.get_all_plans()
+        plans = plan_service.get_all_plans()
+    return model_json_response(plans, List[schemas.PlanSummary])
+
+
+@router.get(
+    "/periods/{plan_period_id}/conflicts",
+    response_model=schemas.PlanPeriodConflictReport,
+    dependencies=[Depends(require_dispatcher)]
+)
+def get_plan_period_conflicts(
+    plan_period_id: UUID = Path(...),
+    limit: int = Query(
+        1000, ge=0, le=10000, description="Maximale Anzahl der aufgeführten Konflikte"
+    ),
+):
+    """
+    Liefert alle Überschneidungen je Arbeitsort und je Person innerhalb einer Planungsperiode.
+    """
+    # PlanService nutzen
+    plan_service = PlanService()
+    return model_json_response(
+        plan_service.get_plan_period_conflicts(plan_period_id, limit=limit),
+        schemas.PlanPeriodConflictReport,
+    )
+
+
+@router.post(
+    "/periods/{plan_period_id}/import",
+    response_model=schemas.AppointmentImportResult,
+    dependencies=[Depends(require_dispatcher)]
+)
+async def import_appointments(
+    request: Request,
+    plan_period_id: UUID = Path(...),
+    check_overlaps: bool = Query(
+        True, description="Zeilen mit Überschneidungen an Ort oder Person ablehnen"
+    ),
+):
+    """
+    Importiert Termine in eine Planungsperiode, als JSON-Array oder als NDJSON
+    ("Content-Type: application/x-ndjson", ein Termin je Zeile).
+
+    Die Termine werden blockweise geprüft und geschrieben. Fehlerhafte Zeilen (ungültige Daten,
+    unbekannte Orte oder Personen, Überschneidungen) werden mit ihrer Position (ab 0) in errors
+    gemeldet; die übrigen Zeilen werden trotzdem angelegt. NDJSON wird während des Imports aus
+    dem Anfragestrom gelesen, ein JSON-Array vorab vollständig.
+    """
+    if NDJSON_MEDIA_TYPE in request.headers.get("content-type", ""):
+        rows = iter_ndjson_rows(iter_request_chunks(request))
+    else:
+        rows = iter_json_array_rows(await request.body())
+    result = await run_in_threadpool(
+        AppointmentImportService.import_appointments,
+        plan_period_id,
+        rows,
+        check_overlaps=check_overlaps,
+    )
+    return model_json_response(result, schemas.AppointmentImportResult)
+
+
+@router.put(
+    "/periods/sync",
+    response_model=schemas.PlanPeriodSyncResult,
+    dependencies=[Depends(require_dispatcher)]
+)
+def sync_plan_period(sync_data: schemas.PlanPeriodSync):
+    """
+    Gleicht eine Planungsperiode mit Plan und Terminen mit dem Stand eines externen Systems ab.
+    
+    Zuordnung über die externen Schlüssel; geschrieben werden nur Änderungen. Wiederholtes
+    Senden desselben Standes ändert nichts.
+    """
+    # PlanService nutzen
+    plan_service = PlanService()
+    return model_json_response(
+        plan_service.sync_plan_period(sync_data), schemas.PlanPeriodSyncResult
+    )
 
 
 @router.get("/{plan_id}", response_model=schemas.PlanDetail)
@@ -34,4 +178,4 @@ def get_plan(plan_id: UUID = Path(...)):
     if not plan_detail:
         raise HTTPException(status_code=404, detail="Plan nicht gefunden")
     
-    return plan_detail
+    return model_json_response(plan_detail, schemas.PlanDetail)
@@ -0,0 +1,58 @@
+import os
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+from api.auth import get_current_active_user, get_current_user, require_admin
+from api.services import AuthService, CalendarService
+from api.utils.metrics import registry
+
+# Zugriff auf /metrics: Mit METRICS_TOKEN nur mit diesem Token (Prometheus:
+# authorization/bearer_token), sonst nur für Administratoren. METRICS_PUBLIC=true gibt den
+# Endpunkt ohne Anmeldung frei, z.B. wenn er nur im internen Netz erreichbar ist.
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+METRICS_PUBLIC = os.environ.get("METRICS_PUBLIC", "false").lower() in ("1", "true", "yes")
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+router = APIRouter()
+
+registry.register_cache_collector(lambda: [AuthService.get_principal_cache_stats()])
+registry.register_cache_collector(CalendarService.get_cache_stats)
+
+
+async def verify_metrics_access(authorization: Optional[str] = Header(None)) -> None:
+    """
+    Prüft den Zugriff auf /metrics: METRICS_TOKEN, falls gesetzt, sonst die Rolle Administrator.
+
+    Raises:
+        HTTPException: Wenn das Token fehlt oder ungültig ist oder die Rolle nicht ausreicht
+    """
+    if METRICS_TOKEN:
+        if not secrets.compare_digest(authorization or "", f"Bearer {METRICS_TOKEN}"):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Ungültiges Token")
+        return
+    if METRICS_PUBLIC:
+        return
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Nicht angemeldet",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    require_admin(await get_current_active_user(await get_current_user(token)))
+
+
+@router.get(
+    "/metrics", response_class=PlainTextResponse, include_in_schema=False,
+    dependencies=[Depends(verify_metrics_access)]
+)
+def read_metrics():
+    """
+    Gibt Antwortzeiten, SQL-Anweisungen, Renderzeiten und Cache-Statistiken im
+    Prometheus-Textformat aus.
+    """
+    return PlainTextResponse(registry.render_prometheus(), media_type=PROMETHEUS_MEDIA_TYPE)
@@ -4,15 +4,15 @@ from typing import Optional
 from fastapi import APIRouter, Depends, Request, Form, HTTPException, Response
 from fastapi.responses import HTMLResponse, JSONResponse
 
-from api.auth import authenticate_user, create_access_token
+from api.auth import authenticate_user_async, create_access_token
 from api.templates import templates
-from api.exceptions.auth import AuthenticationException
+from api.exceptions.auth import AuthenticationException, LoginThrottledException
 
 router = APIRouter()
 
 
 @router.post("/web-token", response_class=HTMLResponse)
-def login_web_form(
+async def login_web_form(
     request: Request, 
     response: Response,
     username: str = Form(...), 
@@ -22,7 +22,15 @@ def login_web_form(
     Endpoint für Web-Authentifizierung via Login-Formular.
     Setzt ein Cookie mit dem Token und liefert eine HTML-Antwort zurück.
     """
-    user = authenticate_user(username, password)
+    try:
+        user = await authenticate_user_async(username, password)
+    except LoginThrottledException as e:
+        # Als Fragment mit Status 200 zurückgeben, damit HTMX die Meldung anzeigt
+        return templates.TemplateResponse(
+            "login_error.html",
+            {"request": request, "message": e.message},
+            headers={"Retry-After": str(e.details["retry_after"])}
+        )
     if not user:
         # HTML-Fragment für Fehlermeldung zurückgeben
         return templates.TemplateResponse(
@@ -5,14 +5,21 @@ from uuid import UUID
 from fastapi import APIRouter, Request, Query, HTTPException, Depends
 from fastapi.responses import HTMLResponse
 
-from api.services import CalendarService, AppointmentService
-from api.templates import templates
+from api.services import CalendarService, AppointmentService, DataVersionService
+from api.services.data_version_service import APPOINTMENTS_SCOPE, PERSONS_SCOPE, LOCATIONS_SCOPE
+from api.templates import templates, render_day_view
 from api.auth.cookie_auth import require_web_employee
 from api.auth.models import User
 from api.utils import MenuDisplaySection
 
 router = APIRouter()
 
+
+def _user_key(user: Optional[User]) -> str:
+    """Benutzeranteil des ETags, da die Fragmente benutzer- und rollenabhängig gerendert werden."""
+    return f"{user.username}:{user.role}" if user else "-"
+
+
 @router.get("/", response_class=HTMLResponse)
 def calendar_index(
     request: Request, 
@@ -36,25 +43,18 @@ def calendar_index(
     # Sicherstellen, dass Month zwischen 1 und 12 liegt
     if display_month < 1 or display_month > 12:
         display_month = today.month
-    
-    # Kalenderdaten für den angegebenen Monat erstellen
-    calendar_weeks = calendar_service.get_calendar_data(display_year, display_month)
-    
-    # Termine in den Kalender einfügen mit optionalen Filtern
-    calendar_weeks = calendar_service.fill_calendar_with_appointments(
-        calendar_weeks, 
-        filter_person_id=filter_person_id, 
-        filter_location_id=filter_location_id
-    )
-    
-    # Aktive Filter für die Anzeige ermitteln
-    active_filters = calendar_service.get_active_filters(
+
+    # Änderungen anderer Worker erkennen, bevor die Monatsansicht aus dem Cache gelesen wird
+    DataVersionService.refresh_month(display_year, display_month)
+
+    # Kalenderdaten (optional gefiltert), aktive Filter und Filter-Optionen in einer Session laden
+    page = calendar_service.get_calendar_page(
+        display_year,
+        display_month,
         filter_person_id=filter_person_id,
         filter_location_id=filter_location_id
     )
-    
-    # Filter-Optionen laden
-    filter_options = calendar_service.get_filter_options()
+    filter_options = page["filter_options"]
     
     # Prüfen, ob login_modal angezeigt werden soll
     show_login_modal = getattr(request.state, "show_login_modal", False)
@@ -65,16 +65,17 @@ def calendar_index(
         "index.html",
         {
             "request": request,
-            "calendar_weeks": calendar_weeks,
+            "calendar_weeks": page["calendar_weeks"],
             "year": display_year,
             "month": display_month,
-            "month_name": calendar_service.get_month_name(display_month),
+            "month_name": page["month_name"],
             "today": today,
-            "active_filters": active_filters,
+            "active_filters": page["active_filters"],
             "filter_person_id": filter_person_id,
             "filter_location_id": filter_location_id,
             "all_persons": filter_options["all_persons"],
             "all_locations": filter_options["all_locations"],
+            "filter_options_version": filter_options["version"],
             "show_login_modal": show_login_modal,
             "required_role": required_role,
             "user": user,
@@ -91,9 +92,18 @@ def calendar_partial(
     year: int = Query(None, description="Jahr"),
     month: int = Query(None, description="Monat (1-12)"),
     filter_person_id: Optional[str] = Query(None, description="Person-ID für Filterung"),
-    filter_location_id: Optional[str] = Query(None, description="Arbeitsort-ID für Filterung")
+    filter_location_id: Optional[str] = Query(None, description="Arbeitsort-ID für Filterung"),
+    filter_options_version: Optional[str] = Query(
+        None, description="Beim Client vorhandene Version der Filter-Optionen"
+    ),
 ):
-    """Liefert das Kalender-Partial für einen bestimmten Monat."""
+    """
+    Liefert das Kalender-Partial für einen bestimmten Monat.
+    
+    Die Filter-Dropdowns werden nur per OOB-Swap mitgesendet, wenn der Client keine oder eine
+    veraltete Version der Filter-Optionen übermittelt. Die Schaltflächen zum Zurücksetzen der
+    Filter senden keine Version, damit die Auswahl in den Dropdowns zurückgesetzt wird.
+    """
     # Initialisiere den CalendarService
     calendar_service = CalendarService()
     
@@ -108,43 +118,47 @@ def calendar_partial(
     year = date_info["year"]
     month = date_info["month"]
     
-    # Kalenderdaten erstellen
-    calendar_weeks = calendar_service.get_calendar_data(year, month)
-    
-    # Termine in den Kalender einfügen mit optionalen Filtern
-    calendar_weeks = calendar_service.fill_calendar_with_appointments(
-        calendar_weeks, 
-        filter_person_id=filter_person_id, 
-        filter_location_id=filter_location_id
+    # Unveränderte Daten mit 304 beantworten, bevor geladen oder gerendert wird; Filter und
+    # Version der Filter-Optionen des Clients stecken in den Query-Parametern
+    weeks = calendar_service.get_calendar_data(year, month)
+    validators = DataVersionService.get_validators_for_dates(
+        weeks[0][0]["date"], weeks[-1][-1]["date"],
+        _user_key(user), request.url.path, request.url.query,
+        depends_on_today=True
     )
+    if validators.is_fresh(request):
+        return validators.not_modified()
     
-    # Aktive Filter für die Anzeige ermitteln
-    active_filters = calendar_service.get_active_filters(
+    # Kalenderdaten (optional gefiltert), aktive Filter und Filter-Optionen in einer Session laden
+    page = calendar_service.get_calendar_page(
+        year,
+        month,
         filter_person_id=filter_person_id,
         filter_location_id=filter_location_id
     )
-    
-    # Filter-Optionen laden
-    filter_options = calendar_service.get_filter_options()
+    filter_options = page["filter_options"]
     
     # Template rendern
-    return templates.TemplateResponse(
+    response = templates.TemplateResponse(
         "calendar_partial.html",
         {
             "request": request,
-            "calendar_weeks": calendar_weeks,
+            "calendar_weeks": page["calendar_weeks"],
             "year": year,
             "month": month,
-            "month_name": calendar_service.get_month_name(month),
+            "month_name": page["month_name"],
             "today": date.today(),
-            "active_filters": active_filters,
+            "active_filters": page["active_filters"],
             "filter_person_id": filter_person_id,
             "filter_location_id": filter_location_id,
             "all_persons": filter_options["all_persons"],
             "all_locations": filter_options["all_locations"],
+            "filter_options_version": filter_options["version"],
+            "render_filter_options": filter_options_version != filter_options["version"],
             "user": user
         }
     )
+    return validators.apply(response)
 
 
 @router.get("/hx/day-view/{date_str}", response_class=HTMLResponse)
@@ -157,6 +171,14 @@ def day_view_modal(
     # Initialisiere den CalendarService
     calendar_service = CalendarService()
     
+    # Unveränderte Tage mit 304 beantworten; das Modal hängt nur von den Tagesdaten ab
+    selected_date = calendar_service.parse_date(date_str)
+    validators = DataVersionService.get_validators_for_dates(
+        selected_date, selected_date, request.url.path, depends_on_today=True
+    )
+    if validators.is_fresh(request):
+        return validators.not_modified()
+    
     # Tagesansichtsdaten abrufen
     day_data = calendar_service.get_day_view_data(date_str)
     
@@ -164,15 +186,8 @@ def day_view_modal(
     if "error" in day_data:
         raise HTTPException(status_code=400, detail=day_data["error"])
     
-    # Template rendern
-    return templates.TemplateResponse(
-        "day_view_modal.html",
-        {
-            "request": request,
-            **day_data,  # Entpacke alle Daten aus day_data
-            "user": user
-        }
-    )
+    # Fragment aus dem Cache oder neu rendern
+    return validators.apply(HTMLResponse(render_day_view(day_data)))
 
 @router.get("/hx/appointments/{appointment_id}/detail", response_class=HTMLResponse)
 def appointment_detail_modal(
@@ -182,6 +197,13 @@ def appointment_detail_modal(
 ):
     """Liefert das Modal-Fragment für Termindetails."""
     
+    # Das Datum des Termins ist vor dem Laden unbekannt, daher zählt jede Terminänderung
+    validators = DataVersionService.get_validators(
+        [APPOINTMENTS_SCOPE, PERSONS_SCOPE, LOCATIONS_SCOPE], _user_key(user), request.url.path
+    )
+    if validators.is_fresh(request):
+        return validators.not_modified()
+    
     # AppointmentService nutzen
     appointment_service = AppointmentService()
     appointment_detail = appointment_service.get_appointment_detail(appointment_id)
@@ -190,7 +212,7 @@ def appointment_detail_modal(
         raise HTTPException(status_code=404, detail="Termin nicht gefunden")
     
     # Template rendern
-    return templates.TemplateResponse(
+    response = templates.TemplateResponse(
         "appointment_detail_modal.html",
         {
             "request": request,
@@ -198,6 +220,7 @@ def appointment_detail_modal(
             "user": user
         }
     )
+    return validators.apply(response)
 
 @router.get("/hx/close-modal", response_class=HTMLResponse)
 def close_modal(
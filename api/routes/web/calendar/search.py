@@ -3,7 +3,7 @@ from typing import Optional
 from fastapi import APIRouter, Request, Depends, Query
 from fastapi.responses import HTMLResponse
 
-from api.services import AppointmentService, LocationService, PersonService
+from api.services import SearchService
 from api.templates import templates
 from api.auth.cookie_auth import require_web_employee
 from api.auth.models import User
@@ -28,24 +28,9 @@ def search(
         "locations": []
     }
     
-    # AppointmentService für die Terminsuche nutzen
-    appointment_service = AppointmentService()
-    
-    # Wenn kein Typ angegeben wurde oder explizit nach Terminen gesucht wird
-    if type is None or type == "appointment":
-        results["appointments"] = appointment_service.search_appointments(q)
-    
-    # Wenn kein Typ angegeben wurde oder explizit nach Personen gesucht wird
-    if type is None or type == "person":
-        # PersonService für die Personensuche nutzen
-        person_service = PersonService()
-        results["persons"] = person_service.search_persons(q)
-    
-    # Wenn kein Typ angegeben wurde oder explizit nach Orten gesucht wird
-    if type is None or type == "location":
-        # LocationService für die Ortssuche nutzen
-        location_service = LocationService()
-        results["locations"] = location_service.search_locations(q)
+    # Alle Entitätstypen mit einer gemeinsamen Suche ermitteln, gruppiert nach Typ
+    for entity_type, hits in SearchService.search(q, entity_type=type):
+        results[f"{entity_type}s"] = hits
     
     # Template rendern
     return templates.TemplateResponse(
@@ -60,3 +45,23 @@ def search(
             "menu_section": MenuDisplaySection.CALENDAR
         }
     )
+
+
+@router.get("/autocomplete", response_class=HTMLResponse)
+def autocomplete(
+    request: Request,
+    user: Optional[User] = Depends(require_web_employee),
+    q: str = Query("", description="Bisher eingegebener Suchbegriff"),
+    type: Optional[str] = Query(None, description="Entitätstyp (appointment, person, location)")
+):
+    """
+    Liefert Suchvorschläge für das Suchfeld (HTMX-Partial), wird bei jeder Eingabe aufgerufen.
+    """
+    return templates.TemplateResponse(
+        "search_autocomplete.html",
+        {
+            "request": request,
+            "query": q,
+            "suggestions": SearchService.autocomplete(q, entity_type=type)
+        }
+    )
@@ -6,6 +6,9 @@ from .location_service import LocationService
 from .person_service import PersonService
 from .plan_service import PlanService
 from .auth_service import AuthService
+from .search_service import SearchService
+from .data_version_service import DataVersionService
+from .appointment_import_service import AppointmentImportService
 
 __all__ = [
     'CalendarService',
@@ -13,5 +16,8 @@ __all__ = [
     'LocationService', 
     'PersonService', 
     'PlanService',
-    'AuthService'
+    'AuthService',
+    'SearchService',
+    'DataVersionService',
+    'AppointmentImportService'
 ]
@@ -0,0 +1,340 @@
+"""
+Service für den Massenimport von Terminen in eine Planungsperiode.
+
+Die Zeilen werden blockweise verarbeitet: Je Block werden Arbeitsorte und Personen mit je einer
+Abfrage aufgelöst, alle Termine des Blocks gemeinsam auf Überschneidungen geprüft und mit
+executemany in einer eigenen Transaktion geschrieben. Fehlerhafte Zeilen werden mit ihrer
+Position gemeldet, ohne den Block oder den Import abzubrechen.
+"""
+import os
+from collections import defaultdict
+from datetime import date
+from itertools import islice
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+from uuid import UUID, uuid4
+
+from pony.orm import db_session, select
+from pydantic import ValidationError
+
+from api.models import schemas
+from api.services.appointment_service import AppointmentService
+from api.services.calendar_service import CalendarService
+from api.services.data_version_service import DataVersionService
+from api.services.overlap import AppointmentSlot, appointment_interval
+from database.bulk_insert import BulkInserter
+from database.models import db
+from database.models import Appointment as DBAppointment
+from database.models import LocationOfWork as DBLocationOfWork
+from database.models import Person as DBPerson
+from database.models import PlanPeriod as DBPlanPeriod
+from database.search_index import APPOINTMENT, compose_appointment_document, index_new_documents
+from api.exceptions.plan import PlanPeriodNotFoundException
+
+# Anzahl der Zeilen, die gemeinsam geprüft und in einer Transaktion geschrieben werden
+IMPORT_BATCH_SIZE = int(os.environ.get("APPOINTMENT_IMPORT_BATCH_SIZE", "500"))
+
+
+class UnparsableRow(NamedTuple):
+    """Platzhalter für eine Zeile, die nicht gelesen werden konnte (z.B. ungültiges JSON)."""
+    message: str
+
+
+class _ImportCandidate(NamedTuple):
+    """Geprüfte Zeile mit der für den Termin vergebenen ID."""
+    row: int
+    appointment_id: UUID
+    data: schemas.AppointmentImportRow
+
+
+class AppointmentImportService:
+    @staticmethod
+    def import_appointments(
+        plan_period_id: UUID,
+        rows: Iterable[Any],
+        batch_size: int = IMPORT_BATCH_SIZE,
+        check_overlaps: bool = True
+    ) -> schemas.AppointmentImportResult:
+        """
+        Importiert Termine in eine Planungsperiode.
+
+        Jeder Block wird in einer eigenen Transaktion geschrieben; bereits geschriebene Blöcke
+        bleiben erhalten, wenn ein späterer Block fehlschlägt. Die Zeilen werden erst beim
+        Verarbeiten gelesen, sodass auch ein Strom (NDJSON) mit konstantem Speicherbedarf
+        importiert werden kann.
+
+        Args:
+            plan_period_id: Die UUID der Planungsperiode
+            rows: Die Zeilen als Dictionaries im Format von AppointmentImportRow; nicht lesbare
+                  Zeilen als UnparsableRow
+            batch_size: Anzahl der Zeilen je Block und Transaktion
+            check_overlaps: Zeilen ablehnen, die sich an einem Arbeitsort oder bei einer Person
+                            mit einem gespeicherten oder einem zuvor importierten Termin
+                            überschneiden
+
+        Returns:
+            Ergebnis mit den IDs der angelegten Termine und den Fehlern je Zeile
+
+        Raises:
+            PlanPeriodNotFoundException: Wenn die Planungsperiode nicht gefunden wurde
+        """
+        period_bounds = AppointmentImportService._get_period_bounds(plan_period_id)
+
+        received = 0
+        created_ids = []
+        errors = []
+        iterator = iter(rows)
+        while True:
+            batch = list(islice(iterator, max(batch_size, 1)))
+            if not batch:
+                break
+            batch_ids, batch_errors, dates = AppointmentImportService._import_batch(
+                plan_period_id, period_bounds, received, batch, check_overlaps
+            )
+            received += len(batch)
+            created_ids.extend(batch_ids)
+            errors.extend(batch_errors)
+            # Erst nach dem Speichern des Blocks gecachte Kalenderansichten verwerfen
+            if dates:
+                CalendarService.invalidate_month_cache(dates)
+
+        return schemas.AppointmentImportResult(
+            plan_period_id=plan_period_id,
+            received=received,
+            created=len(created_ids),
+            failed=len(errors),
+            created_ids=created_ids,
+            errors=errors
+        )
+
+    @staticmethod
+    @db_session
+    def _get_period_bounds(plan_period_id: UUID) -> Tuple[date, date, Optional[UUID]]:
+        """
+        Returns:
+            Tupel (Beginn, Ende, ID des Plans oder None) der Planungsperiode
+
+        Raises:
+            PlanPeriodNotFoundException: Wenn die Planungsperiode nicht gefunden wurde
+        """
+        period = DBPlanPeriod.get(id=plan_period_id)
+        if not period:
+            raise PlanPeriodNotFoundException(period_id=plan_period_id)
+        return period.start_date, period.end_date, period.plan.id if period.plan else None
+
+    @staticmethod
+    def _validate_rows(
+        first_row: int, batch: List[Any], period_bounds: Tuple[date, date, Optional[UUID]]
+    ) -> Tuple[List[_ImportCandidate], List[schemas.AppointmentImportError]]:
+        """Prüft die Zeilen eines Blocks einzeln gegen das Schema und den Zeitraum der Periode."""
+        start_date, end_date, _ = period_bounds
+        candidates = []
+        errors = []
+        for row, raw in enumerate(batch, start=first_row):
+            if isinstance(raw, UnparsableRow):
+                errors.append(schemas.AppointmentImportError(row=row, message=raw.message))
+                continue
+            try:
+                data = schemas.AppointmentImportRow.model_validate(raw)
+            except ValidationError as e:
+                error = e.errors()[0]
+                field = ".".join(str(part) for part in error["loc"]) or None
+                errors.append(
+                    schemas.AppointmentImportError(
+                        row=row,
+                        message=f"{field}: {error['msg']}" if field else error["msg"],
+                        field=field,
+                        details={
+                            "errors": e.errors(
+                                include_url=False, include_context=False, include_input=False
+                            )
+                        },
+                    )
+                )
+                continue
+            if not start_date <= data.date <= end_date:
+                errors.append(
+                    schemas.AppointmentImportError(
+                        row=row,
+                        message=(
+                            f"Das Datum {data.date} liegt außerhalb der Planungsperiode "
+                            f"({start_date} bis {end_date})."
+                        ),
+                        field="date",
+                    )
+                )
+                continue
+            candidates.append(_ImportCandidate(row, uuid4(), data))
+        return candidates, errors
+
+    @staticmethod
+    def _find_overlaps(candidates: List[_ImportCandidate]) -> Dict[UUID, List[Dict[str, Any]]]:
+        """
+        Prüft die Kandidaten gemeinsam auf Überschneidungen.
+
+        Eine Zeile wird abgelehnt, wenn sie sich mit einem gespeicherten Termin oder mit einer
+        früheren, angenommenen Zeile des Blocks überschneidet. Muss innerhalb einer db_session
+        aufgerufen werden.
+
+        Returns:
+            Termin-ID der abgelehnten Zeile -> Beschreibungen der Überschneidungen
+        """
+        row_by_id = {candidate.appointment_id: candidate.row for candidate in candidates}
+        slots = [
+            AppointmentSlot(
+                appointment_interval(
+                    c.data.date, c.data.start_time, c.data.delta, c.appointment_id
+                ),
+                c.data.location_id,
+                tuple(dict.fromkeys(c.data.person_ids)),
+            )
+            for c in candidates
+        ]
+
+        existing = defaultdict(list)
+        partners = defaultdict(list)
+        for conflict in AppointmentService.check_overlaps_bulk(slots):
+            first_id, second_id = conflict.first.appointment_id, conflict.second.appointment_id
+            if first_id in row_by_id and second_id in row_by_id:
+                partners[first_id].append((conflict, second_id))
+                partners[second_id].append((conflict, first_id))
+            else:
+                existing[second_id].append({
+                    "kind": conflict.kind,
+                    "resource_id": str(conflict.resource_id),
+                    "appointment_id": str(first_id)
+                })
+
+        # Überschneidungen innerhalb des Blocks in Zeilenreihenfolge auflösen: Nur die spätere
+        # Zeile wird abgelehnt, und nur, wenn die frühere angenommen wurde
+        rejected = {}
+        for candidate in sorted(candidates, key=lambda c: c.row):
+            overlaps = list(existing.get(candidate.appointment_id, ()))
+            overlaps.extend(
+                {
+                    "kind": conflict.kind,
+                    "resource_id": str(conflict.resource_id),
+                    "row": row_by_id[other_id],
+                }
+                for conflict, other_id in partners.get(candidate.appointment_id, ())
+                if row_by_id[other_id] < candidate.row and other_id not in rejected
+            )
+            if overlaps:
+                rejected[candidate.appointment_id] = overlaps
+        return rejected
+
+    @staticmethod
+    @db_session
+    def _import_batch(
+        plan_period_id: UUID,
+        period_bounds: Tuple[date, date, Optional[UUID]],
+        first_row: int,
+        batch: List[Any],
+        check_overlaps: bool
+    ) -> Tuple[List[UUID], List[schemas.AppointmentImportError], Set[date]]:
+        """
+        Prüft und schreibt einen Block in einer Transaktion.
+
+        Returns:
+            Tupel (IDs der angelegten Termine, Fehler je Zeile, Daten der angelegten Termine)
+        """
+        candidates, errors = AppointmentImportService._validate_rows(
+            first_row, batch, period_bounds
+        )
+
+        # Arbeitsorte und Personen des Blocks mit je einer Abfrage auflösen
+        location_ids = list({c.data.location_id for c in candidates})
+        person_ids = list({person_id for c in candidates for person_id in c.data.person_ids})
+        location_names = (
+            dict(select((l.id, l.name) for l in DBLocationOfWork if l.id in location_ids))
+            if location_ids
+            else {}
+        )
+        person_names = (
+            {
+                person_id: (f_name, l_name)
+                for person_id, f_name, l_name in select(
+                    (p.id, p.f_name, p.l_name) for p in DBPerson if p.id in person_ids
+                )
+            }
+            if person_ids
+            else {}
+        )
+
+        resolved = []
+        for candidate in candidates:
+            if candidate.data.location_id not in location_names:
+                errors.append(schemas.AppointmentImportError(
+                    row=candidate.row,
+                    message=f"Arbeitsort mit ID '{candidate.data.location_id}' nicht gefunden.",
+                    field="location_id"
+                ))
+                continue
+            unknown = [str(p) for p in candidate.data.person_ids if p not in person_names]
+            if unknown:
+                errors.append(schemas.AppointmentImportError(
+                    row=candidate.row,
+                    message=f"Personen nicht gefunden: {', '.join(unknown)}",
+                    field="person_ids",
+                    details={"person_ids": unknown}
+                ))
+                continue
+            resolved.append(candidate)
+
+        rejected = (
+            AppointmentImportService._find_overlaps(resolved) if check_overlaps and resolved else {}
+        )
+        accepted = []
+        for candidate in resolved:
+            overlaps = rejected.get(candidate.appointment_id)
+            if overlaps:
+                errors.append(
+                    schemas.AppointmentImportError(
+                        row=candidate.row,
+                        message=(
+                            "Der Termin überschneidet sich mit einem gespeicherten Termin oder "
+                            "einer früheren Zeile."
+                        ),
+                        field="start_time",
+                        details={"overlaps": overlaps},
+                    )
+                )
+            else:
+                accepted.append(candidate)
+
+        errors.sort(key=lambda error: error.row)
+        if not accepted:
+            return [], errors, set()
+
+        plan_id = period_bounds[2]
+        appointment_inserter = BulkInserter.for_entity(
+            DBAppointment,
+            ["id", "plan_period", "date", "start_time", "delta", "location", "guests", "notes"],
+        )
+        person_inserter = BulkInserter.for_link(DBAppointment.persons)
+        plan_inserter = BulkInserter.for_link(DBAppointment.plans)
+        documents = []
+        for candidate in accepted:
+            data = candidate.data
+            appointment_inserter.add(
+                candidate.appointment_id, plan_period_id, data.date, data.start_time, data.delta,
+                data.location_id, data.guests, data.notes
+            )
+            unique_person_ids = list(dict.fromkeys(data.person_ids))
+            for person_id in unique_person_ids:
+                person_inserter.add(candidate.appointment_id, person_id)
+            if plan_id:
+                plan_inserter.add(candidate.appointment_id, plan_id)
+            documents.append((candidate.appointment_id, compose_appointment_document(
+                data.notes, location_names[data.location_id],
+                [person_names[person_id] for person_id in unique_person_ids], data.guests
+            )))
+        appointment_inserter.flush()
+        person_inserter.flush()
+        plan_inserter.flush()
+        index_new_documents(db, APPOINTMENT, documents)
+
+        # Änderungszähler für ETags in derselben Transaktion erhöhen
+        dates = {candidate.data.date for candidate in accepted}
+        DataVersionService.bump_appointment_dates(dates)
+
+        return [candidate.appointment_id for candidate in accepted], errors, dates
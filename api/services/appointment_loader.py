@@ -0,0 +1,182 @@
+"""
+Gemeinsamer Lader für Termine und Termindetails mit vorab geladenen Beziehungen.
+
+schemas.AppointmentDetail greift auf Planperiode, Arbeitsort samt Adresse und Personen zu,
+schemas.Appointment auf die IDs der Personen. Ohne Prefetch lädt PonyORM diese Beziehungen
+einzeln nach (N+1-Abfragen). Der Lader holt sie stattdessen mit einer festen Anzahl von
+Abfragen je Entitätstyp bzw. je Block von Terminen.
+"""
+from collections import defaultdict
+from datetime import time
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from pony.orm import select
+from pony.orm.core import Query
+
+from api.models import schemas
+from database.models import Appointment as DBAppointment
+from database.models import LocationOfWork as DBLocationOfWork
+
+# Anzahl der Termin-IDs je Abfrage der Personenzuordnungen (Grenze für gebundene Parameter)
+PERSON_LINK_BATCH_SIZE = 500
+
+
+def prefetch_appointment_details(query: Query) -> Query:
+    """
+    Ergänzt eine Termin-Abfrage um das Vorausladen von Planperiode, Arbeitsort und Adresse.
+
+    Die Personen werden nicht per Prefetch geladen: PonyORM bricht das Vorausladen einer
+    Set-Beziehung für mehr als ca. 1000 Termine mit UnrepeatableReadError ("Phantom object")
+    ab. load_appointment_details liest sie stattdessen blockweise über die Verknüpfungstabelle.
+
+    Args:
+        query: Eine PonyORM-Abfrage über Termine
+
+    Returns:
+        Die Abfrage mit Prefetch für Planperiode, Arbeitsort und Adresse
+    """
+    return query.prefetch(
+        DBAppointment.plan_period,
+        DBAppointment.location,
+        DBLocationOfWork.address
+    )
+
+
+def load_person_ids(appointment_ids: List[UUID]) -> Dict[UUID, List[UUID]]:
+    """
+    Liest die Personen-IDs der Termine blockweise direkt aus der Verknüpfungstabelle.
+
+    Muss innerhalb einer db_session aufgerufen werden.
+
+    Args:
+        appointment_ids: Die IDs der Termine
+
+    Returns:
+        Dictionary Termin-ID -> Personen-IDs; Termine ohne Personen fehlen
+    """
+    person_ids = defaultdict(list)
+    for offset in range(0, len(appointment_ids), PERSON_LINK_BATCH_SIZE):
+        batch = appointment_ids[offset:offset + PERSON_LINK_BATCH_SIZE]
+        for appointment_id, person_id in select(
+            (a.id, p.id) for a in DBAppointment for p in a.persons if a.id in batch
+        ):
+            person_ids[appointment_id].append(person_id)
+    return person_ids
+
+
+def _load_persons_by_appointment(appointment_ids: List[UUID]) -> Dict[UUID, List[schemas.Person]]:
+    """Liest die Personen der Termine blockweise; jede Person wird nur einmal serialisiert."""
+    persons_by_appointment = defaultdict(list)
+    person_schemas = {}
+    for offset in range(0, len(appointment_ids), PERSON_LINK_BATCH_SIZE):
+        batch = appointment_ids[offset:offset + PERSON_LINK_BATCH_SIZE]
+        for appointment_id, person in select(
+            (a.id, p) for a in DBAppointment for p in a.persons if a.id in batch
+        ):
+            person_schema = person_schemas.get(person.id)
+            if person_schema is None:
+                person_schema = person_schemas[person.id] = schemas.Person.model_validate(person)
+            persons_by_appointment[appointment_id].append(person_schema)
+    return persons_by_appointment
+
+
+def load_appointment_details(
+    query: Query, limit: Optional[int] = None
+) -> List[schemas.AppointmentDetail]:
+    """
+    Führt eine Termin-Abfrage aus und serialisiert die Ergebnisse als AppointmentDetail.
+
+    Planperioden, Arbeitsorte und Personen, die in mehreren Terminen vorkommen, werden nur
+    einmal serialisiert. Muss innerhalb einer db_session aufgerufen werden.
+
+    Args:
+        query: Eine PonyORM-Abfrage über Termine (inkl. Sortierung)
+        limit: Optional. Maximale Anzahl der Ergebnisse
+
+    Returns:
+        Liste der Termindetails in der Reihenfolge der Abfrage
+    """
+    query = prefetch_appointment_details(query)
+    appointments = query[:limit] if limit is not None else query[:]
+    persons_by_appointment = _load_persons_by_appointment([a.id for a in appointments])
+
+    plan_periods = {}
+    locations = {}
+    details = []
+    for a in appointments:
+        plan_period = plan_periods.get(a.plan_period.id)
+        if plan_period is None:
+            plan_period = plan_periods[a.plan_period.id] = schemas.PlanPeriod.model_validate(
+                a.plan_period
+            )
+        location = locations.get(a.location.id)
+        if location is None:
+            location = locations[a.location.id] = schemas.LocationOfWorkDetail.model_validate(
+                a.location
+            )
+        details.append(schemas.AppointmentDetail(
+            id=a.id,
+            plan_period=plan_period,
+            date=a.date,
+            start_time=a.start_time,
+            delta=a.delta,
+            location=location,
+            persons=persons_by_appointment.get(a.id, []),
+            guests=a.guests,
+            notes=a.notes
+        ))
+    return details
+
+
+def load_appointments(query: Query, limit: Optional[int] = None) -> List[schemas.Appointment]:
+    """
+    Führt eine Termin-Abfrage aus und liefert die Ergebnisse als schemas.Appointment,
+    sortiert nach (Datum, Startzeit, ID).
+
+    Es werden nur die benötigten Spalten als Tupel geladen, keine Entitäten, und die Personen-IDs
+    blockweise direkt aus der Verknüpfungstabelle gelesen. Die Werte sind durch die Konverter von
+    PonyORM bereits typisiert; die Schemas werden daher ohne erneute Validierung erzeugt
+    (model_construct). Muss innerhalb einer db_session aufgerufen werden.
+
+    Args:
+        query: Eine gefilterte PonyORM-Abfrage über Termine (ohne Sortierung)
+        limit: Optional. Maximale Anzahl der Ergebnisse
+
+    Returns:
+        Liste der Termine
+    """
+    rows = select(
+        (a.id, a.plan_period.id, a.date, a.start_time, a.delta, a.location.id, a.guests, a.notes)
+        for a in query
+    ).order_by(3, 4, 1)
+    rows = rows[:limit] if limit is not None else rows[:]
+
+    person_ids = load_person_ids([row[0] for row in rows])
+
+    return [
+        schemas.Appointment.model_construct(
+            id=appointment_id,
+            plan_period_id=plan_period_id,
+            date=appointment_date,
+            # SQLite liefert Zeiten in Tupel-Abfragen als Text
+            start_time=(
+                time.fromisoformat(start_time) if isinstance(start_time, str) else start_time
+            ),
+            delta=delta,
+            location_id=location_id,
+            person_ids=person_ids.get(appointment_id, []),
+            guests=list(guests or []),
+            notes=notes or "",
+        )
+        for (
+            appointment_id,
+            plan_period_id,
+            appointment_date,
+            start_time,
+            delta,
+            location_id,
+            guests,
+            notes,
+        ) in rows
+    ]
@@ -1,23 +1,44 @@
 """
 Service für Termine mit integrierter Fehlerbehandlung.
 """
+import base64
+import json
+import os
+from collections import defaultdict
 from datetime import date, timedelta, time as datetime_time
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable, Iterator, Tuple
 from uuid import UUID
 
 from pony.orm import db_session, select, desc, exists, ObjectNotFound
+from pony.orm.core import Query
 
 from api.models import schemas
+from api.services.appointment_loader import (
+    load_appointment_details,
+    load_appointments,
+    load_person_ids,
+)
+from api.services.overlap import (
+    AppointmentSlot, Conflict, IntervalIndex, LOCATION_CONFLICT, PERSON_CONFLICT,
+    appointment_interval, find_conflicts, time_range_interval
+)
+from database.models import db
 from database.models import Appointment as DBAppointment
 from database.models import Person as DBPerson
 from database.models import LocationOfWork as DBLocationOfWork
+from database.search_index import APPOINTMENT, is_search_index_available, search_entity_ids
 from api.exceptions.appointment import (
     AppointmentNotFoundException, AppointmentOverlapException,
-    InvalidAppointmentDateException, AppointmentUpdateConflictException
+    InvalidAppointmentDateException, AppointmentUpdateConflictException, InvalidCursorException
 )
 from api.exceptions.person import PersonNotFoundException
 from api.exceptions.location import LocationNotFoundException
 
+# Seitengröße der Terminliste (Standard und Obergrenze) und Abfragegröße beim Streamen
+APPOINTMENT_PAGE_SIZE = int(os.environ.get("APPOINTMENT_PAGE_SIZE", "500"))
+APPOINTMENT_PAGE_SIZE_MAX = int(os.environ.get("APPOINTMENT_PAGE_SIZE_MAX", "5000"))
+APPOINTMENT_STREAM_CHUNK_SIZE = int(os.environ.get("APPOINTMENT_STREAM_CHUNK_SIZE", "1000"))
+
 
 class AppointmentService:
     @staticmethod
@@ -36,27 +57,16 @@ class AppointmentService:
         return schemas.AppointmentDetail.model_validate(appointment)
     
     @staticmethod
-    @db_session
-    def get_appointments(
+    def _filter_appointments(
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
         location_id: Optional[UUID] = None,
         person_id: Optional[UUID] = None,
         plan_period_id: Optional[UUID] = None
-    ) -> List[schemas.Appointment]:
+    ) -> Query:
         """
-        Liefert eine Liste aller Termine, die den Filterkriterien entsprechen.
+        Baut die gefilterte Termin-Abfrage. Muss innerhalb einer db_session aufgerufen werden.
         
-        Args:
-            start_date: Optional. Nur Termine ab diesem Datum
-            end_date: Optional. Nur Termine bis zu diesem Datum
-            location_id: Optional. Nur Termine an diesem Ort
-            person_id: Optional. Nur Termine mit dieser Person
-            plan_period_id: Optional. Nur Termine in dieser Planperiode
-            
-        Returns:
-            Liste der gefilterten Termine
-            
         Raises:
             LocationNotFoundException: Wenn ein nicht existierender Ort angegeben wurde
             PersonNotFoundException: Wenn eine nicht existierende Person angegeben wurde
@@ -83,8 +93,182 @@ class AppointmentService:
         
         if plan_period_id:
             query = query.filter(lambda a: a.plan_period.id == plan_period_id)
-
-        return [schemas.Appointment.model_validate(a) for a in query]
+        
+        return query
+    
+    @staticmethod
+    @db_session
+    def get_appointments(
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        location_id: Optional[UUID] = None,
+        person_id: Optional[UUID] = None,
+        plan_period_id: Optional[UUID] = None
+    ) -> List[schemas.Appointment]:
+        """
+        Liefert eine Liste aller Termine, die den Filterkriterien entsprechen.
+        
+        Args:
+            start_date: Optional. Nur Termine ab diesem Datum
+            end_date: Optional. Nur Termine bis zu diesem Datum
+            location_id: Optional. Nur Termine an diesem Ort
+            person_id: Optional. Nur Termine mit dieser Person
+            plan_period_id: Optional. Nur Termine in dieser Planperiode
+            
+        Returns:
+            Liste der gefilterten Termine
+            
+        Raises:
+            LocationNotFoundException: Wenn ein nicht existierender Ort angegeben wurde
+            PersonNotFoundException: Wenn eine nicht existierende Person angegeben wurde
+        """
+        query = AppointmentService._filter_appointments(
+            start_date, end_date, location_id, person_id, plan_period_id
+        )
+        return load_appointments(query)
+    
+    @staticmethod
+    def encode_cursor(appointment: schemas.Appointment) -> str:
+        """
+        Bildet den Cursor hinter einem Termin aus dessen Sortierschlüssel (Datum, Startzeit, ID).
+        
+        Args:
+            appointment: Der letzte Termin der Seite
+            
+        Returns:
+            Der Cursor als URL-sicherer Base64-String
+        """
+        key = [
+            appointment.date.isoformat(),
+            appointment.start_time.isoformat(),
+            str(appointment.id),
+        ]
+        return base64.urlsafe_b64encode(json.dumps(key).encode("utf-8")).decode("ascii").rstrip("=")
+    
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[date, datetime_time, UUID]:
+        """
+        Liest den Sortierschlüssel aus einem Cursor.
+        
+        Args:
+            cursor: Der Cursor aus X-Next-Cursor bzw. dem Link-Header
+            
+        Returns:
+            Tupel (Datum, Startzeit, ID) des letzten Termins der vorherigen Seite
+            
+        Raises:
+            InvalidCursorException: Wenn der Cursor nicht gelesen werden kann
+        """
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            date_str, time_str, id_str = json.loads(
+                base64.urlsafe_b64decode(padded.encode("ascii"))
+            )
+            return date.fromisoformat(date_str), datetime_time.fromisoformat(time_str), UUID(id_str)
+        except (ValueError, TypeError, UnicodeError):
+            raise InvalidCursorException(cursor=cursor)
+    
+    @staticmethod
+    @db_session
+    def get_appointments_page(
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        location_id: Optional[UUID] = None,
+        person_id: Optional[UUID] = None,
+        plan_period_id: Optional[UUID] = None,
+        cursor: Optional[str] = None,
+        limit: int = APPOINTMENT_PAGE_SIZE
+    ) -> Tuple[List[schemas.Appointment], Optional[str]]:
+        """
+        Liefert eine Seite der gefilterten Termine, sortiert nach (Datum, Startzeit, ID).
+        
+        Keyset-Paginierung: Die Folgeseite beginnt hinter dem Sortierschlüssel im Cursor statt
+        an einem Offset und nutzt den Index auf (date, start_time). Einfügungen und Löschungen
+        zwischen zwei Seiten verschieben daher keine Einträge.
+        
+        Args:
+            start_date, end_date, location_id, person_id, plan_period_id: Filter wie
+                get_appointments
+            cursor: Optional. Cursor der vorherigen Seite
+            limit: Maximale Anzahl der Termine je Seite
+            
+        Returns:
+            Tupel (Termine der Seite, Cursor der nächsten Seite oder None auf der letzten Seite)
+            
+        Raises:
+            InvalidCursorException: Wenn der Cursor ungültig ist
+            LocationNotFoundException: Wenn ein nicht existierender Ort angegeben wurde
+            PersonNotFoundException: Wenn eine nicht existierende Person angegeben wurde
+        """
+        query = AppointmentService._filter_appointments(
+            start_date, end_date, location_id, person_id, plan_period_id
+        )
+        if cursor:
+            after_date, after_time, after_id = AppointmentService.decode_cursor(cursor)
+            query = query.filter(
+                lambda a: a.date > after_date or (a.date == after_date and (
+                    a.start_time > after_time or (a.start_time == after_time and a.id > after_id)
+                ))
+            )
+        
+        # Einen Termin mehr laden, um das Ende ohne zusätzliche Zählabfrage zu erkennen
+        appointments = load_appointments(query, limit + 1)
+        if len(appointments) <= limit:
+            return appointments, None
+        appointments = appointments[:limit]
+        return appointments, AppointmentService.encode_cursor(appointments[-1])
+    
+    @staticmethod
+    def iter_appointments(
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        location_id: Optional[UUID] = None,
+        person_id: Optional[UUID] = None,
+        plan_period_id: Optional[UUID] = None,
+        cursor: Optional[str] = None,
+        chunk_size: int = APPOINTMENT_STREAM_CHUNK_SIZE
+    ) -> Iterator[schemas.Appointment]:
+        """
+        Liefert alle gefilterten Termine ab dem Cursor seitenweise als Iterator.
+        
+        Jede Seite wird in einer eigenen kurzen db_session geladen, sodass der Speicherbedarf
+        unabhängig von der Größe des Zeitraums nur von chunk_size abhängt und keine Transaktion
+        über die gesamte Übertragung offen bleibt. Filter und Cursor werden bereits beim Aufruf
+        geprüft, damit Fehler vor dem Beginn einer gestreamten Antwort auftreten.
+        
+        Args:
+            start_date, end_date, location_id, person_id, plan_period_id: Filter wie
+                get_appointments
+            cursor: Optional. Cursor, ab dem gelesen wird
+            chunk_size: Anzahl der Termine je Datenbankabfrage
+            
+        Returns:
+            Iterator über die Termine in der Reihenfolge (Datum, Startzeit, ID)
+            
+        Raises:
+            InvalidCursorException: Wenn der Cursor ungültig ist
+            LocationNotFoundException: Wenn ein nicht existierender Ort angegeben wurde
+            PersonNotFoundException: Wenn eine nicht existierende Person angegeben wurde
+        """
+        filters = dict(
+            start_date=start_date, end_date=end_date, location_id=location_id,
+            person_id=person_id, plan_period_id=plan_period_id
+        )
+        first_page, next_cursor = AppointmentService.get_appointments_page(
+            **filters, cursor=cursor, limit=chunk_size
+        )
+        
+        def pages():
+            page, page_cursor = first_page, next_cursor
+            while True:
+                yield from page
+                if page_cursor is None:
+                    return
+                page, page_cursor = AppointmentService.get_appointments_page(
+                    **filters, cursor=page_cursor, limit=chunk_size
+                )
+        
+        return pages()
         
     @staticmethod
     @db_session
@@ -111,7 +295,7 @@ class AppointmentService:
             )
         
         appointments = DBAppointment.select(lambda a: a.date == appointment_date).order_by(lambda a: a.start_time)
-        return [schemas.AppointmentDetail.model_validate(a) for a in appointments]
+        return load_appointment_details(appointments)
     
     @staticmethod
     @db_session
@@ -154,9 +338,9 @@ class AppointmentService:
                 value=f"{year}-{month}"
             )
         
-        appointments = DBAppointment.select( lambda a: a.date >= start_date and a.date <= end_date)
+        appointments = DBAppointment.select(lambda a: a.date >= start_date and a.date <= end_date)
         
-        return [schemas.Appointment.model_validate(a) for a in appointments]
+        return load_appointments(appointments)
     
     @staticmethod
     @db_session
@@ -182,7 +366,7 @@ class AppointmentService:
             lambda a: person in a.persons and a.date >= today
         ).order_by(lambda a: (a.date, a.start_time))
         
-        return [schemas.AppointmentDetail.model_validate(a) for a in appointments]
+        return load_appointment_details(appointments)
     
     @staticmethod
     @db_session
@@ -218,7 +402,7 @@ class AppointmentService:
             lambda a: person in a.persons and a.date < today and a.date >= past_date
         ).order_by(lambda a: (desc(a.date), a.start_time))
         
-        return [schemas.AppointmentDetail.model_validate(a) for a in appointments]
+        return load_appointment_details(appointments)
     
     @staticmethod
     @db_session
@@ -244,7 +428,7 @@ class AppointmentService:
             lambda a: a.location.id == location_id and a.date >= today
         ).order_by(lambda a: (a.date, a.start_time))
         
-        return [schemas.AppointmentDetail.model_validate(a) for a in appointments]
+        return load_appointment_details(appointments)
     
     @staticmethod
     @db_session
@@ -280,7 +464,7 @@ class AppointmentService:
             lambda a: a.location.id == location_id and a.date < today and a.date >= past_date
         ).order_by(lambda a: (desc(a.date), a.start_time))
         
-        return [schemas.AppointmentDetail.model_validate(a) for a in appointments]
+        return load_appointment_details(appointments)
     
     @staticmethod
     @db_session
@@ -288,6 +472,10 @@ class AppointmentService:
         """
         Durchsucht Termine nach dem angegebenen Suchbegriff.
         
+        Ist der Volltext-Suchindex verfügbar, müssen alle Wörter des Suchbegriffs als Wortanfang
+        in Notizen, Personennamen, Ortsnamen oder Gästen vorkommen; die Treffer werden nach
+        Relevanz sortiert. Ohne Suchindex wird auf eine Teilstring-Suche ausgewichen.
+        
         Args:
             search_term: Der Suchbegriff
             limit: Maximale Anzahl der Ergebnisse (Standard: 20)
@@ -297,6 +485,20 @@ class AppointmentService:
         """
         if not search_term or len(search_term.strip()) < 2:
             return []
+        
+        if is_search_index_available(db):
+            appointment_ids = search_entity_ids(db, APPOINTMENT, search_term, limit)
+            if not appointment_ids:
+                return []
+            
+            # Termine gesammelt laden und in die Reihenfolge der Relevanz bringen
+            ranking = {
+                appointment_id: position for position, appointment_id in enumerate(appointment_ids)
+            }
+            appointments = load_appointment_details(
+                DBAppointment.select(lambda a: a.id in appointment_ids)
+            )
+            return sorted(appointments, key=lambda a: ranking[a.id])
             
         search_term_lower = search_term.lower()
         
@@ -317,7 +519,7 @@ class AppointmentService:
                            (search_term_lower in str(a.guests).lower())
         )
         
-        return [schemas.AppointmentDetail.model_validate(a) for a in appointments.order_by(lambda a: a.date)[:limit]]
+        return load_appointment_details(appointments.order_by(lambda a: a.date), limit=limit)
         
     @staticmethod
     @db_session
@@ -326,10 +528,16 @@ class AppointmentService:
         start_time: datetime_time,
         end_time: datetime_time,
         location_id: UUID,
-        exclude_appointment_id: Optional[UUID] = None
+        exclude_appointment_id: Optional[UUID] = None,
+        person_ids: Optional[Iterable[UUID]] = None
     ) -> List[Dict[str, Any]]:
         """
-        Prüft, ob es Überschneidungen mit anderen Terminen gibt.
+        Prüft, ob es Überschneidungen mit anderen Terminen am selben Ort oder mit denselben
+        Personen gibt.
+        
+        Termine gelten als halboffene Intervalle: Ein Termin, der endet, wenn der nächste beginnt,
+        überschneidet sich nicht mit diesem. Liegt die Endzeit nicht nach der Startzeit, endet der
+        Termin am Folgetag.
         
         Args:
             appointment_date: Das Datum des Termins
@@ -337,42 +545,107 @@ class AppointmentService:
             end_time: Die Endzeit
             location_id: Die ID des Arbeitsortes
             exclude_appointment_id: Optional. ID eines Termins, der bei der Prüfung ignoriert werden soll
+            person_ids: Optional. IDs der beteiligten Personen, die nicht doppelt verplant
+                        sein dürfen
             
         Returns:
             Liste mit Informationen zu überlappenden Terminen (leer, wenn keine Überschneidungen)
         """
-        # Aufbau der Basis-Query
-        query = DBAppointment.select(lambda a: 
-            a.date == appointment_date and 
-            a.location.id == location_id
+        slot = AppointmentSlot(
+            time_range_interval(appointment_date, start_time, end_time, exclude_appointment_id),
+            location_id,
+            tuple(person_ids or ())
         )
         
-        # Ausschluss des aktuellen Termins bei Aktualisierungen
-        if exclude_appointment_id:
-            query = query.filter(lambda a: a.id != exclude_appointment_id)
-        
-        # Alle potenziell überlappenden Termine finden
-        appointments = list(query)
+        # Konflikte je überlappendem Termin zusammenfassen
+        overlapping = {}
+        for conflict in AppointmentService.check_overlaps_bulk([slot]):
+            other = conflict.first
+            entry = overlapping.get(other.appointment_id)
+            if entry is None:
+                appt = DBAppointment[other.appointment_id]
+                entry = overlapping[other.appointment_id] = {
+                    "id": str(appt.id),
+                    "date": str(appt.date),
+                    "start_time": other.start.time().isoformat(),
+                    "end_time": other.end.time().isoformat(),
+                    "location": appt.location.name,
+                    "conflict_types": [],
+                    "person_ids": []
+                }
+            if conflict.kind not in entry["conflict_types"]:
+                entry["conflict_types"].append(conflict.kind)
+            if conflict.kind == PERSON_CONFLICT:
+                entry["person_ids"].append(str(conflict.resource_id))
+        
+        return list(overlapping.values())
+    
+    @staticmethod
+    @db_session
+    def check_overlaps_bulk(slots: List[AppointmentSlot]) -> List[Conflict]:
+        """
+        Prüft eine Menge von Terminen (z.B. einen Import) auf Überschneidungen untereinander und
+        mit den gespeicherten Terminen, je Arbeitsort und je Person.
         
-        # Prüfen, ob Überschneidungen existieren
-        overlapping = []
+        Die gespeicherten Termine im betroffenen Zeitraum werden mit einer Abfrage geladen und je
+        Ressource in einem IntervalIndex abgelegt; jeder Termin wird per Indexabfrage geprüft.
+        Überschneidungen innerhalb der Menge findet ein Sweep. Gesamtaufwand: O((n + k) log n).
         
-        for appt in appointments:
-            appt_end_time = (datetime_time.fromisoformat(str(appt.start_time)) + 
-                             appt.delta)
+        Args:
+            slots: Die zu prüfenden Termine. Trägt ein Intervall die ID eines gespeicherten Termins,
+                   ersetzt es diesen bei der Prüfung (Aktualisierung).
             
-            # Überschneidungsprüfung: 
-            # (StartA <= EndB) und (EndA >= StartB)
-            if (start_time <= appt_end_time and 
-                end_time >= appt.start_time):
-                
-                # Informationen zum überlappenden Termin sammeln
-                overlapping.append({
-                    "id": str(appt.id),
-                    "date": str(appt.date),
-                    "start_time": str(appt.start_time),
-                    "end_time": str(appt_end_time),
-                    "location": appt.location.name
-                })
+        Returns:
+            Liste der Konflikte. Bei Konflikten mit gespeicherten Terminen ist first der
+            gespeicherte Termin und second der geprüfte.
+        """
+        if not slots:
+            return []
         
-        return overlapping
+        # Termine vom Vortag einbeziehen, da sie über Mitternacht reichen können
+        first_day = min(slot.interval.start for slot in slots).date() - timedelta(days=1)
+        last_day = max(slot.interval.end for slot in slots).date()
+        location_ids = list({slot.location_id for slot in slots})
+        person_ids = list({person_id for slot in slots for person_id in slot.person_ids})
+        replaced_ids = {
+            slot.interval.appointment_id for slot in slots if slot.interval.appointment_id
+        }
+
+        query = DBAppointment.select(lambda a: a.date >= first_day and a.date <= last_day)
+        if person_ids:
+            query = query.filter(
+                lambda a: a.location.id in location_ids
+                or exists(p for p in a.persons if p.id in person_ids)
+            )
+        else:
+            query = query.filter(lambda a: a.location.id in location_ids)
+        
+        # Nur die benötigten Spalten laden; Personen blockweise, da PonyORM das Vorausladen der
+        # Personen für mehr als ca. 1000 Termine abbricht
+        rows = [
+            row
+            for row in select((a.id, a.date, a.start_time, a.delta, a.location.id) for a in query)
+            if row[0] not in replaced_ids
+        ]
+        person_ids_by_appointment = load_person_ids([row[0] for row in rows])
+        
+        existing = defaultdict(list)
+        for appointment_id, appointment_date, start_time, delta, location_id in rows:
+            interval = appointment_interval(appointment_date, start_time, delta, appointment_id)
+            existing[LOCATION_CONFLICT, location_id].append(interval)
+            for person_id in person_ids_by_appointment.get(appointment_id, ()):
+                existing[PERSON_CONFLICT, person_id].append(interval)
+        indexes = {key: IntervalIndex(intervals) for key, intervals in existing.items()}
+        
+        conflicts = []
+        for slot in slots:
+            for kind, resource_id, interval in slot.entries():
+                index = indexes.get((kind, resource_id))
+                if index is None:
+                    continue
+                conflicts.extend(
+                    Conflict(kind, resource_id, other, interval)
+                    for other in index.overlapping(interval.start, interval.end)
+                )
+        conflicts.extend(find_conflicts(entry for slot in slots for entry in slot.entries()))
+        return conflicts
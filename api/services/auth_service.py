@@ -1,14 +1,15 @@
 """
 Service für Authentifizierung und Benutzerverwaltung.
 """
-from typing import Optional
+from typing import Any, Dict, Optional
 from uuid import UUID
 
-from pony.orm import db_session, ObjectNotFound
+from pony.orm import db_session, commit, ObjectNotFound
 
-from api.auth import get_password_hash
-from api.auth.models import User, UserCreate, UserInDB
+from api.auth import get_password_hash, invalidate_principal, get_principal_cache_stats
+from api.auth.models import User, UserCreate, UserUpdate, UserInDB
 from api.auth.roles import Role
+from api.services.data_version_service import DataVersionService, USERS_SCOPE
 from database.models import User as DBUser, Person as DBPerson
 from api.exceptions.auth import (
     UserNotFoundException,
@@ -85,4 +86,87 @@ class AuthService:
             person_id=new_user.person.id,
             role=Role(new_user.role),
             disabled=new_user.disabled
-        )
\ No newline at end of file
+        )
+
+    @staticmethod
+    @db_session
+    def update_user(username: str, user_data: UserUpdate) -> User:
+        """
+        Ändert Rolle oder Status eines Benutzers.
+        
+        Der Änderungszähler der Benutzer wird in derselben Transaktion erhöht. Damit verfehlen
+        alle Worker ihre gecachten Anmeldungen, und die Änderung wirkt ab der nächsten Anfrage
+        für alle bestehenden Tokens.
+        
+        Args:
+            username: Der Benutzername
+            user_data: Die zu ändernden Felder
+            
+        Returns:
+            Das aktualisierte User-Objekt
+            
+        Raises:
+            UserNotFoundException: Wenn der Benutzer nicht gefunden wurde
+        """
+        db_user = DBUser.get(username=username)
+        if not db_user:
+            raise UserNotFoundException(username=username)
+        
+        if user_data.role is not None:
+            db_user.role = user_data.role.value
+        if user_data.disabled is not None:
+            db_user.disabled = user_data.disabled
+        DataVersionService.bump([USERS_SCOPE])
+        
+        commit()
+        invalidate_principal(username)
+        
+        return User(
+            username=db_user.username,
+            person_id=db_user.person.id,
+            role=Role(db_user.role),
+            disabled=db_user.disabled
+        )
+
+    @staticmethod
+    def disable_user(username: str) -> User:
+        """
+        Deaktiviert einen Benutzer.
+        
+        Args:
+            username: Der Benutzername
+            
+        Returns:
+            Das aktualisierte User-Objekt
+            
+        Raises:
+            UserNotFoundException: Wenn der Benutzer nicht gefunden wurde
+        """
+        return AuthService.update_user(username, UserUpdate(disabled=True))
+
+    @staticmethod
+    def change_role(username: str, role: Role) -> User:
+        """
+        Ändert die Rolle eines Benutzers.
+        
+        Args:
+            username: Der Benutzername
+            role: Die neue Rolle
+            
+        Returns:
+            Das aktualisierte User-Objekt
+            
+        Raises:
+            UserNotFoundException: Wenn der Benutzer nicht gefunden wurde
+        """
+        return AuthService.update_user(username, UserUpdate(role=role))
+
+    @staticmethod
+    def get_principal_cache_stats() -> Dict[str, Any]:
+        """
+        Gibt Treffer- und Fehlschlagzähler des Caches der angemeldeten Benutzer zurück.
+        
+        Returns:
+            Dictionary mit der Cache-Statistik inklusive Trefferquote
+        """
+        return get_principal_cache_stats()
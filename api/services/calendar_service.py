@@ -2,19 +2,45 @@
 Service für Kalender-Funktionalitäten mit integrierter Fehlerbehandlung.
 """
 import calendar
+import hashlib
+import os
 from datetime import date, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Callable, Hashable, Iterable, Optional, Tuple
 from uuid import UUID
 
 from pony.orm import db_session, select, ObjectNotFound
 
 from api.models import schemas
+from api.services.appointment_loader import load_appointment_details
 from database.models import Appointment as DBAppointment
 from database.models import Person as DBPerson
 from database.models import LocationOfWork as DBLocationOfWork
 from api.exceptions.appointment import InvalidAppointmentDateException
 from api.exceptions.person import PersonNotFoundException
 from api.exceptions.location import LocationNotFoundException
+from api.utils.cache import TTLCache
+
+# Cache für befüllte Monatsansichten, Schlüssel: (Jahr, Monat, Personenfilter, Ortsfilter, heute)
+MONTH_CACHE_SIZE = int(os.environ.get("CALENDAR_MONTH_CACHE_SIZE", "256"))
+MONTH_CACHE_TTL_SECONDS = float(os.environ.get("CALENDAR_MONTH_CACHE_TTL", "300"))
+_month_cache = TTLCache(
+    maxsize=MONTH_CACHE_SIZE, ttl=MONTH_CACHE_TTL_SECONDS, name="calendar_month"
+)
+
+# Versionierter Snapshot der Filter-Optionen (Personen und Arbeitsorte)
+FILTER_OPTIONS_TTL_SECONDS = float(os.environ.get("CALENDAR_FILTER_OPTIONS_TTL", "600"))
+_filter_options_cache = TTLCache(
+    maxsize=1, ttl=FILTER_OPTIONS_TTL_SECONDS, name="calendar_filter_options"
+)
+
+# Gerenderte Tageszellen und Tagesansichten, Schlüssel: (Art, Datum, Inhaltsversion, Varianten)
+DAY_FRAGMENT_CACHE_SIZE = int(os.environ.get("CALENDAR_DAY_FRAGMENT_CACHE_SIZE", "4096"))
+DAY_FRAGMENT_CACHE_TTL_SECONDS = float(os.environ.get("CALENDAR_DAY_FRAGMENT_CACHE_TTL", "3600"))
+_day_fragment_cache = TTLCache(
+    maxsize=DAY_FRAGMENT_CACHE_SIZE,
+    ttl=DAY_FRAGMENT_CACHE_TTL_SECONDS,
+    name="calendar_day_fragments",
+)
 
 
 class CalendarService:
@@ -105,6 +131,65 @@ class CalendarService:
         
         return calendar_weeks
     
+    @staticmethod
+    def _resolve_filters(
+        filter_person_id: Optional[str] = None,
+        filter_location_id: Optional[str] = None
+    ) -> Tuple[Optional[DBPerson], Optional[DBLocationOfWork]]:
+        """
+        Lädt die Entitäten zu den Filter-IDs. Muss innerhalb einer db_session aufgerufen werden.
+        
+        Args:
+            filter_person_id: Optional. ID der Person für die Filterung
+            filter_location_id: Optional. ID des Arbeitsortes für die Filterung
+            
+        Returns:
+            Tupel aus Person und Arbeitsort (jeweils None, wenn kein Filter gesetzt ist)
+            
+        Raises:
+            InvalidAppointmentDateException: Wenn eine Filter-ID keine gültige UUID ist
+            PersonNotFoundException: Wenn die angegebene Person nicht existiert
+            LocationNotFoundException: Wenn der angegebene Ort nicht existiert
+        """
+        person = None
+        location = None
+        
+        if filter_person_id:
+            try:
+                person_uuid = (
+                    UUID(filter_person_id)
+                    if isinstance(filter_person_id, str)
+                    else filter_person_id
+                )
+            except ValueError:
+                raise InvalidAppointmentDateException(
+                    message=f"Ungültige Person-ID: {filter_person_id}",
+                    field="filter_person_id",
+                    value=filter_person_id
+                )
+            person = DBPerson.get(id=person_uuid)
+            if not person:
+                raise PersonNotFoundException(person_id=person_uuid)
+        
+        if filter_location_id:
+            try:
+                location_uuid = (
+                    UUID(filter_location_id)
+                    if isinstance(filter_location_id, str)
+                    else filter_location_id
+                )
+            except ValueError:
+                raise InvalidAppointmentDateException(
+                    message=f"Ungültige Arbeitsort-ID: {filter_location_id}",
+                    field="filter_location_id",
+                    value=filter_location_id
+                )
+            location = DBLocationOfWork.get(id=location_uuid)
+            if not location:
+                raise LocationNotFoundException(location_id=location_uuid)
+        
+        return person, location
+    
     @staticmethod
     @db_session
     def fill_calendar_with_appointments(
@@ -127,6 +212,27 @@ class CalendarService:
             PersonNotFoundException: Wenn die angegebene Person nicht existiert
             LocationNotFoundException: Wenn der angegebene Ort nicht existiert
         """
+        person, location = CalendarService._resolve_filters(filter_person_id, filter_location_id)
+        return CalendarService._fill_calendar(calendar_weeks, person, location)
+    
+    @staticmethod
+    def _fill_calendar(
+        calendar_weeks: List[List[Dict[str, Any]]],
+        person: Optional[DBPerson],
+        location: Optional[DBLocationOfWork]
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Füllt den Kalender mit den Terminen zu bereits geladenen Filter-Entitäten.
+        Muss innerhalb einer db_session aufgerufen werden.
+        
+        Args:
+            calendar_weeks: Die Kalenderdaten
+            person: Optional. Nur Termine mit dieser Person
+            location: Optional. Nur Termine an diesem Ort
+            
+        Returns:
+            Die Kalenderdaten mit Terminen
+        """
         # Termine für den aktuellen Monat laden
         start_date = calendar_weeks[0][0]["date"]  # Erster Tag im Kalender
         end_date = calendar_weeks[-1][-1]["date"]  # Letzter Tag im Kalender
@@ -137,54 +243,277 @@ class CalendarService:
         )
         
         # Filterung nach Person
-        if filter_person_id:
-            try:
-                person_uuid = UUID(filter_person_id) if isinstance(filter_person_id, str) else filter_person_id
-                person = DBPerson.get(id=person_uuid)
-                if not person:
-                    raise PersonNotFoundException(person_id=person_uuid)
-                appointments_query = select(a for a in appointments_query if person in a.persons)
-            except ValueError:
-                raise InvalidAppointmentDateException(
-                    message=f"Ungültige Person-ID: {filter_person_id}",
-                    field="filter_person_id",
-                    value=filter_person_id
-                )
+        if person:
+            appointments_query = select(a for a in appointments_query if person in a.persons)
         
         # Filterung nach Arbeitsort
-        if filter_location_id:
-            try:
-                location_uuid = UUID(filter_location_id) if isinstance(filter_location_id, str) else filter_location_id
-                location = DBLocationOfWork.get(id=location_uuid)
-                if not location:
-                    raise LocationNotFoundException(location_id=location_uuid)
-                appointments_query = appointments_query.filter(
-                    lambda a: a.location.id == location_uuid
-                )
-            except ValueError:
-                raise InvalidAppointmentDateException(
-                    message=f"Ungültige Arbeitsort-ID: {filter_location_id}",
-                    field="filter_location_id",
-                    value=filter_location_id
-                )
+        if location:
+            location_uuid = location.id
+            appointments_query = appointments_query.filter(
+                lambda a: a.location.id == location_uuid
+            )
         
-        # Abfrage ausführen
-        appointments = list(appointments_query)
+        # Abfrage ausführen, Sortierung nach Startzeit und Dauer übernimmt die Datenbank
+        appointments_data = load_appointment_details(
+            appointments_query.order_by(lambda a: (a.start_time, a.delta))
+        )
         
-        # Termine in den Kalender einfügen
-        for appointment in appointments:
-            appointment_data = schemas.AppointmentDetail.model_validate(appointment)
-            
-            # Termin dem entsprechenden Tag zuordnen
-            for week in calendar_weeks:
-                for day in week:
-                    if day["date"] == appointment.date:
-                        day["appointments"].append(appointment_data)
+        # Termine in einem Durchlauf den Tagen zuordnen
+        CalendarService.bucket_appointments_by_date(calendar_weeks, appointments_data)
         
-        # Termine nach Startzeit sortieren
+        # Inhaltsversion je Tag für den Fragment-Cache der Tageszellen
         for week in calendar_weeks:
             for day in week:
-                day["appointments"].sort(key=lambda a: (a.start_time, a.delta))
+                day["version"] = CalendarService.get_day_version(day["appointments"])
+        
+        return calendar_weeks
+    
+    @staticmethod
+    @db_session
+    def get_month_calendar(
+        year: int,
+        month: int,
+        filter_person_id: Optional[str] = None,
+        filter_location_id: Optional[str] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Liefert die mit Terminen befüllte Monatsansicht, bei Bedarf aus dem Cache.
+        
+        Das Ergebnis wird zwischen Anfragen geteilt und darf nicht verändert werden.
+        
+        Args:
+            year: Das Jahr
+            month: Der Monat (1-12)
+            filter_person_id: Optional. Nur Termine mit dieser Person anzeigen
+            filter_location_id: Optional. Nur Termine an diesem Ort anzeigen
+            
+        Returns:
+            Die Kalenderdaten mit Terminen
+            
+        Raises:
+            InvalidAppointmentDateException: Wenn Monat, Jahr oder Filter-IDs ungültig sind
+            PersonNotFoundException: Wenn die angegebene Person nicht existiert
+            LocationNotFoundException: Wenn der angegebene Ort nicht existiert
+        """
+        person, location = CalendarService._resolve_filters(filter_person_id, filter_location_id)
+        return CalendarService._get_cached_month_calendar(year, month, person, location)
+    
+    @staticmethod
+    def _get_cached_month_calendar(
+        year: int,
+        month: int,
+        person: Optional[DBPerson],
+        location: Optional[DBLocationOfWork]
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Liefert die befüllte Monatsansicht zu bereits geladenen Filter-Entitäten aus dem Cache
+        oder baut sie neu auf. Muss innerhalb einer db_session aufgerufen werden.
+        
+        Args:
+            year: Das Jahr
+            month: Der Monat (1-12)
+            person: Optional. Nur Termine mit dieser Person
+            location: Optional. Nur Termine an diesem Ort
+            
+        Returns:
+            Die Kalenderdaten mit Terminen
+        """
+        # Heutiges Datum gehört zum Schlüssel, da die Ansicht den aktuellen Tag markiert
+        cache_key = (
+            year,
+            month,
+            str(person.id) if person else None,
+            str(location.id) if location else None,
+            date.today()
+        )
+        cached = _month_cache.get(cache_key)
+        if cached is not None:
+            return cached[2]
+        
+        calendar_weeks = CalendarService._fill_calendar(
+            CalendarService.get_calendar_data(year, month), person, location
+        )
+        start_date = calendar_weeks[0][0]["date"]
+        end_date = calendar_weeks[-1][-1]["date"]
+        _month_cache.set(cache_key, (start_date, end_date, calendar_weeks))
+        
+        return calendar_weeks
+    
+    @staticmethod
+    def invalidate_month_cache(dates: Optional[Iterable[date]] = None) -> int:
+        """
+        Verwirft gecachte Monatsansichten und Tagesfragmente nach Schreibzugriffen.
+        
+        Args:
+            dates: Optional. Geänderte Termindaten; es werden nur Ansichten verworfen, die eines
+                   dieser Daten enthalten, und nur die Fragmente dieser Tage. Ohne Angabe
+                   (z.B. bei Personen- oder Ortsänderungen) werden alle verworfen.
+            
+        Returns:
+            Anzahl der verworfenen Monatsansichten
+        """
+        if dates is None:
+            CalendarService.invalidate_day_fragments()
+            return _month_cache.invalidate()
+        
+        changed_dates = set(dates)
+        if not changed_dates:
+            return 0
+        
+        CalendarService.invalidate_day_fragments(changed_dates)
+        return _month_cache.invalidate(
+            lambda key, entry: any(entry[0] <= d <= entry[1] for d in changed_dates)
+        )
+    
+    @staticmethod
+    def _find_cached_day(day_date: date) -> Optional[Dict[str, Any]]:
+        """
+        Sucht einen Tag in der gecachten ungefilterten Monatsansicht seines Monats.
+        
+        Args:
+            day_date: Das Datum
+            
+        Returns:
+            Der Tag mit Terminen und Inhaltsversion oder None, wenn der Monat nicht gecacht ist
+        """
+        cached = _month_cache.get((day_date.year, day_date.month, None, None, date.today()))
+        if cached is None:
+            return None
+        for week in cached[2]:
+            for day in week:
+                if day["date"] == day_date:
+                    return day
+        return None
+    
+    @staticmethod
+    def get_day_version(appointments: List[schemas.AppointmentDetail]) -> str:
+        """
+        Berechnet die Inhaltsversion der Termine eines Tages.
+        
+        Die Version ist ein Hash aller Termindaten inklusive Ort und Personen; jede Änderung,
+        die sich auf die Darstellung auswirken kann, ergibt eine neue Version.
+        
+        Args:
+            appointments: Die Termine des Tages in Anzeigereihenfolge
+            
+        Returns:
+            Die Version als kurzer Hex-String
+        """
+        digest = hashlib.sha1()
+        for appointment in appointments:
+            digest.update(appointment.model_dump_json().encode("utf-8"))
+            digest.update(b"\n")
+        return digest.hexdigest()[:16]
+    
+    @staticmethod
+    def get_day_fragment(
+        kind: str,
+        day_date: date,
+        version: Optional[str],
+        render: Callable[[], str],
+        *variant: Hashable
+    ) -> str:
+        """
+        Liefert ein gerendertes Tagesfragment aus dem Cache oder rendert es.
+        
+        Da der Schlüssel die Inhaltsversion enthält, wird nach einer Änderung der Termine
+        automatisch neu gerendert; veraltete Einträge verdrängt invalidate_day_fragments.
+        
+        Args:
+            kind: Art des Fragments, z.B. "cell" oder "day_view"
+            day_date: Das Datum des Tages
+            version: Die Inhaltsversion (get_day_version); ohne Version wird nicht gecacht
+            render: Funktion, die das Fragment rendert
+            *variant: Weitere Werte, von denen die Darstellung abhängt (z.B. "heute")
+            
+        Returns:
+            Das gerenderte HTML
+        """
+        if version is None:
+            return render()
+        
+        cache_key = (kind, day_date, version) + variant
+        html = _day_fragment_cache.get(cache_key)
+        if html is None:
+            html = render()
+            _day_fragment_cache.set(cache_key, html)
+        return html
+    
+    @staticmethod
+    def invalidate_day_fragments(dates: Optional[Iterable[date]] = None) -> int:
+        """
+        Verwirft gerenderte Tagesfragmente.
+        
+        Args:
+            dates: Optional. Nur Fragmente dieser Tage verwerfen; ohne Angabe alle
+            
+        Returns:
+            Anzahl der verworfenen Einträge
+        """
+        if dates is None:
+            return _day_fragment_cache.invalidate()
+        
+        changed_dates = set(dates)
+        if not changed_dates:
+            return 0
+        
+        return _day_fragment_cache.invalidate(lambda key, html: key[1] in changed_dates)
+    
+    @staticmethod
+    def get_day_fragment_cache_stats() -> Dict[str, Any]:
+        """
+        Gibt Treffer- und Fehlschlagzähler des Fragment-Caches für Tage zurück.
+        
+        Returns:
+            Dictionary mit der Cache-Statistik
+        """
+        return _day_fragment_cache.stats()
+    
+    @staticmethod
+    def get_month_cache_stats() -> Dict[str, Any]:
+        """
+        Gibt Treffer- und Fehlschlagzähler des Monatsansicht-Caches zurück.
+        
+        Returns:
+            Dictionary mit der Cache-Statistik
+        """
+        return _month_cache.stats()
+    
+    @staticmethod
+    def get_cache_stats() -> List[Dict[str, Any]]:
+        """
+        Gibt die Statistiken aller Caches des Kalenders zurück (Monatsansichten,
+        Filter-Optionen, Tagesfragmente).
+        
+        Returns:
+            Liste der Cache-Statistiken
+        """
+        return [_month_cache.stats(), _filter_options_cache.stats(), _day_fragment_cache.stats()]
+    
+    @staticmethod
+    def bucket_appointments_by_date(
+        calendar_weeks: List[List[Dict[str, Any]]],
+        appointments: List[schemas.AppointmentDetail]
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Verteilt Termine über einen Datums-Index auf die Tage des Kalenders.
+        
+        Die Termine müssen bereits nach Startzeit und Dauer sortiert sein; die Reihenfolge
+        bleibt innerhalb jedes Tages erhalten, sodass kein erneutes Sortieren nötig ist.
+        
+        Args:
+            calendar_weeks: Die Kalenderdaten
+            appointments: Die sortierten Termine
+            
+        Returns:
+            Die Kalenderdaten mit Terminen
+        """
+        day_index = {day["date"]: day["appointments"] for week in calendar_weeks for day in week}
+        
+        for appointment in appointments:
+            day_appointments = day_index.get(appointment.date)
+            if day_appointments is not None:
+                day_appointments.append(appointment)
         
         return calendar_weeks
     
@@ -208,50 +537,100 @@ class CalendarService:
             PersonNotFoundException: Wenn die angegebene Person nicht existiert
             LocationNotFoundException: Wenn der angegebene Ort nicht existiert
         """
-        active_filters = {
-            "person": None,
-            "location": None
+        person, location = CalendarService._resolve_filters(filter_person_id, filter_location_id)
+        return CalendarService._build_active_filters(person, location)
+    
+    @staticmethod
+    def _build_active_filters(
+        person: Optional[DBPerson],
+        location: Optional[DBLocationOfWork]
+    ) -> Dict[str, Optional[Dict[str, str]]]:
+        """
+        Baut die Anzeige der aktiven Filter aus bereits geladenen Entitäten.
+        
+        Args:
+            person: Optional. Die gefilterte Person
+            location: Optional. Der gefilterte Arbeitsort
+            
+        Returns:
+            Dictionary mit den aktiven Filtern
+        """
+        return {
+            "person": (
+                {"id": str(person.id), "name": f"{person.f_name} {person.l_name}"}
+                if person
+                else None
+            ),
+            "location": {"id": str(location.id), "name": location.name} if location else None,
+        }
+    
+    @staticmethod
+    @db_session
+    def get_calendar_page(
+        year: int,
+        month: int,
+        filter_person_id: Optional[str] = None,
+        filter_location_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Baut das vollständige Seitenmodell der Kalenderansicht in einer einzigen db_session.
+        
+        Person und Arbeitsort der Filter werden nur einmal geladen und für Termine und
+        aktive Filter gemeinsam genutzt; Monatsansicht und Filter-Optionen kommen aus dem Cache,
+        sofern vorhanden.
+        
+        Args:
+            year: Das Jahr
+            month: Der Monat (1-12)
+            filter_person_id: Optional. Nur Termine mit dieser Person anzeigen
+            filter_location_id: Optional. Nur Termine an diesem Ort anzeigen
+            
+        Returns:
+            Dictionary mit Kalenderdaten, Monatsname, aktiven Filtern und Filter-Optionen
+            
+        Raises:
+            InvalidAppointmentDateException: Wenn Monat, Jahr oder Filter-IDs ungültig sind
+            PersonNotFoundException: Wenn die angegebene Person nicht existiert
+            LocationNotFoundException: Wenn der angegebene Ort nicht existiert
+        """
+        person, location = CalendarService._resolve_filters(filter_person_id, filter_location_id)
+        
+        return {
+            "calendar_weeks": CalendarService._get_cached_month_calendar(
+                year, month, person, location
+            ),
+            "month_name": CalendarService.get_month_name(month),
+            "active_filters": CalendarService._build_active_filters(person, location),
+            "filter_options": CalendarService.get_filter_options(),
         }
+    
+    @staticmethod
+    def get_filter_options() -> Dict[str, Any]:
+        """
+        Liefert alle Filter-Optionen (Personen und Arbeitsorte) für die Kalenderansicht.
         
-        # Namen der gefilterten Entitäten abrufen für die Anzeige
-        if filter_person_id:
-            try:
-                person_uuid = UUID(filter_person_id) if isinstance(filter_person_id, str) else filter_person_id
-                person = DBPerson.get(id=person_uuid)
-                if not person:
-                    raise PersonNotFoundException(person_id=person_uuid)
-                active_filters["person"] = {"id": str(person.id), "name": f"{person.f_name} {person.l_name}"}
-            except ValueError:
-                raise InvalidAppointmentDateException(
-                    message=f"Ungültige Person-ID: {filter_person_id}",
-                    field="filter_person_id",
-                    value=filter_person_id
-                )
+        Die Optionen werden als versionierter Snapshot gecacht und nur nach Änderungen an
+        Personen oder Arbeitsorten (bzw. nach Ablauf der TTL) neu geladen. Die Version ist ein
+        Hash des Inhalts und damit über Worker-Prozesse hinweg vergleichbar.
         
-        if filter_location_id:
-            try:
-                location_uuid = UUID(filter_location_id) if isinstance(filter_location_id, str) else filter_location_id
-                location = DBLocationOfWork.get(id=location_uuid)
-                if not location:
-                    raise LocationNotFoundException(location_id=location_uuid)
-                active_filters["location"] = {"id": str(location.id), "name": location.name}
-            except ValueError:
-                raise InvalidAppointmentDateException(
-                    message=f"Ungültige Arbeitsort-ID: {filter_location_id}",
-                    field="filter_location_id",
-                    value=filter_location_id
-                )
+        Returns:
+            Dictionary mit Version, allen Personen und allen Arbeitsorten
+        """
+        snapshot = _filter_options_cache.get("snapshot")
+        if snapshot is None:
+            snapshot = CalendarService._load_filter_options()
+            _filter_options_cache.set("snapshot", snapshot)
         
-        return active_filters
+        return snapshot
     
     @staticmethod
     @db_session
-    def get_filter_options() -> Dict[str, List[Any]]:
+    def _load_filter_options() -> Dict[str, Any]:
         """
-        Lädt alle Filter-Optionen (Personen und Arbeitsorte) für die Kalenderansicht.
+        Lädt die Filter-Optionen aus der Datenbank und berechnet ihre Version.
         
         Returns:
-            Dictionary mit allen Personen und Arbeitsorten
+            Dictionary mit Version, allen Personen und allen Arbeitsorten
         """
         # Alle Personen und Arbeitsorte für Filter-Dropdowns laden
         all_persons = [schemas.Person.model_validate(p) for p in 
@@ -259,11 +638,26 @@ class CalendarService:
         all_locations = [schemas.LocationOfWorkDetail.model_validate(l) for l in 
                          DBLocationOfWork.select().order_by(lambda l: l.name)]
         
+        # Version aus den angezeigten Inhalten der Dropdowns ableiten
+        version_source = "\n".join(
+            [f"p:{p.id}:{p.f_name}:{p.l_name}" for p in all_persons] +
+            [f"l:{l.id}:{l.name}" for l in all_locations]
+        )
+        version = hashlib.sha1(version_source.encode("utf-8")).hexdigest()[:16]
+        
         return {
+            "version": version,
             "all_persons": all_persons,
             "all_locations": all_locations
         }
     
+    @staticmethod
+    def invalidate_filter_options() -> None:
+        """
+        Verwirft den Snapshot der Filter-Optionen nach Änderungen an Personen oder Arbeitsorten.
+        """
+        _filter_options_cache.invalidate()
+    
     @staticmethod
     def adjust_month(year: int, month: int, direction: Optional[str] = None) -> Dict[str, int]:
         """
@@ -304,32 +698,58 @@ class CalendarService:
             return {"year": year, "month": month}
     
     @staticmethod
-    @db_session
-    def get_day_view_data(date_str: str) -> Dict[str, Any]:
+    def parse_date(date_str: str) -> date:
         """
-        Bereitet Daten für die Tagesansicht vor.
+        Wandelt ein Datum aus einer URL in ein date-Objekt um.
         
         Args:
             date_str: Das Datum im Format YYYY-MM-DD
             
         Returns:
-            Dictionary mit den Daten für die Tagesansicht
+            Das Datum
             
         Raises:
             InvalidAppointmentDateException: Wenn das Datumsformat ungültig ist
         """
         try:
-            selected_date = date.fromisoformat(date_str)
+            return date.fromisoformat(date_str)
         except ValueError:
             raise InvalidAppointmentDateException(
                 message=f"Ungültiges Datumsformat: '{date_str}'. Erwartet wird YYYY-MM-DD.",
                 field="date",
                 value=date_str
             )
+    
+    @staticmethod
+    @db_session
+    def get_day_view_data(date_str: str) -> Dict[str, Any]:
+        """
+        Bereitet Daten für die Tagesansicht vor.
         
-        # Termine für den ausgewählten Tag laden
-        appointments = list(DBAppointment.select(lambda a: a.date == selected_date).order_by(lambda a: a.start_time))
-        appointments_data = [schemas.AppointmentDetail.model_validate(a) for a in appointments]
+        Args:
+            date_str: Das Datum im Format YYYY-MM-DD
+            
+        Returns:
+            Dictionary mit den Daten für die Tagesansicht
+            
+        Raises:
+            InvalidAppointmentDateException: Wenn das Datumsformat ungültig ist
+        """
+        selected_date = CalendarService.parse_date(date_str)
+        
+        # Termine und Inhaltsversion aus der gecachten ungefilterten Monatsansicht übernehmen,
+        # sonst für den ausgewählten Tag laden
+        cached_day = CalendarService._find_cached_day(selected_date)
+        if cached_day is not None:
+            appointments_data = cached_day["appointments"]
+            version = cached_day["version"]
+        else:
+            appointments_data = load_appointment_details(
+                DBAppointment.select(lambda a: a.date == selected_date).order_by(
+                    lambda a: (a.start_time, a.delta)
+                )
+            )
+            version = CalendarService.get_day_version(appointments_data)
         
         # Formatierte Datumsangaben
         day_name = selected_date.strftime("%A")
@@ -352,5 +772,6 @@ class CalendarService:
             "day_name": day_name,
             "formatted_date": formatted_date,
             "appointments": appointments_data,
-            "is_today": selected_date == date.today()
+            "is_today": selected_date == date.today(),
+            "version": version
         }
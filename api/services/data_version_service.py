@@ -0,0 +1,282 @@
+"""
+Service für Änderungszähler je Datenbereich und die daraus gebildeten HTTP-Validatoren.
+
+Schreibzugriffe erhöhen in derselben Transaktion die Zähler der betroffenen Bereiche
+(Termine je Monat, Personen, Arbeitsorte, Benutzer). Lesende Routen bilden daraus ETag und
+Last-Modified und können mit 304 antworten, ohne Daten zu laden oder zu rendern.
+"""
+import calendar
+import hashlib
+import os
+import threading
+import time
+from datetime import date, datetime, timezone
+from typing import Dict, Iterable, List, Set, Tuple
+
+from pony.orm import db_session, select
+
+from api.services.calendar_service import CalendarService
+from api.utils.conditional import Validators, build_validators
+from database.models import db
+from database.models import DataVersion as DBDataVersion
+
+# Globaler Terminbereich (Präfix der Monatsbereiche) sowie Bereiche, deren Änderungen alle
+# Terminansichten betreffen
+APPOINTMENTS_SCOPE = "appointments"
+PERSONS_SCOPE = "persons"
+LOCATIONS_SCOPE = "locations"
+# Rollen und Status der Benutzer; Teil des Schlüssels im Cache der angemeldeten Benutzer
+USERS_SCOPE = "users"
+
+_templates_dir = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "templates"
+)
+
+
+def _fingerprint_templates() -> Tuple[str, float]:
+    """
+    Bildet eine Kennung der ausgelieferten Templates aus Pfaden, Größen und Änderungszeiten.
+
+    Returns:
+        Tupel (Kennung, jüngste Änderungszeit als Unix-Zeitstempel)
+    """
+    digest = hashlib.sha1()
+    newest = 0.0
+    for root, _, files in os.walk(_templates_dir):
+        for name in sorted(files):
+            stat = os.stat(os.path.join(root, name))
+            digest.update(f"{os.path.relpath(os.path.join(root, name), _templates_dir)}:"
+                          f"{stat.st_size}:{stat.st_mtime_ns};".encode("utf-8"))
+            newest = max(newest, stat.st_mtime)
+    return digest.hexdigest()[:12], newest
+
+
+# Kennung des Deployments im ETag, damit geänderte Templates nicht mit 304 beantwortet werden.
+# Gleich für alle Worker eines Deployments; kann z.B. mit dem Commit-Hash gesetzt werden.
+_template_fingerprint, BUILD_TIMESTAMP = _fingerprint_templates()
+ETAG_BUILD_ID = os.environ.get("ETAG_BUILD_ID") or _template_fingerprint
+
+# Zuletzt gesehene Version je Bereich, um In-Process-Caches nach Schreibzugriffen anderer
+# Worker zu verwerfen
+_seen_versions: Dict[str, int] = {}
+_seen_lock = threading.Lock()
+
+
+class DataVersionService:
+    """
+    Service-Klasse für Datenversionen und bedingte GET-Anfragen.
+    """
+
+    @staticmethod
+    def month_scope(year: int, month: int) -> str:
+        """
+        Returns:
+            Der Bereich der Termine eines Monats, z.B. "appointments:2025-03"
+        """
+        return f"{APPOINTMENTS_SCOPE}:{year:04d}-{month:02d}"
+
+    @staticmethod
+    def appointment_scopes(dates: Iterable[date]) -> Set[str]:
+        """
+        Liefert die Bereiche, die eine Terminänderung an den angegebenen Daten betrifft.
+
+        Args:
+            dates: Alte und neue Daten der geänderten Termine
+
+        Returns:
+            Der globale Terminbereich und die Monatsbereiche der Daten
+        """
+        scopes = {APPOINTMENTS_SCOPE}
+        scopes.update(DataVersionService.month_scope(d.year, d.month) for d in dates)
+        return scopes
+
+    @staticmethod
+    def calendar_scopes(start_date: date, end_date: date) -> Set[str]:
+        """
+        Liefert die Bereiche, von denen eine Kalenderansicht über einen Zeitraum abhängt.
+
+        Args:
+            start_date: Erster angezeigter Tag
+            end_date: Letzter angezeigter Tag
+
+        Returns:
+            Die Monatsbereiche des Zeitraums sowie Personen und Arbeitsorte
+        """
+        scopes = {PERSONS_SCOPE, LOCATIONS_SCOPE}
+        year, month = start_date.year, start_date.month
+        while (year, month) <= (end_date.year, end_date.month):
+            scopes.add(DataVersionService.month_scope(year, month))
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        return scopes
+
+    @staticmethod
+    @db_session
+    def bump(scopes: Iterable[str]) -> None:
+        """
+        Erhöht die Zähler der Bereiche atomar in der laufenden Transaktion.
+
+        Wird innerhalb der db_session des Schreibzugriffs aufgerufen, damit Daten und Zähler
+        gemeinsam festgeschrieben werden. Fehlende Zähler werden angelegt.
+
+        Args:
+            scopes: Die geänderten Bereiche
+        """
+        quote = db.provider.quote_name
+        table = quote(DBDataVersion._table_)
+        scope_column = quote(DBDataVersion.scope.columns[0])
+        version_column = quote(DBDataVersion.version.columns[0])
+        changed_at_column = quote(DBDataVersion.changed_at.columns[0])
+        now = time.time()
+        for scope in sorted(set(scopes)):
+            db.execute(
+                f"INSERT INTO {table} ({scope_column}, {version_column}, {changed_at_column}) "
+                f"VALUES ($scope, 0, $now) ON CONFLICT ({scope_column}) DO NOTHING"
+            )
+            db.execute(
+                f"UPDATE {table} SET {version_column} = {version_column} + 1, "
+                f"{changed_at_column} = $now WHERE {scope_column} = $scope"
+            )
+
+    @staticmethod
+    def bump_appointment_dates(dates: Iterable[date]) -> None:
+        """
+        Erhöht die Zähler nach dem Anlegen, Ändern oder Löschen von Terminen.
+
+        Args:
+            dates: Alte und neue Daten der geänderten Termine
+        """
+        DataVersionService.bump(DataVersionService.appointment_scopes(dates))
+
+    @staticmethod
+    @db_session
+    def get_versions(scopes: Iterable[str]) -> Dict[str, Tuple[int, float]]:
+        """
+        Liest die aktuellen Zähler der Bereiche.
+
+        Hat sich ein Zähler seit dem letzten Lesen in diesem Prozess geändert (z.B. durch einen
+        anderen Worker), werden die zugehörigen Monatsansichten, Tagesfragmente und
+        Filter-Optionen verworfen, damit nicht veraltete Inhalte unter neuem ETag ausgeliefert
+        werden.
+
+        Args:
+            scopes: Die Bereiche
+
+        Returns:
+            Dictionary Bereich -> (Version, Unix-Zeitstempel der letzten Änderung); fehlende
+            Bereiche mit (0, 0.0)
+        """
+        scopes = set(scopes)
+        versions = {scope: (0, 0.0) for scope in scopes}
+        rows = select(
+            (v.scope, v.version, v.changed_at) for v in DBDataVersion if v.scope in scopes
+        )
+        for scope, version, changed_at in rows:
+            versions[scope] = (version, changed_at)
+
+        with _seen_lock:
+            changed = [
+                scope
+                for scope, (version, _) in versions.items()
+                if _seen_versions.get(scope) != version
+            ]
+            for scope in changed:
+                _seen_versions[scope] = versions[scope][0]
+        if changed:
+            DataVersionService._invalidate_local_caches(changed)
+        return versions
+
+    @staticmethod
+    def refresh_month(year: int, month: int) -> None:
+        """
+        Liest die Zähler der angezeigten Tage eines Monats vor dem Lesen der Monatsansicht.
+
+        Für Routen ohne Validatoren, damit der Monatscache nach Schreibzugriffen anderer Worker
+        ebenso verworfen wird wie bei bedingten Anfragen.
+
+        Args:
+            year: Das Jahr
+            month: Der Monat (1-12)
+
+        Raises:
+            InvalidAppointmentDateException: Wenn Monat oder Jahr ungültig sind
+        """
+        weeks = CalendarService.get_calendar_data(year, month)
+        DataVersionService.get_versions(
+            DataVersionService.calendar_scopes(weeks[0][0]["date"], weeks[-1][-1]["date"])
+        )
+
+    @staticmethod
+    def _invalidate_local_caches(scopes: List[str]) -> None:
+        """Verwirft die In-Process-Caches, die von den geänderten Bereichen abhängen."""
+        if PERSONS_SCOPE in scopes or LOCATIONS_SCOPE in scopes:
+            CalendarService.invalidate_month_cache()
+            CalendarService.invalidate_filter_options()
+            return
+
+        prefix = f"{APPOINTMENTS_SCOPE}:"
+        changed_dates = []
+        for scope in scopes:
+            if scope.startswith(prefix):
+                year, month = (int(part) for part in scope[len(prefix):].split("-"))
+                changed_dates.extend(
+                    date(year, month, day)
+                    for day in range(1, calendar.monthrange(year, month)[1] + 1)
+                )
+        if changed_dates:
+            CalendarService.invalidate_month_cache(changed_dates)
+
+    @staticmethod
+    def get_validators(
+        scopes: Iterable[str],
+        *variant: object,
+        depends_on_today: bool = False
+    ) -> Validators:
+        """
+        Bildet ETag und Last-Modified aus den Zählern der Bereiche.
+
+        Der ETag enthält zusätzlich die Deployment-Kennung und die Variante (z.B. Benutzer und
+        URL mit Query-Parametern), Last-Modified die jüngste Änderung der Bereiche bzw. Templates.
+
+        Args:
+            scopes: Die Bereiche, von denen die Antwort abhängt
+            *variant: Weitere Werte, von denen die Antwort abhängt
+            depends_on_today: Ob die Antwort das heutige Datum hervorhebt; dann wechselt der ETag
+                              um Mitternacht
+
+        Returns:
+            Die Validatoren
+        """
+        versions = DataVersionService.get_versions(scopes)
+        parts = [ETAG_BUILD_ID]
+        parts.extend(f"{scope}={versions[scope][0]}" for scope in sorted(versions))
+        parts.extend(variant)
+        timestamps = [BUILD_TIMESTAMP] + [changed_at for _, changed_at in versions.values()]
+        if depends_on_today:
+            today = date.today()
+            parts.append(today.isoformat())
+            timestamps.append(datetime.combine(today, datetime.min.time()).timestamp())
+        return build_validators(parts, datetime.fromtimestamp(max(timestamps), timezone.utc))
+
+    @staticmethod
+    def get_validators_for_dates(
+        start_date: date,
+        end_date: date,
+        *variant: object,
+        depends_on_today: bool = False
+    ) -> Validators:
+        """
+        Bildet die Validatoren einer Terminansicht über einen Zeitraum.
+
+        Args:
+            start_date: Erster Tag des Zeitraums
+            end_date: Letzter Tag des Zeitraums
+            *variant: Weitere Werte, von denen die Antwort abhängt
+            depends_on_today: Siehe get_validators
+
+        Returns:
+            Die Validatoren
+        """
+        return DataVersionService.get_validators(
+            DataVersionService.calendar_scopes(start_date, end_date), *variant,
+            depends_on_today=depends_on_today
+        )
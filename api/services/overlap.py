@@ -0,0 +1,246 @@
+"""
+Überschneidungserkennung für Termine auf Basis eines Intervall-Index.
+
+Termine werden als halboffene Intervalle [Beginn, Ende) aus datetime.combine(Datum, Startzeit)
+und Dauer gebildet. Direkt aneinander anschließende Termine überschneiden sich damit nicht, und
+Termine über Mitternacht werden korrekt behandelt.
+
+- IntervalIndex beantwortet Einzelabfragen in O(log n + k) (k = Anzahl der Treffer).
+- sweep_overlaps findet alle Überschneidungen einer Menge in O(n log n + k).
+- find_conflicts gruppiert Intervalle nach Ressource (Arbeitsort oder Person) und prüft jede
+  Gruppe mit einem Sweep.
+- sweep_resource_conflicts prüft einen nach Beginn sortierten Terminstrom in einem Durchlauf
+  für alle Ressourcen gleichzeitig.
+"""
+import heapq
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Hashable, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+from uuid import UUID
+
+LOCATION_CONFLICT = "location"
+PERSON_CONFLICT = "person"
+
+
+class Interval(NamedTuple):
+    """Halboffenes Zeitintervall [start, end) eines Termins."""
+    start: datetime
+    end: datetime
+    appointment_id: Optional[UUID] = None
+
+
+class Conflict(NamedTuple):
+    """Überschneidung zweier Termine an derselben Ressource."""
+    kind: str
+    resource_id: Hashable
+    first: Interval
+    second: Interval
+
+    @property
+    def overlap_start(self) -> datetime:
+        return max(self.first.start, self.second.start)
+
+    @property
+    def overlap_end(self) -> datetime:
+        return min(self.first.end, self.second.end)
+
+
+class AppointmentSlot(NamedTuple):
+    """Zu prüfender Termin: Intervall mit Arbeitsort und beteiligten Personen."""
+    interval: Interval
+    location_id: UUID
+    person_ids: Tuple[UUID, ...] = ()
+
+    def entries(self) -> Iterator[Tuple[str, UUID, Interval]]:
+        """Liefert die Einträge (Art, Ressourcen-ID, Intervall) für Ort und Personen."""
+        yield LOCATION_CONFLICT, self.location_id, self.interval
+        for person_id in self.person_ids:
+            yield PERSON_CONFLICT, person_id, self.interval
+
+
+def to_time(value: Union[time, str]) -> time:
+    """
+    Wandelt eine Startzeit in ein time-Objekt um.
+
+    SQLite liefert Startzeiten je nach Herkunft der Daten auch als "HH:MM:SS".
+    """
+    return value if isinstance(value, time) else time.fromisoformat(str(value))
+
+
+def appointment_interval(
+    appointment_date: date,
+    start_time: Union[time, str],
+    delta: timedelta,
+    appointment_id: Optional[UUID] = None
+) -> Interval:
+    """
+    Bildet das Intervall eines Termins aus Datum, Startzeit und Dauer.
+
+    Args:
+        appointment_date: Das Datum des Termins
+        start_time: Die Startzeit
+        delta: Die Dauer
+        appointment_id: Optional. Die ID des Termins
+
+    Returns:
+        Das Intervall [Beginn, Beginn + Dauer)
+    """
+    start = datetime.combine(appointment_date, to_time(start_time))
+    return Interval(start, start + delta, appointment_id)
+
+
+def time_range_interval(
+    appointment_date: date,
+    start_time: time,
+    end_time: time,
+    appointment_id: Optional[UUID] = None
+) -> Interval:
+    """
+    Bildet das Intervall aus Datum, Start- und Endzeit.
+
+    Liegt die Endzeit nicht nach der Startzeit, endet der Termin am Folgetag.
+
+    Args:
+        appointment_date: Das Datum des Termins
+        start_time: Die Startzeit
+        end_time: Die Endzeit
+        appointment_id: Optional. Die ID des Termins
+
+    Returns:
+        Das Intervall [Beginn, Ende)
+    """
+    start = datetime.combine(appointment_date, start_time)
+    end = datetime.combine(appointment_date, end_time)
+    if end <= start:
+        end += timedelta(days=1)
+    return Interval(start, end, appointment_id)
+
+
+class IntervalIndex:
+    """
+    Statischer Intervall-Index für wiederholte Überschneidungsabfragen.
+
+    Die Intervalle werden nach Beginn sortiert; ein Segmentbaum über dieser Reihenfolge speichert
+    je Knoten das späteste Ende. Eine Abfrage grenzt per Binärsuche alle Intervalle ein, die vor
+    dem Ende des gesuchten Intervalls beginnen, und steigt nur in Teilbäume ab, deren spätestes
+    Ende nach dessen Beginn liegt.
+    """
+
+    def __init__(self, intervals: Iterable[Interval]):
+        """
+        Args:
+            intervals: Die zu indizierenden Intervalle
+        """
+        self._intervals = sorted(intervals, key=lambda interval: (interval.start, interval.end))
+        self._starts = [interval.start for interval in self._intervals]
+        self._size = 1
+        while self._size < len(self._intervals):
+            self._size *= 2
+        self._max_end = [datetime.min] * (2 * self._size)
+        for position, interval in enumerate(self._intervals):
+            self._max_end[self._size + position] = interval.end
+        for node in range(self._size - 1, 0, -1):
+            self._max_end[node] = max(self._max_end[2 * node], self._max_end[2 * node + 1])
+
+    def __len__(self) -> int:
+        return len(self._intervals)
+
+    def overlapping(self, start: datetime, end: datetime) -> List[Interval]:
+        """
+        Liefert alle Intervalle, die sich mit [start, end) überschneiden.
+
+        Args:
+            start: Beginn des gesuchten Intervalls
+            end: Ende des gesuchten Intervalls (exklusiv)
+
+        Returns:
+            Die überlappenden Intervalle, nach Beginn sortiert
+        """
+        limit = bisect_left(self._starts, end)
+        if limit == 0:
+            return []
+        found = []
+        # Knoten, untere und obere Grenze (exklusiv) des abgedeckten Positionsbereichs
+        stack = [(1, 0, self._size)]
+        while stack:
+            node, low, high = stack.pop()
+            if low >= limit or self._max_end[node] <= start:
+                continue
+            if node >= self._size:
+                found.append(self._intervals[low])
+                continue
+            middle = (low + high) // 2
+            stack.append((2 * node + 1, middle, high))
+            stack.append((2 * node, low, middle))
+        return found
+
+
+def sweep_overlaps(intervals: Iterable[Interval]) -> Iterator[Tuple[Interval, Interval]]:
+    """
+    Findet alle überlappenden Paare einer Intervallmenge in einem Durchlauf (Sweep-Line).
+
+    Args:
+        intervals: Die Intervalle, in beliebiger Reihenfolge
+
+    Returns:
+        Iterator über Paare (früher begonnenes Intervall, später begonnenes Intervall)
+    """
+    active = []
+    ordered = sorted(intervals, key=lambda interval: (interval.start, interval.end))
+    for sequence, interval in enumerate(ordered):
+        while active and active[0][0] <= interval.start:
+            heapq.heappop(active)
+        for _, _, other in active:
+            yield other, interval
+        heapq.heappush(active, (interval.end, sequence, interval))
+
+
+def find_conflicts(entries: Iterable[Tuple[str, Hashable, Interval]]) -> Iterator[Conflict]:
+    """
+    Findet alle Überschneidungen je Ressource.
+
+    Args:
+        entries: Tupel (Art, Ressourcen-ID, Intervall), z.B. (LOCATION_CONFLICT, Ort-ID, Intervall)
+                 oder je beteiligter Person (PERSON_CONFLICT, Person-ID, Intervall)
+
+    Returns:
+        Iterator über die gefundenen Konflikte, gruppiert nach Ressource
+    """
+    groups: Dict[Tuple[str, Hashable], List[Interval]] = defaultdict(list)
+    for kind, resource_id, interval in entries:
+        groups[kind, resource_id].append(interval)
+    for (kind, resource_id), intervals in groups.items():
+        for first, second in sweep_overlaps(intervals):
+            yield Conflict(kind, resource_id, first, second)
+
+
+def sweep_resource_conflicts(slots: Iterable[AppointmentSlot]) -> Iterator[Conflict]:
+    """
+    Findet alle Überschneidungen je Arbeitsort und je Person in einem Durchlauf über einen nach
+    Beginn sortierten Terminstrom. Je Ressource wird eine Halde der aktiven Termine geführt;
+    Aufwand O(n log n + k) bei konstantem Speicher je aktivem Termin.
+
+    Args:
+        slots: Die Termine, aufsteigend nach Beginn sortiert (z.B. direkt aus der Datenbank)
+
+    Returns:
+        Iterator über die Konflikte in der Reihenfolge des später beginnenden Termins
+
+    Raises:
+        ValueError: Wenn der Strom nicht nach Beginn sortiert ist
+    """
+    active: Dict[Tuple[str, Hashable], list] = defaultdict(list)
+    previous_start = None
+    for sequence, slot in enumerate(slots):
+        start = slot.interval.start
+        if previous_start is not None and start < previous_start:
+            raise ValueError("Die Termine müssen nach Beginn sortiert sein.")
+        previous_start = start
+        for kind, resource_id, interval in slot.entries():
+            heap = active[kind, resource_id]
+            while heap and heap[0][0] <= start:
+                heapq.heappop(heap)
+            for _, _, other in heap:
+                yield Conflict(kind, resource_id, other, interval)
+            heapq.heappush(heap, (interval.end, sequence, interval))
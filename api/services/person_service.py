@@ -1,13 +1,27 @@
 """
 Service für Personen mit integrierter Fehlerbehandlung.
 """
+from collections import defaultdict
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 
-from pony.orm import db_session, select, count, ObjectNotFound
+from pony.orm import db_session, select, count, commit, ObjectNotFound
 
 from api.models import schemas
+from api.services.appointment_loader import PERSON_LINK_BATCH_SIZE
+from api.services.calendar_service import CalendarService
+from api.services.data_version_service import DataVersionService, PERSONS_SCOPE
+from database.models import db
+from database.models import Appointment as DBAppointment
 from database.models import Person as DBPerson
+from database.search_index import (
+    APPOINTMENT,
+    PERSON,
+    compose_appointment_document,
+    index_entities,
+    index_new_documents,
+    remove_documents,
+)
 from api.exceptions.person import (
     PersonNotFoundException, PersonInUseException,
     DuplicatePersonException, PersonValidationException
@@ -15,6 +29,39 @@ from api.exceptions.person import (
 
 
 class PersonService:
+    @staticmethod
+    def _build_appointment_documents(person: DBPerson) -> List[tuple]:
+        """
+        Baut die Suchtexte aller Termine einer Person aus Tupel-Abfragen, statt Arbeitsort und
+        Personen je Termin nachzuladen. Muss innerhalb einer db_session aufgerufen werden.
+
+        Returns:
+            (Termin-ID, Text) je Termin der Person
+        """
+        appointments = select(
+            (a.id, a.notes, a.location.name, a.guests) for a in DBAppointment if person in a.persons
+        )[:]
+        appointment_ids = [appointment[0] for appointment in appointments]
+        person_names = defaultdict(list)
+        for offset in range(0, len(appointment_ids), PERSON_LINK_BATCH_SIZE):
+            batch = appointment_ids[offset:offset + PERSON_LINK_BATCH_SIZE]
+            for appointment_id, f_name, l_name in select(
+                (a.id, p.f_name, p.l_name)
+                for a in DBAppointment
+                for p in a.persons
+                if a.id in batch
+            ):
+                person_names[appointment_id].append((f_name, l_name))
+        return [
+            (
+                appointment_id,
+                compose_appointment_document(
+                    notes, location_name, person_names[appointment_id], guests
+                ),
+            )
+            for appointment_id, notes, location_name, guests in appointments
+        ]
+
     @staticmethod
     @db_session
     def get_all_persons() -> List[schemas.Person]:
@@ -98,6 +145,15 @@ class PersonService:
             l_name=person_data.l_name,
             email=person_data.email
         )
+        index_entities(db, PERSON, [person])
+        
+        # Änderungszähler für ETags in derselben Transaktion erhöhen
+        DataVersionService.bump([PERSONS_SCOPE])
+        
+        # Erst nach dem Speichern gecachte Kalenderansichten und Filter-Optionen verwerfen
+        commit()
+        CalendarService.invalidate_month_cache()
+        CalendarService.invalidate_filter_options()
         
         return schemas.Person.model_validate(person)
     
@@ -155,6 +211,20 @@ class PersonService:
             person.l_name = person_data.l_name
             person.email = person_data.email
             
+            # Suchindex der Person und ihrer Termine in derselben Transaktion aktualisieren
+            index_entities(db, PERSON, [person])
+            documents = PersonService._build_appointment_documents(person)
+            remove_documents(db, APPOINTMENT, [appointment_id for appointment_id, _ in documents])
+            index_new_documents(db, APPOINTMENT, documents)
+            
+            # Änderungszähler für ETags in derselben Transaktion erhöhen
+            DataVersionService.bump([PERSONS_SCOPE])
+            
+            # Erst nach dem Speichern gecachte Kalenderansichten und Filter-Optionen verwerfen
+            commit()
+            CalendarService.invalidate_month_cache()
+            CalendarService.invalidate_filter_options()
+            
             return schemas.Person.model_validate(person)
         except ObjectNotFound:
             raise PersonNotFoundException(person_id=person_id)
@@ -190,6 +260,15 @@ class PersonService:
             
             # Person löschen
             person.delete()
+            remove_documents(db, PERSON, [person_id])
+            
+            # Änderungszähler für ETags in derselben Transaktion erhöhen
+            DataVersionService.bump([PERSONS_SCOPE])
+            
+            # Erst nach dem Speichern gecachte Kalenderansichten und Filter-Optionen verwerfen
+            commit()
+            CalendarService.invalidate_month_cache()
+            CalendarService.invalidate_filter_options()
             return True
         except ObjectNotFound:
             raise PersonNotFoundException(person_id=person_id)
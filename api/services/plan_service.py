@@ -1,15 +1,41 @@
 """
 Service für Pläne mit integrierter Fehlerbehandlung.
 """
-from typing import List, Optional, Dict, Any
-from uuid import UUID
+import hashlib
+import json
+from typing import List, Optional, Dict, Any, Iterable, Set, Tuple
+from uuid import UUID, uuid4
+from collections import defaultdict
 from datetime import date
 
 from pony.orm import db_session, select, count, ObjectNotFound
+from pony.orm.core import Query
 
 from api.models import schemas
+from api.services.appointment_loader import load_appointment_details, load_person_ids
+from api.services.calendar_service import CalendarService
+from api.services.data_version_service import DataVersionService
+from api.services.overlap import (
+    AppointmentSlot,
+    LOCATION_CONFLICT,
+    PERSON_CONFLICT,
+    appointment_interval,
+    sweep_resource_conflicts,
+)
+from database.bulk_insert import BulkDeleter, BulkInserter
+from database.models import db
+from database.models import Appointment as DBAppointment
+from database.models import ExternalKey as DBExternalKey
+from database.models import LocationOfWork as DBLocationOfWork
+from database.models import Person as DBPerson
 from database.models import Plan as DBPlan
 from database.models import PlanPeriod as DBPlanPeriod
+from database.search_index import (
+    APPOINTMENT,
+    compose_appointment_document,
+    index_new_documents,
+    remove_documents,
+)
 from api.exceptions.plan import (
     PlanNotFoundException, PlanInUseException, 
     DuplicatePlanException, PlanValidationException,
@@ -17,25 +43,153 @@ from api.exceptions.plan import (
 )
 
 
+# Entitätstypen der externen Schlüssel
+SYNC_PLAN_PERIOD = "plan_period"
+SYNC_PLAN = "plan"
+SYNC_APPOINTMENT = "appointment"
+
+# Ergebnis des Abgleichs je Planungsperiode bzw. Plan
+SYNC_CREATED = "created"
+SYNC_UPDATED = "updated"
+SYNC_DELETED = "deleted"
+SYNC_UNCHANGED = "unchanged"
+
+# Anzahl der IDs je Abfrage beim Abgleich
+SYNC_LOOKUP_BATCH_SIZE = 500
+
+
+def content_hash(*values: Any) -> str:
+    """
+    Bildet den Inhalts-Hash einer synchronisierten Entität.
+
+    Args:
+        values: Die abzugleichenden Werte; Datum, Zeit und UUID werden als Text eingerechnet
+
+    Returns:
+        SHA-256 als Hex-String
+    """
+    payload = json.dumps(values, default=str, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _appointment_content_hash(appointment: schemas.PlanPeriodSyncAppointment) -> str:
+    return content_hash(
+        appointment.date,
+        appointment.start_time,
+        appointment.delta.total_seconds(),
+        appointment.location_id,
+        sorted({str(person_id) for person_id in appointment.person_ids}),
+        appointment.guests,
+        appointment.notes,
+    )
+
+
+def _batches(values: Iterable) -> Iterable[list]:
+    """Teilt Werte in Listen zu je SYNC_LOOKUP_BATCH_SIZE für Abfragen mit IN."""
+    values = list(values)
+    for offset in range(0, len(values), SYNC_LOOKUP_BATCH_SIZE):
+        yield values[offset : offset + SYNC_LOOKUP_BATCH_SIZE]
+
+
+def _sample(values: Iterable, size: int = 10) -> str:
+    """Gibt die ersten Werte für Fehlermeldungen aus."""
+    values = sorted(str(value) for value in values)
+    return ", ".join(values[:size]) + (
+        f" (und {len(values) - size} weitere)" if len(values) > size else ""
+    )
+
+
 class PlanService:
+    @staticmethod
+    def _load_plan_summaries(
+        plans: Query, limit: Optional[int] = None
+    ) -> List[schemas.PlanSummary]:
+        """
+        Lädt Pläne mit den Kennzahlen ihrer Termine, ohne Termine oder Personen zu laden.
+        
+        Anzahl der Termine und Personen sowie erster und letzter Termintag werden je Plan per
+        SQL-Aggregat ermittelt; insgesamt vier Abfragen unabhängig von der Anzahl der Termine.
+        Muss innerhalb einer db_session aufgerufen werden.
+        
+        Args:
+            plans: Die Abfrage der Pläne in der gewünschten Reihenfolge.
+            limit: Optional. Maximale Anzahl der Pläne.
+            
+        Returns:
+            Liste der Plan-Übersichten.
+        """
+        plans = plans.prefetch(DBPlan.plan_period)
+        plans = plans[:limit] if limit is not None else plans[:]
+        if not plans:
+            return []
+        plan_ids = [p.id for p in plans]
+        
+        appointment_stats = {
+            plan_id: (appointment_count, first_date, last_date)
+            for plan_id, appointment_count, first_date, last_date in select(
+                (p.id, count(a), min(a.date), max(a.date))
+                for p in DBPlan for a in p.appointments if p.id in plan_ids
+            )
+        }
+        person_counts = dict(select(
+            (p.id, count(person, distinct=True))
+            for p in DBPlan for a in p.appointments for person in a.persons if p.id in plan_ids
+        ))
+        
+        summaries = []
+        for plan in plans:
+            appointment_count, first_date, last_date = appointment_stats.get(
+                plan.id, (0, None, None)
+            )
+            summaries.append(schemas.PlanSummary(
+                id=plan.id,
+                name=plan.name,
+                notes=plan.notes or "",
+                plan_period=schemas.PlanPeriod.model_validate(plan.plan_period),
+                appointment_count=appointment_count,
+                person_count=person_counts.get(plan.id, 0),
+                first_date=first_date,
+                last_date=last_date
+            ))
+        return summaries
+    
+    @staticmethod
+    def _load_plan_detail(plan: DBPlan) -> schemas.PlanDetail:
+        """
+        Serialisiert einen Plan mit seinen Terminen, sortiert nach Datum und Startzeit.
+
+        Die Termine werden über load_appointment_details mit einer festen Anzahl von Abfragen
+        geladen statt einzeln über plan.appointments. Muss innerhalb einer db_session aufgerufen
+        werden.
+        """
+        appointments = DBAppointment.select(lambda a: plan in a.plans).order_by(
+            DBAppointment.date, DBAppointment.start_time
+        )
+        return schemas.PlanDetail(
+            id=plan.id,
+            name=plan.name,
+            notes=plan.notes,
+            plan_period=schemas.PlanPeriod.model_validate(plan.plan_period),
+            appointments=load_appointment_details(appointments)
+        )
+
     @staticmethod
     @db_session
-    def get_all_plans() -> List[schemas.PlanDetail]:
+    def get_all_plans() -> List[schemas.PlanSummary]:
         """
-        Liefert eine Liste aller Pläne.
+        Liefert eine Übersicht aller Pläne mit Kennzahlen ihrer Termine.
         
         Returns:
-            Liste aller Pläne.
+            Liste aller Pläne, nach Beginn der Planungsperiode sortiert.
         """
-        # Alle Pläne aus der Datenbank laden und nach Planperiode gruppieren
         all_plans = DBPlan.select().order_by(lambda p: p.plan_period.start_date)
-        return [schemas.PlanDetail.model_validate(p) for p in all_plans]
+        return PlanService._load_plan_summaries(all_plans)
     
     @staticmethod
     @db_session
-    def get_plans_by_period(plan_period_id: UUID) -> List[schemas.PlanDetail]:
+    def get_plans_by_period(plan_period_id: UUID) -> List[schemas.PlanSummary]:
         """
-        Liefert eine Liste aller Pläne für eine bestimmte Planungsperiode.
+        Liefert eine Übersicht aller Pläne einer bestimmten Planungsperiode.
         
         Args:
             plan_period_id: Die UUID der Planungsperiode.
@@ -52,7 +206,7 @@ class PlanService:
             raise PlanPeriodNotFoundException(period_id=plan_period_id)
             
         plans = DBPlan.select(lambda p: p.plan_period.id == plan_period_id).order_by(lambda p: p.name)
-        return [schemas.PlanDetail.model_validate(p) for p in plans]
+        return PlanService._load_plan_summaries(plans)
     
     @staticmethod
     @db_session
@@ -74,11 +228,7 @@ class PlanService:
             if not plan:
                 raise PlanNotFoundException(plan_id=plan_id)
             
-            plan_detail = schemas.PlanDetail.model_validate(plan)
-            # Sortiere die Termine nach Datum und Startzeit
-            plan_detail.appointments.sort(key=lambda a: (a.date, a.start_time))
-            
-            return plan_detail
+            return PlanService._load_plan_detail(plan)
         except ObjectNotFound:
             raise PlanNotFoundException(plan_id=plan_id)
     
@@ -189,11 +339,7 @@ class PlanService:
             plan.notes = plan_data.notes
             plan.plan_period = period
             
-            plan_detail = schemas.PlanDetail.model_validate(plan)
-            # Sortiere die Termine nach Datum und Startzeit
-            plan_detail.appointments.sort(key=lambda a: (a.date, a.start_time))
-            
-            return plan_detail
+            return PlanService._load_plan_detail(plan)
         except ObjectNotFound:
             raise PlanNotFoundException(plan_id=plan_id)
     
@@ -319,7 +465,79 @@ class PlanService:
     
     @staticmethod
     @db_session
-    def search_plans(search_term: str, limit: int = 20) -> List[schemas.PlanDetail]:
+    def get_plan_period_conflicts(
+        plan_period_id: UUID, limit: int = 1000
+    ) -> schemas.PlanPeriodConflictReport:
+        """
+        Ermittelt alle Überschneidungen je Arbeitsort und je Person innerhalb einer Planungsperiode.
+        
+        Die Termine werden nach Beginn sortiert aus der Datenbank gelesen und in einem Durchlauf
+        per Sweep-Line geprüft. Es werden nur die benötigten Spalten geladen, keine Entitäten.
+        
+        Args:
+            plan_period_id: Die UUID der Planungsperiode.
+            limit: Maximale Anzahl der aufgeführten Konflikte; die Zähler umfassen immer alle.
+            
+        Returns:
+            Konfliktbericht mit Zählern und den ersten Konflikten.
+            
+        Raises:
+            PlanPeriodNotFoundException: Wenn die Planungsperiode nicht gefunden wurde.
+        """
+        plan_period = DBPlanPeriod.get(id=plan_period_id)
+        if not plan_period:
+            raise PlanPeriodNotFoundException(period_id=plan_period_id)
+        
+        # Personen je Termin mit einer Abfrage über die Verknüpfungstabelle laden
+        persons_by_appointment = defaultdict(list)
+        for appointment_id, person_id in select(
+            (a.id, p.id) for a in DBAppointment for p in a.persons if a.plan_period == plan_period
+        ):
+            persons_by_appointment[appointment_id].append(person_id)
+        
+        rows = select(
+            (a.id, a.date, a.start_time, a.delta, a.location.id)
+            for a in DBAppointment if a.plan_period == plan_period
+        ).order_by(2, 3)
+        
+        appointment_count = 0
+        
+        def slots():
+            nonlocal appointment_count
+            for appointment_id, appointment_date, start_time, delta, location_id in rows:
+                appointment_count += 1
+                yield AppointmentSlot(
+                    appointment_interval(appointment_date, start_time, delta, appointment_id),
+                    location_id,
+                    tuple(persons_by_appointment.get(appointment_id, ()))
+                )
+        
+        counts = {LOCATION_CONFLICT: 0, PERSON_CONFLICT: 0}
+        conflicts = []
+        for conflict in sweep_resource_conflicts(slots()):
+            counts[conflict.kind] += 1
+            if len(conflicts) < limit:
+                conflicts.append(schemas.ConflictEntry(
+                    kind=conflict.kind,
+                    resource_id=conflict.resource_id,
+                    first_appointment_id=conflict.first.appointment_id,
+                    second_appointment_id=conflict.second.appointment_id,
+                    overlap_start=conflict.overlap_start,
+                    overlap_end=conflict.overlap_end
+                ))
+        
+        return schemas.PlanPeriodConflictReport(
+            plan_period_id=plan_period_id,
+            appointment_count=appointment_count,
+            location_conflict_count=counts[LOCATION_CONFLICT],
+            person_conflict_count=counts[PERSON_CONFLICT],
+            conflicts=conflicts,
+            truncated=sum(counts.values()) > len(conflicts)
+        )
+    
+    @staticmethod
+    @db_session
+    def search_plans(search_term: str, limit: int = 20) -> List[schemas.PlanSummary]:
         """
         Durchsucht Pläne nach dem angegebenen Suchbegriff.
         
@@ -328,7 +546,7 @@ class PlanService:
             limit: Maximale Anzahl der Ergebnisse (Standard: 20).
             
         Returns:
-            Liste der passenden Pläne.
+            Liste der passenden Pläne als Übersicht.
         """
         if not search_term or len(search_term.strip()) < 2:
             return []
@@ -339,6 +557,411 @@ class PlanService:
             lambda p: search_term_lower in p.name.lower() or
                      (p.notes and search_term_lower in p.notes.lower()) or
                      search_term_lower in p.plan_period.name.lower()
-        ).order_by(lambda p: p.plan_period.start_date)[:limit]
+        ).order_by(lambda p: p.plan_period.start_date)
+        
+        return PlanService._load_plan_summaries(plans, limit=limit)
+    
+    @staticmethod
+    def sync_plan_period(sync_data: schemas.PlanPeriodSync) -> schemas.PlanPeriodSyncResult:
+        """
+        Gleicht eine Planungsperiode mit dem vollständigen Stand eines externen Systems ab.
+        
+        Periode, Plan und Termine werden über ihre externen Schlüssel zugeordnet und über
+        Inhalts-Hashes verglichen. Geschrieben werden nur neue, geänderte und entfallene
+        Einträge einschließlich der geänderten Verknüpfungen Plan <-> Termin und Termin <-> Person,
+        alles in einer Transaktion. Ein erneuter Abgleich mit unverändertem Stand schreibt nichts.
+        Einträge ohne externen Schlüssel (z.B. manuell angelegte Termine) bleiben unverändert.
+        
+        Args:
+            sync_data: Der Stand der Planungsperiode mit Plan und Terminen.
+            
+        Returns:
+            Die ausgeführten Änderungen.
+            
+        Raises:
+            PlanValidationException: Wenn der Stand ungültig ist (z.B. doppelte Schlüssel,
+                                     Termine außerhalb der Periode, unbekannte Orte oder Personen).
+        """
+        result, changed_dates = PlanService._apply_plan_period_sync(sync_data)
+        
+        # Erst nach dem Speichern gecachte Kalenderansichten verwerfen
+        if changed_dates:
+            CalendarService.invalidate_month_cache(changed_dates)
+        return result
+    
+    @staticmethod
+    def _validate_plan_period_sync(
+        sync_data: schemas.PlanPeriodSync,
+        period_id: Optional[UUID],
+        new_external_ids: List[str],
+        written: List[schemas.PlanPeriodSyncAppointment],
+    ) -> Tuple[Dict[UUID, str], Dict[UUID, Tuple[str, str]]]:
+        """
+        Prüft den Stand vor dem Schreiben. Orte und Personen werden nur für neue und geänderte
+        Termine nachgeschlagen.
+        
+        Returns:
+            Tupel (Ortsnamen je ID, (Vorname, Nachname) je Personen-ID) der geschriebenen Termine
+            
+        Raises:
+            PlanValidationException: Wenn der Stand ungültig ist.
+        """
+        errors = {}
+        if not sync_data.name.strip():
+            errors["name"] = "Der Name darf nicht leer sein."
+        if sync_data.start_date > sync_data.end_date:
+            errors["date_range"] = "Das Startdatum muss vor dem Enddatum liegen."
+        
+        external_ids = [a.external_id for a in sync_data.appointments]
+        if len(set(external_ids)) != len(external_ids):
+            seen = set()
+            duplicates = {e for e in external_ids if e in seen or seen.add(e)}
+            errors["appointments"] = f"Doppelte externe Schlüssel: {_sample(duplicates)}"
+        
+        outside = [
+            a.external_id
+            for a in sync_data.appointments
+            if not sync_data.start_date <= a.date <= sync_data.end_date
+        ]
+        if outside:
+            errors["appointments.date"] = (
+                f"Termine außerhalb der Planungsperiode: {_sample(outside)}"
+            )
+
+        if sync_data.plan and sync_data.plan.appointment_external_ids is not None:
+            unknown = set(sync_data.plan.appointment_external_ids) - set(external_ids)
+            if unknown:
+                errors["plan.appointment_external_ids"] = f"Unbekannte Termine: {_sample(unknown)}"
+        
+        # Externe Schlüssel neuer Termine dürfen keiner anderen Periode gehören
+        taken = []
+        for batch in _batches(new_external_ids):
+            query = select(
+                k
+                for k in DBExternalKey
+                if k.entity_type == SYNC_APPOINTMENT and k.external_id in batch
+            )
+            if period_id:
+                query = query.filter(lambda k: k.plan_period_id != period_id)
+            taken.extend(select(k.external_id for k in query))
+        if taken:
+            errors["appointments.external_id"] = (
+                f"Termine gehören zu einer anderen Planungsperiode: {_sample(taken)}"
+            )
+
+        location_names = {}
+        for batch in _batches({a.location_id for a in written}):
+            location_names.update(select((l.id, l.name) for l in DBLocationOfWork if l.id in batch))
+        unknown_locations = {a.location_id for a in written} - set(location_names)
+        if unknown_locations:
+            errors["appointments.location_id"] = (
+                f"Arbeitsorte nicht gefunden: {_sample(unknown_locations)}"
+            )
+
+        person_names = {}
+        for batch in _batches({person_id for a in written for person_id in a.person_ids}):
+            person_names.update(
+                (person_id, (f_name, l_name))
+                for person_id, f_name, l_name in select(
+                    (p.id, p.f_name, p.l_name) for p in DBPerson if p.id in batch
+                )
+            )
+        unknown_persons = {person_id for a in written for person_id in a.person_ids} - set(
+            person_names
+        )
+        if unknown_persons:
+            errors["appointments.person_ids"] = (
+                f"Personen nicht gefunden: {_sample(unknown_persons)}"
+            )
+
+        if errors:
+            raise PlanValidationException(
+                errors=errors, message="Der Stand der Planungsperiode ist ungültig."
+            )
+        return location_names, person_names
+    
+    @staticmethod
+    @db_session
+    def _apply_plan_period_sync(
+        sync_data: schemas.PlanPeriodSync,
+    ) -> Tuple[schemas.PlanPeriodSyncResult, Set[date]]:
+        """
+        Führt den Abgleich in einer Transaktion aus.
+        
+        Returns:
+            Tupel (Ergebnis, alte und neue Daten der geänderten Termine)
+        """
+        period_key = select(
+            (k.entity_id, k.content_hash)
+            for k in DBExternalKey
+            if k.entity_type == SYNC_PLAN_PERIOD and k.external_id == sync_data.external_id
+        ).first()
+        period = DBPlanPeriod.get(id=period_key[0]) if period_key else None
+        
+        # Gespeicherte Termine der Periode: externer Schlüssel -> (ID, Inhalts-Hash)
+        stored = {}
+        if period:
+            stored = {
+                external_id: (entity_id, stored_hash)
+                for external_id, entity_id, stored_hash in select(
+                    (k.external_id, k.entity_id, k.content_hash)
+                    for k in DBExternalKey
+                    if k.plan_period_id == period.id and k.entity_type == SYNC_APPOINTMENT
+                )
+            }
+        
+        incoming = {a.external_id: a for a in sync_data.appointments}
+        hashes = {external_id: _appointment_content_hash(a) for external_id, a in incoming.items()}
+        created = [external_id for external_id in incoming if external_id not in stored]
+        changed = [
+            external_id
+            for external_id in incoming
+            if external_id in stored and stored[external_id][1] != hashes[external_id]
+        ]
+        deleted = [external_id for external_id in stored if external_id not in incoming]
+        
+        # Auch nach dem Löschen der Periode außerhalb des Abgleichs gehören die verwaisten
+        # Schlüssel ihrer Termine zu dieser Periode und werden beim Schreiben entfernt
+        location_names, person_names = PlanService._validate_plan_period_sync(
+            sync_data,
+            period_key[0] if period_key else None,
+            created,
+            [incoming[external_id] for external_id in created + changed],
+        )
+        
+        result = schemas.PlanPeriodSyncResult(
+            plan_period_id=period.id if period else uuid4(),
+            period=SYNC_UNCHANGED,
+            appointments_created=len(created),
+            appointments_updated=len(changed),
+            appointments_deleted=len(deleted),
+            appointments_unchanged=len(incoming) - len(created) - len(changed),
+        )
+        changed_dates = set()
+        
+        # Planungsperiode
+        period_hash = content_hash(sync_data.name, sync_data.start_date, sync_data.end_date)
+        if period is None:
+            if period_key:
+                # Die Periode wurde außerhalb des Abgleichs gelöscht; verwaiste Schlüssel entfernen
+                stale_keys = BulkDeleter.for_entity(DBExternalKey, ["plan_period_id"])
+                stale_keys.add(period_key[0])
+                stale_keys.flush()
+            period = DBPlanPeriod(
+                id=result.plan_period_id,
+                name=sync_data.name,
+                start_date=sync_data.start_date,
+                end_date=sync_data.end_date,
+            )
+            DBExternalKey(
+                entity_type=SYNC_PLAN_PERIOD,
+                external_id=sync_data.external_id,
+                entity_id=period.id,
+                plan_period_id=period.id,
+                content_hash=period_hash,
+            )
+            result.period = SYNC_CREATED
+        elif period_key[1] != period_hash:
+            # Name und Zeitraum der Periode sind Teil der Termindetails; daher die Ansichten aller
+            # Termine der Periode verwerfen
+            changed_dates.update(select(a.date for a in DBAppointment if a.plan_period == period))
+            period.name = sync_data.name
+            period.start_date = sync_data.start_date
+            period.end_date = sync_data.end_date
+            DBExternalKey[SYNC_PLAN_PERIOD, sync_data.external_id].content_hash = period_hash
+            result.period = SYNC_UPDATED
+        # Neue Entitäten vor dem direkten Schreiben über die Verbindung speichern
+        db.flush()
+
+        appointment_ids = {
+            external_id: stored[external_id][0] for external_id in incoming if external_id in stored
+        }
+        appointment_ids.update((external_id, uuid4()) for external_id in created)
+        person_linker = BulkInserter.for_link(DBAppointment.persons)
+        person_unlinker = BulkDeleter.for_link(DBAppointment.persons)
+        key_inserter = BulkInserter.for_entity(
+            DBExternalKey,
+            ["entity_type", "external_id", "entity_id", "plan_period_id", "content_hash"],
+        )
+        key_deleter = BulkDeleter.for_entity(DBExternalKey, ["entity_type", "external_id"])
+        
+        # Entfallene Termine mit ihren Verknüpfungen und Sucheinträgen löschen
+        if deleted:
+            deleted_ids = [stored[external_id][0] for external_id in deleted]
+            for batch in _batches(deleted_ids):
+                changed_dates.update(select(a.date for a in DBAppointment if a.id in batch))
+                remove_documents(db, APPOINTMENT, batch)
+            person_link_deleter = BulkDeleter.for_link(DBAppointment.persons, owner_only=True)
+            plan_link_deleter = BulkDeleter.for_link(DBAppointment.plans, owner_only=True)
+            appointment_deleter = BulkDeleter.for_entity(DBAppointment)
+            for external_id, appointment_id in zip(deleted, deleted_ids):
+                person_link_deleter.add(appointment_id)
+                plan_link_deleter.add(appointment_id)
+                appointment_deleter.add(appointment_id)
+                key_deleter.add(SYNC_APPOINTMENT, external_id)
+            person_link_deleter.flush()
+            plan_link_deleter.flush()
+            appointment_deleter.flush()
+        
+        # Neue Termine gesammelt schreiben
+        appointment_inserter = BulkInserter.for_entity(
+            DBAppointment,
+            ["id", "plan_period", "date", "start_time", "delta", "location", "guests", "notes"],
+        )
+        for external_id in created:
+            a = incoming[external_id]
+            appointment_id = appointment_ids[external_id]
+            appointment_inserter.add(
+                appointment_id,
+                period.id,
+                a.date,
+                a.start_time,
+                a.delta,
+                a.location_id,
+                a.guests,
+                a.notes,
+            )
+            for person_id in dict.fromkeys(a.person_ids):
+                person_linker.add(appointment_id, person_id)
+            key_inserter.add(
+                SYNC_APPOINTMENT, external_id, appointment_id, period.id, hashes[external_id]
+            )
+            changed_dates.add(a.date)
+        appointment_inserter.flush()
+        
+        # Geänderte Termine aktualisieren; Personen nur um die Differenz ergänzen bzw. kürzen
+        changed_ids = [appointment_ids[external_id] for external_id in changed]
+        stored_person_ids = load_person_ids(changed_ids)
+        for batch in _batches(changed):
+            batch_ids = [appointment_ids[external_id] for external_id in batch]
+            entities = {a.id: a for a in DBAppointment.select(lambda a: a.id in batch_ids)}
+            keys = {
+                k.external_id: k
+                for k in DBExternalKey.select(
+                    lambda k: k.entity_type == SYNC_APPOINTMENT and k.external_id in batch
+                )
+            }
+            for external_id in batch:
+                a = incoming[external_id]
+                appointment = entities[appointment_ids[external_id]]
+                changed_dates.update((appointment.date, a.date))
+                appointment.date = a.date
+                appointment.start_time = a.start_time
+                appointment.delta = a.delta
+                if appointment.location.id != a.location_id:
+                    appointment.location = DBLocationOfWork[a.location_id]
+                appointment.guests = a.guests
+                appointment.notes = a.notes
+                keys[external_id].content_hash = hashes[external_id]
+                
+                previous = set(stored_person_ids.get(appointment.id, ()))
+                current = set(a.person_ids)
+                for person_id in current - previous:
+                    person_linker.add(appointment.id, person_id)
+                for person_id in previous - current:
+                    person_unlinker.add(appointment.id, person_id)
+        result.person_links_added = len(person_linker.rows)
+        result.person_links_removed = len(person_unlinker.rows)
+        person_linker.flush()
+        person_unlinker.flush()
+        key_inserter.flush()
+        key_deleter.flush()
+        
+        # Plan (je Planungsperiode höchstens einer) und seine Verknüpfungen zu den Terminen
+        plan_key = select(
+            (k.external_id, k.entity_id, k.content_hash)
+            for k in DBExternalKey
+            if k.plan_period_id == period.id and k.entity_type == SYNC_PLAN
+        ).first()
+        plan = period.plan
+        if sync_data.plan is None:
+            if plan_key and plan and plan.id == plan_key[1]:
+                plan_link_deleter = BulkDeleter.for_link(DBPlan.appointments, owner_only=True)
+                plan_link_deleter.add(plan.id)
+                result.plan_links_removed = count(a for a in DBAppointment if plan in a.plans)
+                plan_link_deleter.flush()
+                plan.delete()
+                result.plan = SYNC_DELETED
+            if plan_key:
+                key_deleter.add(SYNC_PLAN, plan_key[0])
+                key_deleter.flush()
+        else:
+            plan_hash = content_hash(sync_data.plan.name, sync_data.plan.notes)
+            if plan is None:
+                plan = DBPlan(
+                    name=sync_data.plan.name, notes=sync_data.plan.notes, plan_period=period
+                )
+                result.plan = SYNC_CREATED
+            elif plan.name != sync_data.plan.name or plan.notes != sync_data.plan.notes:
+                plan.name = sync_data.plan.name
+                plan.notes = sync_data.plan.notes
+                result.plan = SYNC_UPDATED
+            else:
+                result.plan = SYNC_UNCHANGED
+            
+            if plan_key is None or plan_key[:2] != (sync_data.plan.external_id, plan.id):
+                if plan_key:
+                    key_deleter.add(SYNC_PLAN, plan_key[0])
+                    key_deleter.flush()
+                DBExternalKey(
+                    entity_type=SYNC_PLAN,
+                    external_id=sync_data.plan.external_id,
+                    entity_id=plan.id,
+                    plan_period_id=period.id,
+                    content_hash=plan_hash,
+                )
+            elif plan_key[2] != plan_hash:
+                DBExternalKey[SYNC_PLAN, plan_key[0]].content_hash = plan_hash
+            db.flush()
+            
+            # Nur Verknüpfungen zu Terminen mit externem Schlüssel werden abgeglichen
+            linked = (
+                set()
+                if result.plan == SYNC_CREATED
+                else set(select(a.id for a in DBAppointment if plan in a.plans))
+            )
+            wanted = sync_data.plan.appointment_external_ids
+            desired = {
+                appointment_ids[external_id]
+                for external_id in (incoming if wanted is None else wanted)
+            }
+            plan_linker = BulkInserter.for_link(DBPlan.appointments)
+            plan_unlinker = BulkDeleter.for_link(DBPlan.appointments)
+            for appointment_id in desired - linked:
+                plan_linker.add(plan.id, appointment_id)
+            for appointment_id in (linked & set(appointment_ids.values())) - desired:
+                plan_unlinker.add(plan.id, appointment_id)
+            result.plan_links_added = len(plan_linker.rows)
+            result.plan_links_removed = len(plan_unlinker.rows)
+            plan_linker.flush()
+            plan_unlinker.flush()
+        result.plan_id = plan.id if plan and result.plan != SYNC_DELETED else None
+        
+        # Sucheinträge neuer und geänderter Termine
+        for batch in _batches(changed_ids):
+            remove_documents(db, APPOINTMENT, batch)
+        index_new_documents(
+            db,
+            APPOINTMENT,
+            [
+                (
+                    appointment_ids[external_id],
+                    compose_appointment_document(
+                        incoming[external_id].notes,
+                        location_names[incoming[external_id].location_id],
+                        [
+                            person_names[person_id]
+                            for person_id in dict.fromkeys(incoming[external_id].person_ids)
+                        ],
+                        incoming[external_id].guests,
+                    ),
+                )
+                for external_id in created + changed
+            ],
+        )
+
+        # Änderungszähler für ETags in derselben Transaktion erhöhen
+        if changed_dates:
+            DataVersionService.bump_appointment_dates(changed_dates)
         
-        return [schemas.PlanDetail.model_validate(p) for p in plans]
+        return result, changed_dates
@@ -0,0 +1,162 @@
+"""
+Service für die gemeinsame Suche über Termine, Personen und Arbeitsorte.
+"""
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from pony.orm import db_session, select
+
+from api.models import schemas
+from api.services.appointment_loader import load_appointment_details
+from api.services.appointment_service import AppointmentService
+from api.services.location_service import LocationService
+from api.services.person_service import PersonService
+from database.models import db
+from database.models import Appointment as DBAppointment
+from database.models import Person as DBPerson
+from database.models import LocationOfWork as DBLocationOfWork
+from database.search_index import (
+    APPOINTMENT, PERSON, LOCATION, is_search_index_available, search_grouped_entity_ids
+)
+
+# Reihenfolge der Gruppen in den Suchergebnissen
+SEARCH_GROUPS = (APPOINTMENT, PERSON, LOCATION)
+
+# Standard-Obergrenzen je Entitätstyp
+DEFAULT_SEARCH_LIMIT = 20
+DEFAULT_AUTOCOMPLETE_LIMIT = 5
+
+
+class SearchService:
+    @staticmethod
+    def _resolve_limits(
+        entity_type: Optional[str],
+        limits: Optional[Dict[str, int]],
+        default_limit: int
+    ) -> Dict[str, int]:
+        """
+        Ermittelt die Obergrenzen je Entitätstyp, eingeschränkt auf einen Typ, falls angegeben.
+        """
+        resolved = {group: default_limit for group in SEARCH_GROUPS}
+        if limits:
+            resolved.update({group: limit for group, limit in limits.items() if group in resolved})
+        if entity_type:
+            resolved = {group: limit for group, limit in resolved.items() if group == entity_type}
+        return resolved
+
+    @staticmethod
+    @db_session
+    def search(
+        search_term: str,
+        entity_type: Optional[str] = None,
+        limits: Optional[Dict[str, int]] = None
+    ) -> Iterator[Tuple[str, List[Any]]]:
+        """
+        Durchsucht Termine, Personen und Arbeitsorte und liefert die Treffer gruppiert.
+
+        Die Treffer aller Typen werden mit einer einzigen Indexabfrage ermittelt. Die Gruppen
+        werden nacheinander geladen und geliefert, sodass Aufrufer die erste Gruppe verarbeiten
+        können, bevor die weiteren geladen sind. Ohne Suchindex wird auf die Teilstring-Suche
+        der einzelnen Services ausgewichen.
+
+        Args:
+            search_term: Der Suchbegriff
+            entity_type: Optional. Nur diesen Typ durchsuchen (appointment, person, location)
+            limits: Optional. Obergrenze je Typ (Standard: DEFAULT_SEARCH_LIMIT)
+
+        Returns:
+            Iterator über Tupel (Entitätstyp, Treffer), je Typ nach Relevanz sortiert
+        """
+        resolved_limits = SearchService._resolve_limits(entity_type, limits, DEFAULT_SEARCH_LIMIT)
+        if not search_term or len(search_term.strip()) < 2:
+            for group in resolved_limits:
+                yield group, []
+            return
+
+        if not is_search_index_available(db):
+            fallbacks = {
+                APPOINTMENT: AppointmentService.search_appointments,
+                PERSON: PersonService.search_persons,
+                LOCATION: LocationService.search_locations,
+            }
+            for group, limit in resolved_limits.items():
+                yield group, fallbacks[group](search_term, limit=limit)
+            return
+
+        grouped_ids = search_grouped_entity_ids(db, search_term, resolved_limits)
+        for group, ids in grouped_ids.items():
+            if not ids:
+                yield group, []
+                continue
+            ranking = {entity_id: position for position, entity_id in enumerate(ids)}
+            if group == APPOINTMENT:
+                hits = load_appointment_details(DBAppointment.select(lambda a: a.id in ids))
+            elif group == PERSON:
+                hits = [
+                    schemas.Person.model_validate(p) for p in DBPerson.select(lambda p: p.id in ids)
+                ]
+            else:
+                locations = DBLocationOfWork.select(lambda l: l.id in ids).prefetch(
+                    DBLocationOfWork.address
+                )
+                hits = [schemas.LocationOfWorkDetail.model_validate(l) for l in locations]
+            yield group, sorted(hits, key=lambda hit: ranking[hit.id])
+
+    @staticmethod
+    @db_session
+    def autocomplete(
+        prefix: str,
+        entity_type: Optional[str] = None,
+        limit: int = DEFAULT_AUTOCOMPLETE_LIMIT
+    ) -> List[Dict[str, Any]]:
+        """
+        Liefert kurze Vorschläge für die Eingabe im Suchfeld.
+
+        Lädt nur die für die Anzeige nötigen Daten der wenigen Treffer statt vollständiger Details
+        und ist damit günstig genug für jeden Tastendruck. Ohne Suchindex werden keine
+        Vorschläge geliefert.
+
+        Args:
+            prefix: Der bisher eingegebene Text
+            entity_type: Optional. Nur Vorschläge dieses Typs
+            limit: Maximale Anzahl der Vorschläge je Typ
+
+        Returns:
+            Liste von Dictionaries mit type, id und label, gruppiert nach Typ und Relevanz
+        """
+        if not prefix or len(prefix.strip()) < 2 or not is_search_index_available(db):
+            return []
+
+        grouped_ids = search_grouped_entity_ids(
+            db, prefix, SearchService._resolve_limits(entity_type, None, limit)
+        )
+
+        labels = {}
+        if grouped_ids.get(APPOINTMENT):
+            ids = grouped_ids[APPOINTMENT]
+            appointments = DBAppointment.select(lambda a: a.id in ids).prefetch(
+                DBAppointment.location
+            )
+            for a in appointments:
+                # start_time kann je nach Provider als time oder als "HH:MM:SS" geladen werden
+                labels[a.id] = (
+                    f"{a.date.strftime('%d.%m.%Y')} {str(a.start_time)[:5]} · {a.location.name}"
+                )
+        if grouped_ids.get(PERSON):
+            ids = grouped_ids[PERSON]
+            for person_id, f_name, l_name in select(
+                (p.id, p.f_name, p.l_name) for p in DBPerson if p.id in ids
+            ):
+                labels[person_id] = f"{f_name} {l_name}"
+        if grouped_ids.get(LOCATION):
+            ids = grouped_ids[LOCATION]
+            for location_id, name in select(
+                (l.id, l.name) for l in DBLocationOfWork if l.id in ids
+            ):
+                labels[location_id] = name
+
+        return [
+            {"type": group, "id": str(entity_id), "label": labels[entity_id]}
+            for group, ids in grouped_ids.items()
+            for entity_id in ids
+            if entity_id in labels
+        ]
@@ -0,0 +1,185 @@
+"""
+Statische Dateien mit Inhalts-Hash im Dateinamen, vorkomprimiert als .br und .gz.
+
+Der Build-Schritt kopiert alle Dateien aus static/ nach static/dist/ unter einem Namen mit
+Inhalts-Hash (z.B. css/styles.3f2a9c1b7e.css), legt daneben gzip- und (mit installiertem
+Paket "brotli") brotli-Varianten ab und schreibt die Zuordnung in static/dist/manifest.json.
+Templates verweisen über static_url() auf die gehashten Namen; diese werden mit langer
+Cache-Dauer ausgeliefert, da sich ihr Inhalt unter demselben Namen nie ändert. Ohne Manifest
+verweist static_url() auf die ursprünglichen Dateien.
+
+Ausführen mit: python build_static.py (vor dem Start bzw. beim Deployment)
+"""
+import gzip
+import hashlib
+import json
+import os
+import shutil
+from mimetypes import guess_type
+from typing import Dict, Optional
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from api.middleware.compression import brotli, parse_accept_encoding
+
+project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATIC_DIR = os.path.join(project_dir, "static")
+STATIC_DIST_DIR = os.path.join(STATIC_DIR, "dist")
+MANIFEST_PATH = os.path.join(STATIC_DIST_DIR, "manifest.json")
+STATIC_URL_PREFIX = "/static"
+
+# Dateitypen, für die vorkomprimierte Varianten erzeugt werden
+COMPRESSIBLE_SUFFIXES = (".css", ".js", ".svg", ".html", ".json", ".txt", ".map")
+
+# Cache-Dauer gehashter Dateien; ungehashte Dateien werden bei jeder Verwendung revalidiert
+HASHED_CACHE_CONTROL = "public, max-age=31536000, immutable"
+UNHASHED_CACHE_CONTROL = "no-cache"
+
+# Dateiendungen der vorkomprimierten Varianten, in der Reihenfolge der Bevorzugung
+PRECOMPRESSED_SUFFIXES = (("br", ".br"), ("gzip", ".gz"))
+
+
+def _hashed_name(relative_path: str, content: bytes) -> str:
+    """Fügt den Inhalts-Hash vor der Dateiendung ein: css/styles.css -> css/styles.<hash>.css"""
+    stem, suffix = os.path.splitext(relative_path)
+    return f"{stem}.{hashlib.sha256(content).hexdigest()[:10]}{suffix}"
+
+
+def _write_precompressed(path: str, content: bytes) -> None:
+    """Legt .gz und (falls verfügbar) .br neben der Datei ab, sofern sie kleiner sind."""
+    variants = [(".gz", gzip.compress(content, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append((".br", brotli.compress(content, quality=11)))
+    for suffix, compressed in variants:
+        if len(compressed) < len(content):
+            with open(path + suffix, "wb") as file:
+                file.write(compressed)
+
+
+def build_static_assets(
+    source_dir: str = STATIC_DIR, dist_dir: str = STATIC_DIST_DIR
+) -> Dict[str, str]:
+    """
+    Erzeugt static/dist/ mit gehashten und vorkomprimierten Dateien sowie dem Manifest.
+
+    Ein vorhandenes dist-Verzeichnis wird vollständig ersetzt.
+
+    Args:
+        source_dir: Das Quellverzeichnis der statischen Dateien
+        dist_dir: Das Zielverzeichnis (innerhalb von source_dir, wird beim Einlesen übersprungen)
+
+    Returns:
+        Das Manifest: ursprünglicher relativer Pfad -> gehashter relativer Pfad
+    """
+    if os.path.isdir(dist_dir):
+        shutil.rmtree(dist_dir)
+
+    manifest = {}
+    for root, dirs, files in os.walk(source_dir):
+        dirs[:] = sorted(d for d in dirs if os.path.join(root, d) != dist_dir)
+        for name in sorted(files):
+            source_path = os.path.join(root, name)
+            relative_path = os.path.relpath(source_path, source_dir).replace(os.sep, "/")
+            with open(source_path, "rb") as file:
+                content = file.read()
+
+            hashed_path = _hashed_name(relative_path, content)
+            target_path = os.path.join(dist_dir, *hashed_path.split("/"))
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            with open(target_path, "wb") as file:
+                file.write(content)
+            if name.endswith(COMPRESSIBLE_SUFFIXES):
+                _write_precompressed(target_path, content)
+            manifest[relative_path] = hashed_path
+
+    with open(os.path.join(dist_dir, "manifest.json"), "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=2, sort_keys=True)
+    return manifest
+
+
+def load_manifest(path: str = MANIFEST_PATH) -> Dict[str, str]:
+    """
+    Returns:
+        Das Manifest des letzten Build-Schritts oder ein leeres Dictionary
+    """
+    try:
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {}
+
+
+_manifest = load_manifest()
+
+
+def static_url(path: str) -> str:
+    """
+    Liefert die URL einer statischen Datei, gehasht, sofern sie im Manifest steht.
+
+    Args:
+        path: Der Pfad relativ zu static/, z.B. "css/styles.css"
+
+    Returns:
+        Die URL, z.B. "/static/dist/css/styles.3f2a9c1b7e.css" bzw. "/static/css/styles.css"
+    """
+    hashed_path = _manifest.get(path)
+    if hashed_path is None:
+        return f"{STATIC_URL_PREFIX}/{path}"
+    return f"{STATIC_URL_PREFIX}/dist/{hashed_path}"
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles, das vorkomprimierte Varianten (.br, .gz) passend zu Accept-Encoding ausliefert
+    und Cache-Control für gehashte (dist/) und ungehashte Dateien setzt.
+    """
+
+    def file_response(
+        self,
+        full_path: str,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        accepted = parse_accept_encoding(request_headers.get("accept-encoding", ""))
+        media_type = guess_type(str(full_path))[0] or "text/plain"
+
+        served_path, served_stat, headers = full_path, stat_result, {}
+        if str(full_path).endswith(COMPRESSIBLE_SUFFIXES):
+            headers["Vary"] = "Accept-Encoding"
+            for encoding, suffix in PRECOMPRESSED_SUFFIXES:
+                if encoding not in accepted:
+                    continue
+                variant_stat = self._stat(f"{full_path}{suffix}")
+                if variant_stat is not None:
+                    served_path, served_stat = f"{full_path}{suffix}", variant_stat
+                    headers["Content-Encoding"] = encoding
+                    break
+
+        is_hashed = (
+            os.path.commonpath([os.path.abspath(full_path), STATIC_DIST_DIR]) == STATIC_DIST_DIR
+        )
+        headers["Cache-Control"] = HASHED_CACHE_CONTROL if is_hashed else UNHASHED_CACHE_CONTROL
+
+        response = FileResponse(
+            served_path,
+            status_code=status_code,
+            stat_result=served_stat,
+            media_type=media_type,
+            headers=headers,
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+    @staticmethod
+    def _stat(path: str) -> Optional[os.stat_result]:
+        try:
+            return os.stat(path)
+        except FileNotFoundError:
+            return None
+
@@ -1,6 +1,117 @@
 import os
+import time
+from typing import Any, Dict, Optional
+
+import jinja2
 from fastapi.templating import Jinja2Templates
+from markupsafe import Markup
+
+from api.services.calendar_service import CalendarService
+from api.static_assets import static_url
+from api.utils.metrics import TimedTemplate
 
 # Templates konfigurieren
-templates_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates")
-templates = Jinja2Templates(directory=templates_dir)
+project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+templates_dir = os.path.join(project_dir, "templates")
+
+# Verzeichnis für kompilierte Templates, gemeinsam genutzt von allen Workern; leer = deaktiviert
+TEMPLATE_BYTECODE_CACHE_DIR = os.environ.get(
+    "TEMPLATE_BYTECODE_CACHE_DIR", os.path.join(project_dir, ".cache", "jinja2")
+)
+
+# Alle Templates beim Start kompilieren, statt beim ersten Aufruf
+PRECOMPILE_TEMPLATES = os.environ.get("PRECOMPILE_TEMPLATES", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+
+def _create_bytecode_cache() -> Optional[jinja2.BytecodeCache]:
+    """
+    Erstellt den Dateisystem-Bytecode-Cache, sofern ein Verzeichnis konfiguriert ist.
+
+    Returns:
+        Der Bytecode-Cache oder None
+    """
+    if not TEMPLATE_BYTECODE_CACHE_DIR:
+        return None
+    os.makedirs(TEMPLATE_BYTECODE_CACHE_DIR, exist_ok=True)
+    return jinja2.FileSystemBytecodeCache(TEMPLATE_BYTECODE_CACHE_DIR)
+
+
+templates = Jinja2Templates(
+    env=jinja2.Environment(
+        loader=jinja2.FileSystemLoader(templates_dir),
+        autoescape=True,
+        bytecode_cache=_create_bytecode_cache()
+    )
+)
+# Renderzeiten für Server-Timing und /metrics erfassen
+templates.env.template_class = TimedTemplate
+
+
+def render_day_cell(day: Dict[str, Any]) -> Markup:
+    """
+    Rendert eine Tageszelle des Monatskalenders über den Fragment-Cache des CalendarService.
+
+    Args:
+        day: Der Tag aus den Kalenderdaten (mit Terminen und Inhaltsversion)
+
+    Returns:
+        Das HTML der Tageszelle
+    """
+    return Markup(CalendarService.get_day_fragment(
+        "cell", day["date"], day.get("version"),
+        lambda: templates.get_template("calendar_day_cell.html").render(day=day),
+        day["is_current_month"], day["is_today"]
+    ))
+
+
+def render_day_view(day_data: Dict[str, Any]) -> str:
+    """
+    Rendert das Modal der Tagesansicht über den Fragment-Cache des CalendarService.
+
+    Args:
+        day_data: Die Daten der Tagesansicht (CalendarService.get_day_view_data)
+
+    Returns:
+        Das HTML des Modals
+    """
+    return CalendarService.get_day_fragment(
+        "day_view", day_data["date"], day_data.get("version"),
+        lambda: templates.get_template("day_view_modal.html").render(**day_data),
+        day_data["is_today"]
+    )
+
+
+templates.env.globals["render_day_cell"] = render_day_cell
+templates.env.globals["static_url"] = static_url
+
+
+def precompile_templates() -> int:
+    """
+    Lädt alle Templates unter templates/ (inkl. Unterverzeichnissen wie menus/ und
+    landing_page_sections/) in den Template-Cache der Umgebung.
+
+    Mit Bytecode-Cache wird der kompilierte Code dabei aus dem Cache-Verzeichnis gelesen
+    bzw. dort abgelegt, sodass weitere Worker und Neustarts nicht erneut kompilieren.
+
+    Returns:
+        Anzahl der geladenen Templates
+    """
+    names = templates.env.list_templates(extensions=["html"])
+    for name in names:
+        templates.env.get_template(name)
+    return len(names)
+
+
+def precompile_templates_on_startup() -> None:
+    """
+    Kompiliert die Templates beim Anwendungsstart, falls PRECOMPILE_TEMPLATES gesetzt ist.
+    """
+    if not PRECOMPILE_TEMPLATES:
+        return
+    started = time.perf_counter()
+    count = precompile_templates()
+    print(f"{count} Templates in {(time.perf_counter() - started) * 1000:.0f} ms vorkompiliert")
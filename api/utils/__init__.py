@@ -1,5 +1,9 @@
 # Utils-Package
 
 from .menu_sections import MenuDisplaySection
+from .cache import TTLCache
+from .conditional import Validators, build_validators
+from .json_response import model_json_response
 
-__all__ = ['MenuDisplaySection']
+__all__ = ['MenuDisplaySection', 'TTLCache', 'Validators', 'build_validators',
+           'model_json_response']
@@ -0,0 +1,111 @@
+"""
+In-Process-Cache mit LRU-Verdrängung, Ablaufzeit und Treffer-Statistik.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Threadsicherer LRU-Cache, dessen Einträge nach einer festen Zeit ablaufen.
+
+    Zählt Treffer, Fehlschläge und Verdrängungen, damit Größe und Ablaufzeit
+    anhand realer Zugriffe eingestellt werden können.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, name: str = "cache"):
+        """
+        Args:
+            maxsize: Maximale Anzahl der Einträge
+            ttl: Lebensdauer eines Eintrags in Sekunden
+            name: Name des Caches für Statistiken
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.name = name
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Liefert den Wert zu einem Schlüssel, sofern vorhanden und nicht abgelaufen.
+
+        Args:
+            key: Der Schlüssel
+            default: Rückgabewert, wenn kein gültiger Eintrag existiert
+
+        Returns:
+            Der gecachte Wert oder default
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Speichert einen Wert und verdrängt bei Bedarf den am längsten ungenutzten Eintrag.
+
+        Args:
+            key: Der Schlüssel
+            value: Der zu speichernde Wert
+        """
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, predicate: Optional[Callable[[Hashable, Any], bool]] = None) -> int:
+        """
+        Entfernt Einträge aus dem Cache.
+
+        Args:
+            predicate: Optional. Funktion (Schlüssel, Wert) -> bool; ohne Angabe werden alle
+                       Einträge entfernt
+
+        Returns:
+            Anzahl der entfernten Einträge
+        """
+        with self._lock:
+            if predicate is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                return removed
+            keys = [key for key, (_, value) in self._entries.items() if predicate(key, value)]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Gibt die Zugriffsstatistik des Caches zurück.
+
+        Returns:
+            Dictionary mit Treffern, Fehlschlägen, Verdrängungen, Größe und Trefferquote
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
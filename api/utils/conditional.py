@@ -0,0 +1,98 @@
+"""
+Bedingte GET-Anfragen: ETag/Last-Modified setzen und mit 304 Not Modified antworten.
+
+Die Validatoren werden aus Datenversionen gebildet, nicht aus dem Antworttext. Dadurch kann
+eine Route vor dem Laden, Rendern oder Serialisieren entscheiden, ob der Client aktuell ist.
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Iterable, NamedTuple, Optional
+
+from fastapi import Request, Response
+
+
+class Validators(NamedTuple):
+    """ETag und Last-Modified einer Antwort."""
+    etag: str
+    last_modified: Optional[datetime] = None
+
+    def is_fresh(self, request: Request) -> bool:
+        """
+        Prüft If-None-Match bzw. (nur ohne If-None-Match) If-Modified-Since der Anfrage.
+
+        Args:
+            request: Die Anfrage
+
+        Returns:
+            True, wenn der Client die aktuelle Fassung besitzt
+        """
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            return _matches_etag(if_none_match, self.etag)
+
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since and self.last_modified is not None:
+            try:
+                since = parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            if since.tzinfo is None:
+                since = since.replace(tzinfo=timezone.utc)
+            return self.last_modified.replace(microsecond=0) <= since
+        return False
+
+    def apply(self, response: Response) -> Response:
+        """
+        Setzt ETag, Last-Modified und Cache-Control an der Antwort.
+
+        Cache-Control "private, no-cache" erlaubt dem Browser (auch für HTMX-Anfragen) das
+        Zwischenspeichern, verlangt aber vor jeder Verwendung eine Revalidierung.
+
+        Args:
+            response: Die Antwort
+
+        Returns:
+            Dieselbe Antwort
+        """
+        response.headers["ETag"] = self.etag
+        if self.last_modified is not None:
+            response.headers["Last-Modified"] = format_datetime(self.last_modified, usegmt=True)
+        response.headers["Cache-Control"] = "private, no-cache"
+        return response
+
+    def not_modified(self) -> Response:
+        """
+        Returns:
+            Eine leere Antwort 304 Not Modified mit den Validatoren
+        """
+        return self.apply(Response(status_code=304))
+
+
+def _matches_etag(if_none_match: str, etag: str) -> bool:
+    """Vergleicht If-None-Match schwach (ohne W/-Präfix) mit dem ETag, inkl. "*"."""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def build_validators(
+    parts: Iterable[object],
+    last_modified: Optional[datetime] = None
+) -> Validators:
+    """
+    Bildet einen schwachen ETag aus den Bestandteilen (Datenversionen, Benutzer, Variante).
+
+    Args:
+        parts: Alle Werte, von denen der Inhalt der Antwort abhängt
+        last_modified: Optional. Zeitpunkt der letzten Änderung (UTC)
+
+    Returns:
+        Die Validatoren
+    """
+    digest = hashlib.sha1("\x1f".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return Validators(etag=f'W/"{digest[:20]}"', last_modified=last_modified)
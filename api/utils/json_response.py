@@ -0,0 +1,58 @@
+"""
+Schnelle JSON-Antworten für bereits validierte Pydantic-Modelle.
+
+Gibt eine Route ihr Ergebnis über response_model zurück, validiert FastAPI die Modelle erneut
+gegen das Antwortmodell, wandelt sie mit jsonable_encoder in Python-Objekte um und serialisiert
+diese mit dem json-Modul der Standardbibliothek. Die Services liefern aber bereits validierte
+Schemas; model_json_response serialisiert sie direkt mit dem kompilierten Serializer von
+pydantic-core (TypeAdapter.dump_json). response_model bleibt für die OpenAPI-Dokumentation
+an der Route stehen.
+"""
+from functools import lru_cache
+from typing import Any, Mapping, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def get_type_adapter(annotation: Any) -> TypeAdapter:
+    """
+    Liefert den TypeAdapter eines Typs; der Serializer wird nur einmal je Typ erzeugt.
+
+    Args:
+        annotation: Der Typ, z.B. List[schemas.Appointment]
+
+    Returns:
+        Der TypeAdapter
+    """
+    return TypeAdapter(annotation)
+
+
+def model_json_response(
+    content: Any,
+    annotation: Any,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None
+) -> Response:
+    """
+    Serialisiert bereits validierte Modelle ohne erneute Validierung als JSON-Antwort.
+
+    Da die Route eine fertige Antwort zurückgibt, setzt FastAPI Header eines als Parameter
+    übergebenen Response-Objekts nicht mehr; zusätzliche Header daher hier übergeben.
+
+    Args:
+        content: Modell oder Liste von Modellen passend zu annotation
+        annotation: Der Typ der Antwort, wie im response_model der Route
+        status_code: Der HTTP-Status
+        headers: Optional. Zusätzliche Header
+
+    Returns:
+        Die JSON-Antwort
+    """
+    return Response(
+        content=get_type_adapter(annotation).dump_json(content),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json"
+    )
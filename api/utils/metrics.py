@@ -0,0 +1,265 @@
+"""
+Laufzeitmetriken je Route: Antwortzeit, Anzahl und Dauer der SQL-Anweisungen, Renderzeit der
+Templates.
+
+Die MetricsMiddleware (api/middleware/metrics.py) legt je Anfrage ein RequestMetrics-Objekt im
+Kontext ab. Der PonyORM-Hook (instrument_database) und die Template-Klasse (TimedTemplate)
+tragen SQL- und Renderzeiten dort ein; nach der Antwort fließen die Werte in die Histogramme
+und Zähler der Registry, die /metrics im Prometheus-Textformat ausgibt.
+
+Die Werte gelten je Prozess; bei mehreren Workern liefert jeder Worker seine eigenen Zahlen.
+"""
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import jinja2
+
+# Obergrenzen der Histogramm-Buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+
+@dataclass
+class RequestMetrics:
+    """
+    Messwerte einer laufenden Anfrage.
+    """
+    started: float
+    sql_count: int = 0
+    sql_seconds: float = 0.0
+    template_seconds: float = 0.0
+    template_depth: int = 0
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+
+_current_request: ContextVar[Optional[RequestMetrics]] = ContextVar("request_metrics", default=None)
+
+
+def start_request() -> Tuple[RequestMetrics, Any]:
+    """
+    Beginnt die Messung einer Anfrage im aktuellen Kontext.
+
+    Synchrone Routen laufen im Threadpool mit einer Kopie des Kontexts und erreichen so
+    dasselbe RequestMetrics-Objekt.
+
+    Returns:
+        Die Messwerte und das Token zum Zurücksetzen mit end_request
+    """
+    metrics = RequestMetrics(started=time.perf_counter())
+    return metrics, _current_request.set(metrics)
+
+
+def end_request(token: Any) -> None:
+    _current_request.reset(token)
+
+
+def current_request() -> Optional[RequestMetrics]:
+    """
+    Returns:
+        Die Messwerte der laufenden Anfrage oder None außerhalb einer Anfrage
+    """
+    return _current_request.get()
+
+
+class _Histogram:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+
+
+class MetricsRegistry:
+    """
+    Threadsichere Sammlung der Metriken je (Methode, Route, Status).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latency: Dict[Tuple[str, str, str], _Histogram] = {}
+        self._sql_count: Dict[Tuple[str, str], _Histogram] = {}
+        self._sql_seconds: Dict[Tuple[str, str], float] = {}
+        self._template_seconds: Dict[Tuple[str, str], float] = {}
+        self._collectors: List[Callable[[], Iterable[Dict[str, Any]]]] = []
+
+    def observe_request(
+        self, method: str, route: str, status: int, metrics: RequestMetrics
+    ) -> None:
+        """
+        Übernimmt die Messwerte einer abgeschlossenen Anfrage.
+
+        Args:
+            method: Die HTTP-Methode
+            route: Das Pfadmuster der Route, z.B. "/api/appointments/{appointment_id}"
+            status: Der HTTP-Status der Antwort
+            metrics: Die Messwerte der Anfrage
+        """
+        duration = metrics.elapsed()
+        with self._lock:
+            self._latency.setdefault(
+                (method, route, str(status)), _Histogram(LATENCY_BUCKETS)
+            ).observe(duration)
+            key = (method, route)
+            self._sql_count.setdefault(key, _Histogram(SQL_COUNT_BUCKETS)).observe(
+                metrics.sql_count
+            )
+            self._sql_seconds[key] = self._sql_seconds.get(key, 0.0) + metrics.sql_seconds
+            self._template_seconds[key] = (
+                self._template_seconds.get(key, 0.0) + metrics.template_seconds
+            )
+
+    def register_cache_collector(self, collector: Callable[[], Iterable[Dict[str, Any]]]) -> None:
+        """
+        Registriert eine Funktion, die Cache-Statistiken (TTLCache.stats) für /metrics liefert.
+
+        Args:
+            collector: Funktion ohne Argumente, die eine Liste von Statistik-Dictionaries liefert
+        """
+        self._collectors.append(collector)
+
+    def render_prometheus(self) -> str:
+        """
+        Gibt alle Metriken im Prometheus-Textformat (Version 0.0.4) aus.
+
+        Returns:
+            Der Text für /metrics
+        """
+        lines: List[str] = []
+        with self._lock:
+            lines += [
+                "# HELP http_request_duration_seconds Antwortzeit je Route",
+                "# TYPE http_request_duration_seconds histogram",
+            ]
+            for (method, route, status), histogram in sorted(self._latency.items()):
+                labels = f'method="{method}",route="{_escape(route)}",status="{status}"'
+                lines += _histogram_lines("http_request_duration_seconds", labels, histogram)
+
+            lines += [
+                "# HELP http_request_sql_statements SQL-Anweisungen je Anfrage",
+                "# TYPE http_request_sql_statements histogram",
+            ]
+            for (method, route), histogram in sorted(self._sql_count.items()):
+                labels = f'method="{method}",route="{_escape(route)}"'
+                lines += _histogram_lines("http_request_sql_statements", labels, histogram)
+
+            for name, help_text, values in (
+                (
+                    "http_request_sql_seconds_total",
+                    "Dauer der SQL-Anweisungen je Route",
+                    self._sql_seconds,
+                ),
+                (
+                    "http_request_template_seconds_total",
+                    "Renderzeit der Templates je Route",
+                    self._template_seconds,
+                ),
+            ):
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+                for (method, route), value in sorted(values.items()):
+                    lines.append(
+                        f'{name}{{method="{method}",route="{_escape(route)}"}} {value:.6f}'
+                    )
+
+            collectors = list(self._collectors)
+
+        cache_stats = [stats for collector in collectors for stats in collector()]
+        for field, metric_type, help_text in (
+            ("hits", "counter", "Treffer des Caches"),
+            ("misses", "counter", "Fehlschläge des Caches"),
+            ("evictions", "counter", "Verdrängte Einträge des Caches"),
+            ("size", "gauge", "Aktuelle Anzahl der Einträge des Caches"),
+        ):
+            name = f"cache_{field}_total" if metric_type == "counter" else f"cache_{field}"
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+            for stats in cache_stats:
+                lines.append(f'{name}{{cache="{_escape(stats["name"])}"}} {stats[field]}')
+
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._latency.clear()
+            self._sql_count.clear()
+            self._sql_seconds.clear()
+            self._template_seconds.clear()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _histogram_lines(name: str, labels: str, histogram: _Histogram) -> List[str]:
+    lines = []
+    cumulative = 0
+    for bound, count in zip(histogram.buckets, histogram.counts):
+        cumulative += count
+        lines.append(f'{name}_bucket{{{labels},le="{bound:g}"}} {cumulative}')
+    cumulative += histogram.counts[-1]
+    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {cumulative}')
+    lines.append(f"{name}_sum{{{labels}}} {histogram.total:.6f}")
+    lines.append(f"{name}_count{{{labels}}} {cumulative}")
+    return lines
+
+
+registry = MetricsRegistry()
+
+
+def instrument_database(database) -> None:
+    """
+    Zählt die SQL-Anweisungen einer gebundenen Pony-Datenbank und misst ihre Dauer.
+
+    Umschließt provider.execute, über das Pony alle Anweisungen ausführt (auch db.execute).
+    Gemessen wird die Ausführung ohne das spätere Abholen der Zeilen. Mehrfache Aufrufe
+    sind wirkungslos.
+
+    Args:
+        database: Die an einen Provider gebundene pony.orm.Database
+    """
+    provider = database.provider
+    if provider is None or getattr(provider, "_metrics_instrumented", False):
+        return
+    execute = provider.execute
+
+    def timed_execute(cursor, sql, arguments=None, returning_id=False):
+        metrics = _current_request.get()
+        if metrics is None:
+            return execute(cursor, sql, arguments, returning_id)
+        started = time.perf_counter()
+        try:
+            return execute(cursor, sql, arguments, returning_id)
+        finally:
+            metrics.sql_count += 1
+            metrics.sql_seconds += time.perf_counter() - started
+
+    provider.execute = timed_execute
+    provider._metrics_instrumented = True
+
+
+class TimedTemplate(jinja2.Template):
+    """
+    Template, dessen render-Aufrufe in die Renderzeit der laufenden Anfrage eingehen.
+
+    Verschachtelte Aufrufe (z.B. Tageszellen aus dem Fragment-Cache innerhalb des
+    Monatskalenders) zählen nur einmal über den äußeren Aufruf.
+    """
+
+    def render(self, *args: Any, **kwargs: Any) -> str:
+        metrics = _current_request.get()
+        if metrics is None or metrics.template_depth:
+            return super().render(*args, **kwargs)
+        metrics.template_depth += 1
+        started = time.perf_counter()
+        try:
+            return super().render(*args, **kwargs)
+        finally:
+            metrics.template_depth -= 1
+            metrics.template_seconds += time.perf_counter() - started
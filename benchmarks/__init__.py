@@ -0,0 +1 @@
+# Benchmark-Skripte für die Anwendung
@@ -0,0 +1,96 @@
+"""
+Misst Spitzenspeicher und Laufzeit der Terminliste: vollständige Liste gegenüber NDJSON-Stream.
+
+"Liste" bildet den früheren Endpunkt nach: alle gefilterten Termine werden geladen und als ein
+JSON-Array serialisiert. "Stream" liest dieselben Termine mit AppointmentService.iter_appointments
+seitenweise per Keyset-Paginierung und serialisiert sie zeilenweise wie die NDJSON-Antwort.
+Der Spitzenspeicher wird mit tracemalloc gemessen und wächst beim Stream nur mit --chunk-size.
+
+Ausführen mit:
+    python -m benchmarks.bench_appointment_stream [--appointments 50000] [--chunk-size 1000]
+"""
+import argparse
+import os
+import tempfile
+import time as time_module
+import tracemalloc
+from datetime import date, time, timedelta
+from typing import List
+
+from pony.orm import db_session
+from pydantic import TypeAdapter
+
+from database.models import db, Address, Appointment, LocationOfWork, Person, PlanPeriod
+
+
+@db_session
+def _create_dataset(appointment_count: int, days: int) -> None:
+    """Verteilt die Termine auf die angegebene Anzahl Tage ab heute."""
+    start = date.today()
+    period = PlanPeriod(
+        name="Jahresperiode", start_date=start, end_date=start + timedelta(days=days)
+    )
+    address = Address(street="Teststraße 1", postal_code="10115", city="Berlin")
+    locations = [LocationOfWork(name=f"Ort {i}", address=address) for i in range(20)]
+    persons = [Person(f_name=f"Vorname{i}", l_name=f"Nachname{i}") for i in range(100)]
+    for i in range(appointment_count):
+        appointment = Appointment(
+            plan_period=period,
+            date=start + timedelta(days=i % days),
+            start_time=time(8 + i % 10, 0),
+            delta=timedelta(hours=1),
+            location=locations[i % len(locations)],
+            notes=f"Termin {i}"
+        )
+        appointment.persons.add(persons[i % len(persons)])
+
+
+def _measure(label: str, func) -> None:
+    tracemalloc.start()
+    started = time_module.perf_counter()
+    size = func()
+    elapsed = time_module.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<10} {elapsed:>8.2f} {peak / 1024 / 1024:>12.1f} {size / 1024 / 1024:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--appointments", type=int, default=50000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db.bind(provider="sqlite", filename=os.path.join(tmp_dir, "bench.sqlite"), create_db=True)
+        db.generate_mapping(create_tables=True)
+        _create_dataset(args.appointments, args.days)
+
+        from api.models import schemas
+        from api.services import AppointmentService
+
+        adapter = TypeAdapter(List[schemas.Appointment])
+
+        def full_list() -> int:
+            return len(adapter.dump_json(AppointmentService.get_appointments()))
+
+        def stream() -> int:
+            return sum(
+                len(appointment.model_dump_json()) + 1
+                for appointment in AppointmentService.iter_appointments(chunk_size=args.chunk_size)
+            )
+
+        print(
+            f"{args.appointments} Termine über {args.days} Tage, "
+            f"Stream mit {args.chunk_size} Terminen je Abfrage\n"
+        )
+        print(f"{'Variante':<10} {'Dauer s':>8} {'Spitze MiB':>12} {'Daten MiB':>10}")
+        _measure("Liste", full_list)
+        _measure("Stream", stream)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Micro-Benchmark für das Verteilen von Terminen auf die Tage der Monatsansicht.
+
+Vergleicht die bisherige verschachtelte Schleife (42 Tageszellen je Termin, danach Sortieren
+jedes Tages) mit dem datumsindizierten Einsortieren aus CalendarService.
+
+Ausführen mit: python -m benchmarks.bench_calendar_bucketing
+"""
+import argparse
+import random
+import timeit
+import uuid
+from datetime import date, time, timedelta
+from typing import Any, Dict, List
+
+from api.models import schemas
+from api.services import CalendarService
+
+
+def _make_appointments(
+    year: int, month: int, count: int, rng: random.Random
+) -> List[schemas.AppointmentDetail]:
+    """Erzeugt synthetische Termine, verteilt über alle Tage der Monatsansicht."""
+    first_day = date(year, month, 1) - timedelta(days=7)
+    plan_period = schemas.PlanPeriod.model_construct(
+        id=uuid.uuid4(),
+        name="Benchmark",
+        start_date=first_day,
+        end_date=first_day + timedelta(days=42),
+    )
+    address = schemas.Address.model_construct(
+        id=uuid.uuid4(), street="Teststraße 1", postal_code="10115", city="Berlin"
+    )
+    location = schemas.LocationOfWorkDetail.model_construct(
+        id=uuid.uuid4(), name="Benchmark-Ort", address=address
+    )
+    return [
+        schemas.AppointmentDetail.model_construct(
+            id=uuid.uuid4(),
+            plan_period=plan_period,
+            date=first_day + timedelta(days=rng.randrange(49)),
+            start_time=time(rng.randrange(7, 19), rng.choice((0, 15, 30, 45))),
+            delta=timedelta(minutes=rng.choice((30, 60, 90, 120))),
+            location=location,
+            persons=[],
+            guests=[],
+            notes=""
+        )
+        for _ in range(count)
+    ]
+
+
+def _fill_nested_loop(calendar_weeks: List[List[Dict[str, Any]]], appointments) -> None:
+    """Bisheriges Verfahren: jede Tageszelle je Termin prüfen, danach jeden Tag sortieren."""
+    for appointment in appointments:
+        for week in calendar_weeks:
+            for day in week:
+                if day["date"] == appointment.date:
+                    day["appointments"].append(appointment)
+    for week in calendar_weeks:
+        for day in week:
+            day["appointments"].sort(key=lambda a: (a.start_time, a.delta))
+
+
+def _fill_bucketed(calendar_weeks: List[List[Dict[str, Any]]], appointments) -> None:
+    """Neues Verfahren: einmal sortieren (in der Anwendung die Datenbank), dann einsortieren."""
+    appointments = sorted(appointments, key=lambda a: (a.start_time, a.delta))
+    CalendarService.bucket_appointments_by_date(calendar_weeks, appointments)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    today = date.today()
+    rng = random.Random(args.seed)
+
+    print(f"{'Termine':>10} {'Schleife [ms]':>15} {'Index [ms]':>12} {'Faktor':>8}")
+    for size in args.sizes:
+        appointments = _make_appointments(today.year, today.month, size, rng)
+        results = {}
+        for name, fill in (("loop", _fill_nested_loop), ("bucket", _fill_bucketed)):
+            def run():
+                fill(CalendarService.get_calendar_data(today.year, today.month), appointments)
+            results[name] = min(timeit.repeat(run, number=1, repeat=args.repeat)) * 1000
+
+        print(f"{size:>10} {results['loop']:>15.2f} {results['bucket']:>12.2f} "
+              f"{results['loop'] / results['bucket']:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
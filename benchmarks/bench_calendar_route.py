@@ -0,0 +1,174 @@
+"""
+Misst die Latenz der Kalender-Route unter paralleler Last, vorher und nachher.
+
+"vorher" bildet den früheren Ablauf der Route nach: Termine, aktive Filter und Filter-Optionen
+werden in getrennten db_sessions geladen, Person und Arbeitsort dabei doppelt abgefragt.
+"nachher" nutzt CalendarService.get_calendar_page mit einer einzigen db_session und gemeinsam
+genutzten Entitäten. Beide Varianten laufen über den vollständigen Request-Pfad (Routing,
+Cookie-Authentifizierung, Template-Rendering) gegen eine temporäre SQLite-Datenbank.
+
+Monats- und Filter-Options-Cache sind standardmäßig deaktiviert, damit jede Anfrage die
+Datenbank erreicht; mit --with-cache werden sie wie im Betrieb genutzt.
+
+Ausführen mit: python -m benchmarks.bench_calendar_route [--requests 400] [--concurrency 8]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time as time_module
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, time, timedelta
+
+from pony.orm import db_session
+
+from database.models import db, Address, LocationOfWork, Person, PlanPeriod, Appointment, User
+
+
+@db_session
+def _create_dataset(
+    appointment_count: int, location_count: int, person_count: int, today: date
+) -> dict:
+    """Legt Termine rund um den aktuellen Monat sowie einen Benutzer mit Rolle employee an."""
+    start = today.replace(day=1) - timedelta(days=7)
+    period = PlanPeriod(name="Lastperiode", start_date=start, end_date=start + timedelta(days=41))
+    address = Address(street="Teststraße 1", postal_code="10115", city="Berlin")
+    locations = [LocationOfWork(name=f"Ort {i}", address=address) for i in range(location_count)]
+    persons = [Person(f_name=f"Vorname{i}", l_name=f"Nachname{i}") for i in range(person_count)]
+    for i in range(appointment_count):
+        appointment = Appointment(
+            plan_period=period,
+            date=start + timedelta(days=i % 42),
+            start_time=time(8 + i % 10, 0),
+            delta=timedelta(hours=1),
+            location=locations[i % location_count],
+            notes=f"Lasttermin {i}"
+        )
+        appointment.persons.add(persons[i % person_count])
+        appointment.persons.add(persons[(i * 7 + 1) % person_count])
+    User(username="bench", hashed_password="-", person=persons[0], role="employee")
+    return {"person_id": str(persons[0].id), "location_id": str(locations[0].id)}
+
+
+def _legacy_calendar_page(year, month, filter_person_id=None, filter_location_id=None):
+    """Früherer Ablauf der Route: drei getrennte db_sessions, doppelte Filter-Lookups."""
+    from api.services import CalendarService
+
+    return {
+        "calendar_weeks": CalendarService.fill_calendar_with_appointments(
+            CalendarService.get_calendar_data(year, month),
+            filter_person_id=filter_person_id,
+            filter_location_id=filter_location_id
+        ),
+        "month_name": CalendarService.get_month_name(month),
+        "active_filters": CalendarService.get_active_filters(
+            filter_person_id=filter_person_id,
+            filter_location_id=filter_location_id
+        ),
+        "filter_options": CalendarService.get_filter_options()
+    }
+
+
+def _run_load(app, token: str, urls: list, total_requests: int, concurrency: int) -> tuple:
+    """Sendet die Anfragen parallel und liefert (Latenzen in ms, Gesamtdauer in s)."""
+    from fastapi.testclient import TestClient
+
+    local = threading.local()
+
+    def request(i: int) -> float:
+        client = getattr(local, "client", None)
+        if client is None:
+            client = local.client = TestClient(app)
+            client.cookies.set("appointments_token", token)
+        started = time_module.perf_counter()
+        response = client.get(urls[i % len(urls)])
+        elapsed = (time_module.perf_counter() - started) * 1000
+        if response.status_code != 200:
+            raise RuntimeError(f"{urls[i % len(urls)]} lieferte Status {response.status_code}")
+        return elapsed
+
+    started = time_module.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = list(executor.map(request, range(total_requests)))
+    return latencies, time_module.perf_counter() - started
+
+
+def _percentile(values: list, percent: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--appointments", type=int, default=500)
+    parser.add_argument("--locations", type=int, default=30)
+    parser.add_argument("--persons", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--with-cache", action="store_true", help="Monats- und Filter-Options-Cache aktiv lassen"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db.bind(provider="sqlite", filename=os.path.join(tmp_dir, "bench.sqlite"), create_db=True)
+        db.generate_mapping(create_tables=True)
+
+        today = date.today()
+        ids = _create_dataset(args.appointments, args.locations, args.persons, today)
+
+        import main as app_module
+        from api.auth import create_access_token
+        from api.services import CalendarService
+        from api.services import calendar_service
+
+        if not args.with_cache:
+            for cache in (calendar_service._month_cache, calendar_service._filter_options_cache):
+                cache.maxsize = 0
+                cache.invalidate()
+
+        token = create_access_token(
+            {"sub": "bench", "role": "employee", "person_id": ids["person_id"]}
+        )
+        base = f"/calendar/?year={today.year}&month={today.month}"
+        partial = f"/calendar/hx/calendar-partial?year={today.year}&month={today.month}"
+        urls = [
+            base,
+            f"{base}&filter_person_id={ids['person_id']}",
+            f"{base}&filter_location_id={ids['location_id']}",
+            f"{partial}&filter_person_id={ids['person_id']}"
+            f"&filter_location_id={ids['location_id']}",
+        ]
+
+        composite = CalendarService.__dict__["get_calendar_page"]
+        variants = (
+            ("vorher (4 Aufrufe)", staticmethod(_legacy_calendar_page)),
+            ("nachher (1 Session)", composite),
+        )
+
+        # Aufwärmen: Templates kompilieren, Verbindungen öffnen
+        _run_load(app_module.app, token, urls, len(urls) * 2, 1)
+
+        print(
+            f"{args.appointments} Termine, {args.requests} Anfragen, {args.concurrency} parallel, "
+            f"Cache {'aktiv' if args.with_cache else 'deaktiviert'}\n"
+        )
+        print(f"{'Variante':<22} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'Anfr./s':>9}")
+        for name, implementation in variants:
+            CalendarService.get_calendar_page = implementation
+            latencies, duration = _run_load(
+                app_module.app, token, urls, args.requests, args.concurrency
+            )
+            print(
+                f"{name:<22} {statistics.median(latencies):>8.2f} "
+                f"{_percentile(latencies, 95):>8.2f} {_percentile(latencies, 99):>8.2f} "
+                f"{len(latencies) / duration:>9.1f}"
+            )
+        CalendarService.get_calendar_page = composite
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Misst die Latenz der Kalender-Fragmente und der Monats-API mit und ohne gültigen ETag.
+
+"vollständig" sendet keinen Validator; die Antwort wird geladen (bzw. aus den In-Process-Caches
+übernommen) und gerendert oder serialisiert. "304" sendet den ETag der vorherigen Antwort per
+If-None-Match, wie es der Browser auch für HTMX-Anfragen tut; geprüft werden nur die
+Änderungszähler. Die Byte-Spalte zeigt die übertragene Antwortgröße.
+
+Ausführen mit: python -m benchmarks.bench_conditional_get [--appointments 2000]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time as time_module
+from datetime import date
+
+from database.models import db
+from benchmarks.bench_calendar_route import _create_dataset
+
+
+def _measure(client, url: str, repeat: int, headers: dict) -> tuple:
+    """Liefert Median der Latenz in ms, Status und Größe der letzten Antwort."""
+    timings = []
+    response = None
+    for _ in range(repeat):
+        started = time_module.perf_counter()
+        response = client.get(url, headers=headers)
+        timings.append((time_module.perf_counter() - started) * 1000)
+    return statistics.median(timings), response.status_code, len(response.content)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--appointments", type=int, default=2000)
+    parser.add_argument("--locations", type=int, default=30)
+    parser.add_argument("--persons", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db.bind(provider="sqlite", filename=os.path.join(tmp_dir, "bench.sqlite"), create_db=True)
+        db.generate_mapping(create_tables=True)
+        today = date.today()
+        ids = _create_dataset(args.appointments, args.locations, args.persons, today)
+
+        from pony.orm import db_session
+        from fastapi.testclient import TestClient
+        import main as app_module
+        from api.auth import create_access_token
+        from database.models import Appointment
+
+        with db_session:
+            appointment_id = Appointment.select().first().id
+
+        token = create_access_token(
+            {"sub": "bench", "role": "employee", "person_id": ids["person_id"]}
+        )
+        client = TestClient(app_module.app, raise_server_exceptions=False)
+        client.cookies.set("appointments_token", token)
+        client.headers["Authorization"] = f"Bearer {token}"
+        urls = {
+            "Kalender-Teilansicht": (
+                f"/calendar/hx/calendar-partial?year={today.year}&month={today.month}"
+            ),
+            "Tagesansicht": f"/calendar/hx/day-view/{today.isoformat()}",
+            "Termindetails": f"/calendar/hx/appointments/{appointment_id}/detail",
+            "API Monat": f"/api/appointments/by-month/{today.year}/{today.month}",
+        }
+
+        print(f"{args.appointments} Termine, Median aus {args.repeat} Anfragen\n")
+        print(f"{'Ansicht':<22} {'vollständig ms':>15} {'Bytes':>8} {'304 ms':>8} {'Bytes':>6}")
+        for name, url in urls.items():
+            response = client.get(url)
+            etag = response.headers.get("etag")
+            full_ms, full_status, full_bytes = _measure(client, url, args.repeat, {})
+            if full_status != 200 or etag is None:
+                print(f"{name:<22} Status {full_status}, kein Vergleich möglich")
+                continue
+            fresh_ms, fresh_status, fresh_bytes = _measure(
+                client, url, args.repeat, {"If-None-Match": etag}
+            )
+            if fresh_status != 304:
+                raise RuntimeError(f"{url} lieferte mit ETag Status {fresh_status}")
+            print(f"{name:<22} {full_ms:>15.2f} {full_bytes:>8} {fresh_ms:>8.2f} {fresh_bytes:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Misst die Renderzeit der Kalenderansicht und der Tagesansicht mit und ohne Fragment-Cache.
+
+Monatsansicht und Filter-Optionen kommen in beiden Varianten aus dem Cache, sodass der
+Unterschied allein vom Rendern der Tageszellen bzw. des Tagesmodals stammt; die Tagesansicht
+übernimmt ihre Termine aus der gecachten Monatsansicht. Die letzte Spalte misst die erste
+Anfrage nach einer Änderung an einem Tag (Monatsansicht wird neu geladen, nur die Fragmente
+dieses Tages neu gerendert).
+
+Ausführen mit: python -m benchmarks.bench_day_fragments [--appointments 2000]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time as time_module
+from datetime import date
+
+from database.models import db
+from benchmarks.bench_calendar_route import _create_dataset
+
+
+def _measure(client, url: str, repeat: int) -> float:
+    """Median der Latenz in ms."""
+    timings = []
+    for _ in range(repeat):
+        started = time_module.perf_counter()
+        response = client.get(url)
+        timings.append((time_module.perf_counter() - started) * 1000)
+        if response.status_code != 200:
+            raise RuntimeError(f"{url} lieferte Status {response.status_code}")
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--appointments", type=int, default=2000)
+    parser.add_argument("--locations", type=int, default=30)
+    parser.add_argument("--persons", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db.bind(provider="sqlite", filename=os.path.join(tmp_dir, "bench.sqlite"), create_db=True)
+        db.generate_mapping(create_tables=True)
+        today = date.today()
+        ids = _create_dataset(args.appointments, args.locations, args.persons, today)
+
+        from fastapi.testclient import TestClient
+        import main as app_module
+        from api.auth import create_access_token
+        from api.services import CalendarService
+        from api.services import calendar_service
+
+        client = TestClient(app_module.app)
+        client.cookies.set(
+            "appointments_token",
+            create_access_token({"sub": "bench", "role": "employee", "person_id": ids["person_id"]})
+        )
+        urls = {
+            "Kalender-Teilansicht": (
+                f"/calendar/hx/calendar-partial?year={today.year}&month={today.month}"
+            ),
+            "Tagesansicht": f"/calendar/hx/day-view/{today.isoformat()}",
+        }
+        fragment_cache = calendar_service._day_fragment_cache
+        cache_size = fragment_cache.maxsize
+
+        print(f"{args.appointments} Termine, Median aus {args.repeat} Anfragen\n")
+        print(f"{'Ansicht':<22} {'ohne ms':>9} {'mit ms':>9} {'nach Änderung ms':>17}")
+        for name, url in urls.items():
+            fragment_cache.maxsize = 0
+            fragment_cache.invalidate()
+            _measure(client, url, 2)
+            without_cache = _measure(client, url, args.repeat)
+
+            fragment_cache.maxsize = cache_size
+            _measure(client, url, 2)
+            with_cache = _measure(client, url, args.repeat)
+
+            # Änderung an einem Tag: nur dessen Fragmente und die betroffene Monatsansicht verwerfen
+            timings = []
+            for _ in range(args.repeat):
+                CalendarService.invalidate_month_cache([today])
+                timings.append(_measure(client, url, 1))
+            after_change = statistics.median(timings)
+            print(f"{name:<22} {without_cache:>9.2f} {with_cache:>9.2f} {after_change:>17.2f}")
+
+        print(f"\n{CalendarService.get_day_fragment_cache_stats()}")
+
+
+if __name__ == "__main__":
+    main()
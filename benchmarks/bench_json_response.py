@@ -0,0 +1,128 @@
+"""
+Vergleicht den Durchsatz von API-Antworten mit 10.000 Terminen: response_model gegenüber dump_json.
+
+Beide Routen liefern dieselbe vorab geladene Liste von schemas.Appointment, sodass nur der
+Antwortpfad gemessen wird:
+- "response_model": bisheriger Weg, FastAPI validiert gegen das Antwortmodell, wandelt mit
+  jsonable_encoder um und serialisiert mit dem json-Modul
+- "dump_json": model_json_response serialisiert direkt mit TypeAdapter.dump_json
+
+Zusätzlich wird die reine Serialisierung ohne HTTP gemessen sowie ein vollständiger Aufruf von
+/api/appointments/ (Laden aus SQLite und Serialisieren einer Seite).
+
+Ausführen mit: python -m benchmarks.bench_json_response [--appointments 10000] [--repeat 20]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time as time_module
+from typing import List
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.testclient import TestClient
+from fastapi.utils import create_model_field
+
+from pony.orm import db_session
+
+from database.models import db, Person, User
+from benchmarks.bench_appointment_stream import _create_dataset
+
+
+def _median_ms(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time_module.perf_counter()
+        func()
+        timings.append((time_module.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--appointments", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db.bind(provider="sqlite", filename=os.path.join(tmp_dir, "bench.sqlite"), create_db=True)
+        db.generate_mapping(create_tables=True)
+        _create_dataset(args.appointments, 365)
+
+        import main as app_module
+        from api.auth import create_access_token
+        from api.models import schemas
+        from api.services import AppointmentService
+        from api.utils.json_response import get_type_adapter, model_json_response
+
+        appointments = AppointmentService.get_appointments()
+        annotation = List[schemas.Appointment]
+
+        bench_app = FastAPI()
+
+        @bench_app.get("/response-model", response_model=annotation)
+        def with_response_model():
+            return appointments
+
+        @bench_app.get("/dump-json", response_model=annotation)
+        def with_dump_json():
+            return model_json_response(appointments, annotation)
+
+        client = TestClient(bench_app)
+        if client.get("/response-model").json() != client.get("/dump-json").json():
+            raise RuntimeError("Die Antworten beider Pfade unterscheiden sich")
+
+        field = create_model_field(name="Response", type_=annotation)
+
+        def fastapi_serialize():
+            content = asyncio.run(
+                serialize_response(field=field, response_content=appointments, is_coroutine=False)
+            )
+            return JSONResponse(content).body
+
+        adapter = get_type_adapter(annotation)
+        size_mib = len(adapter.dump_json(appointments)) / 1024 / 1024
+
+        print(
+            f"{len(appointments)} Termine, {size_mib:.1f} MiB JSON, "
+            f"Median aus {args.repeat} Durchläufen\n"
+        )
+        print(f"{'Messung':<34} {'response_model ms':>18} {'dump_json ms':>13} {'Faktor':>7}")
+        rows = [
+            (
+                "Serialisierung ohne HTTP",
+                fastapi_serialize,
+                lambda: adapter.dump_json(appointments),
+            ),
+            (
+                "Anfrage (vorab geladene Liste)",
+                lambda: client.get("/response-model"),
+                lambda: client.get("/dump-json"),
+            ),
+        ]
+        for label, before, after in rows:
+            before_ms = _median_ms(before, args.repeat)
+            after_ms = _median_ms(after, args.repeat)
+            print(f"{label:<34} {before_ms:>18.1f} {after_ms:>13.1f} {before_ms / after_ms:>7.1f}")
+
+        with db_session:
+            User(
+                username="bench", hashed_password="-", person=Person.select().first(), role="admin"
+            )
+        token = create_access_token({"sub": "bench", "role": "admin"})
+        api_client = TestClient(app_module.app)
+        api_client.headers["Authorization"] = f"Bearer {token}"
+        url = f"/api/appointments/?limit={min(args.appointments, 5000)}"
+        if api_client.get(url).status_code != 200:
+            raise RuntimeError(f"{url} lieferte keinen Status 200")
+        api_ms = _median_ms(lambda: api_client.get(url), max(3, args.repeat // 4))
+        print(f"\nGET {url}: {api_ms:.1f} ms (Laden und Serialisieren)")
+
+
+if __name__ == "__main__":
+    main()
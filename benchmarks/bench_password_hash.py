@@ -0,0 +1,66 @@
+"""
+Misst die Kosten der Passwort-Hashverfahren auf der aktuellen Maschine.
+
+Für jede Einstellung werden Hash-Erzeugung und Prüfung gemessen (Median) und daraus die
+Anmeldungen je Sekunde und Worker abgeleitet. Dient zur Wahl von PASSWORD_SCHEMES,
+BCRYPT_ROUNDS und ARGON2_* auf der Zielmaschine; argon2 wird nur gemessen, wenn argon2-cffi
+installiert ist.
+
+Ausführen mit:
+    python -m benchmarks.bench_password_hash [--bcrypt-rounds 10 11 12] [--argon2 3:65536:4]
+"""
+import argparse
+import statistics
+import time as time_module
+
+from api.auth.oauth2 import build_crypt_context
+
+
+def _measure(context, repeat: int) -> tuple:
+    """Liefert den Median von Hash-Erzeugung und Prüfung in ms."""
+    hash_timings, verify_timings = [], []
+    for _ in range(repeat):
+        started = time_module.perf_counter()
+        hashed = context.hash("Benchmark-Passwort")
+        hash_timings.append((time_module.perf_counter() - started) * 1000)
+        started = time_module.perf_counter()
+        context.verify("Benchmark-Passwort", hashed)
+        verify_timings.append((time_module.perf_counter() - started) * 1000)
+    return statistics.median(hash_timings), statistics.median(verify_timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--bcrypt-rounds", type=int, nargs="*", default=[10, 11, 12, 13])
+    parser.add_argument("--argon2", nargs="*", default=["2:19456:1", "3:65536:4"],
+                        help="Einstellungen als Durchläufe:Speicher_KiB:Parallelität")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    settings = [
+        (f"BCRYPT_ROUNDS={rounds}", dict(schemes=["bcrypt"], bcrypt_rounds=rounds))
+        for rounds in args.bcrypt_rounds
+    ]
+    for setting in args.argon2:
+        time_cost, memory_cost, parallelism = (int(value) for value in setting.split(":"))
+        settings.append((
+            f"argon2 t={time_cost} m={memory_cost} p={parallelism}",
+            dict(schemes=["argon2"], argon2_time_cost=time_cost, argon2_memory_cost=memory_cost,
+                 argon2_parallelism=parallelism)
+        ))
+
+    print(f"{'Einstellung':<32} {'Hash ms':>9} {'Prüfung ms':>11} {'Anmeldungen/s je Worker':>25}")
+    for label, options in settings:
+        try:
+            context = build_crypt_context(**options)
+        except RuntimeError as e:
+            print(f"{label:<32} übersprungen: {e}")
+            continue
+        hash_ms, verify_ms = _measure(context, args.repeat)
+        print(f"{label:<32} {hash_ms:>9.1f} {verify_ms:>11.1f} {1000 / verify_ms:>25.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Misst den Konfliktbericht für eine Planungsperiode mit synthetischen 100.000 Terminen.
+
+Legt eine temporäre SQLite-Datenbank mit einer Planungsperiode an, erzeugt Termine mit zufälligen
+Überschneidungen an Arbeitsorten und bei Personen und misst PlanService.get_plan_period_conflicts.
+Zum Vergleich wird für eine Stichprobe die bisherige Einzelprüfung je Termin
+(AppointmentService.check_appointment_overlap) gemessen und auf alle Termine hochgerechnet.
+Die Zähler des Berichts werden gegen eine Referenzberechnung im Speicher geprüft.
+
+Ausführen mit: python -m benchmarks.bench_plan_conflicts [--appointments 100000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time as time_module
+import uuid
+from datetime import date, datetime, time, timedelta
+
+from pony.orm import db_session
+
+from database.models import db
+
+
+def _fill_database(
+    appointment_count: int, location_count: int, person_count: int, days: int, rng: random.Random
+):
+    """
+    Füllt die Tabellen per executemany; UUIDs als Bytes und Dauern in Tagen, wie PonyORM sie in
+    SQLite speichert.
+
+    Returns:
+        Tupel aus ID der Planungsperiode und Liste (ID, Datum, Start, Dauer, Ort, Personen) je
+        Termin
+    """
+    cursor = db.get_connection().cursor()
+    period_id = uuid.uuid4()
+    start = date.today()
+    cursor.execute(
+        'INSERT INTO "PlanPeriod" ("id", "name", "start_date", "end_date") VALUES (?, ?, ?, ?)',
+        (
+            period_id.bytes,
+            "Benchmark",
+            start.isoformat(),
+            (start + timedelta(days=days - 1)).isoformat(),
+        ),
+    )
+    address_id = uuid.uuid4().bytes
+    cursor.execute(
+        'INSERT INTO "Address" ("id", "street", "postal_code", "city") VALUES (?, ?, ?, ?)',
+        (address_id, "Teststraße 1", "10115", "Berlin")
+    )
+    location_ids = [uuid.uuid4() for _ in range(location_count)]
+    cursor.executemany(
+        'INSERT INTO "LocationOfWork" ("id", "name", "address") VALUES (?, ?, ?)',
+        [(location_id.bytes, f"Ort {i}", address_id) for i, location_id in enumerate(location_ids)]
+    )
+    person_ids = [uuid.uuid4() for _ in range(person_count)]
+    cursor.executemany(
+        'INSERT INTO "Person" ("id", "f_name", "l_name", "email") VALUES (?, ?, ?, ?)',
+        [
+            (person_id.bytes, f"Vorname{i}", f"Nachname{i}", "")
+            for i, person_id in enumerate(person_ids)
+        ],
+    )
+
+    appointments, rows, links = [], [], []
+    for _ in range(appointment_count):
+        appointment_id = uuid.uuid4()
+        appointment_date = start + timedelta(days=rng.randrange(days))
+        start_time = time(rng.randrange(6, 20), rng.choice((0, 15, 30, 45)))
+        delta = timedelta(minutes=rng.choice((30, 60, 90, 120)))
+        location_id = rng.choice(location_ids)
+        persons = rng.sample(person_ids, 2)
+        appointments.append(
+            (
+                appointment_id.bytes,
+                period_id.bytes,
+                appointment_date.isoformat(),
+                start_time.isoformat(),
+                delta / timedelta(days=1),
+                location_id.bytes,
+                "[]",
+                "",
+            )
+        )
+        links.extend((appointment_id.bytes, person_id.bytes) for person_id in persons)
+        rows.append(
+            (appointment_id, appointment_date, start_time, delta, location_id, tuple(persons))
+        )
+    cursor.executemany(
+        'INSERT INTO "Appointment" ("id", "plan_period", "date", "start_time", "delta", '
+        '"location", "guests", "notes") VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+        appointments,
+    )
+    cursor.executemany(
+        'INSERT INTO "Appointment_Person" ("appointment", "person") VALUES (?, ?)', links
+    )
+    return period_id, rows
+
+
+def _reference_counts(rows: list) -> tuple:
+    """Zählt die Konflikte je Art unabhängig vom Datenbankpfad."""
+    from api.services.overlap import (
+        AppointmentSlot,
+        LOCATION_CONFLICT,
+        appointment_interval,
+        find_conflicts,
+    )
+
+    slots = [
+        AppointmentSlot(appointment_interval(d, t, delta, appointment_id), location_id, persons)
+        for appointment_id, d, t, delta, location_id, persons in rows
+    ]
+    location_count = person_count = 0
+    for conflict in find_conflicts(entry for slot in slots for entry in slot.entries()):
+        if conflict.kind == LOCATION_CONFLICT:
+            location_count += 1
+        else:
+            person_count += 1
+    return location_count, person_count
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--appointments", type=int, default=100_000)
+    parser.add_argument("--locations", type=int, default=500)
+    parser.add_argument("--persons", type=int, default=3_000)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--sample", type=int, default=200, help="Stichprobe für die Einzelprüfung")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db.bind(provider="sqlite", filename=os.path.join(tmp_dir, "bench.sqlite"), create_db=True)
+        db.generate_mapping(create_tables=True)
+        from database.migrations import ensure_indexes
+        ensure_indexes(db)
+
+        rng = random.Random(args.seed)
+        with db_session:
+            period_id, rows = _fill_database(
+                args.appointments, args.locations, args.persons, args.days, rng
+            )
+
+        from api.services import AppointmentService, PlanService
+
+        started = time_module.perf_counter()
+        report = PlanService.get_plan_period_conflicts(period_id, limit=100)
+        report_seconds = time_module.perf_counter() - started
+
+        sample = rng.sample(rows, min(args.sample, len(rows)))
+        started = time_module.perf_counter()
+        for appointment_id, d, t, delta, location_id, persons in sample:
+            end_time = (datetime.combine(d, t) + delta).time()
+            AppointmentService.check_appointment_overlap(
+                d, t, end_time, location_id, appointment_id, persons
+            )
+        per_check = (time_module.perf_counter() - started) / len(sample)
+
+        expected = _reference_counts(rows)
+
+    print(
+        f"{report.appointment_count} Termine, {args.locations} Orte, {args.persons} Personen, "
+        f"{args.days} Tage\n"
+    )
+    print(f"Konfliktbericht (Sweep-Line, 1 Durchlauf):  {report_seconds:8.2f} s")
+    print(f"Einzelprüfung je Termin (hochgerechnet):    {per_check * len(rows):8.2f} s "
+          f"({per_check * 1000:.2f} ms je Termin)")
+    print(
+        f"\nOrtskonflikte: {report.location_conflict_count}, "
+        f"Personenkonflikte: {report.person_conflict_count}"
+    )
+
+    if (report.location_conflict_count, report.person_conflict_count) != expected:
+        print(f"FEHLER: Referenz ergibt {expected[0]} Orts- und {expected[1]} Personenkonflikte.")
+        sys.exit(1)
+    print("OK: Zähler stimmen mit der Referenzberechnung überein.")
+
+
+if __name__ == "__main__":
+    main()
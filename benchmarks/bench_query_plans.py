@@ -0,0 +1,169 @@
+"""
+Vergleicht Abfragepläne und Laufzeiten typischer Terminabfragen ohne und mit den Termin-Indizes.
+
+Legt eine temporäre SQLite-Datenbank mit synthetischen Terminen an, entfernt die Indizes aus
+database.migrations, misst Kalender-, Überschneidungs- und Verlaufsabfragen und wiederholt die
+Messung nach ensure_indexes().
+
+Ausführen mit: python -m benchmarks.bench_query_plans [--appointments 100000]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time as time_module
+import uuid
+from datetime import date, time, timedelta
+
+from pony.orm import db_session
+
+from database.migrations import ensure_indexes, get_index_definitions
+from database.models import db
+
+
+def _fill_database(
+    appointment_count: int, location_count: int, person_count: int, rng: random.Random
+):
+    """Füllt die Tabellen per executemany, um auch große Datenmengen schnell anzulegen."""
+    connection = db.get_connection()
+    cursor = connection.cursor()
+    period_id = uuid.uuid4()
+    start = date.today() - timedelta(days=365)
+    cursor.execute(
+        'INSERT INTO "PlanPeriod" ("id", "name", "start_date", "end_date") VALUES (?, ?, ?, ?)',
+        (str(period_id), "Benchmark", start.isoformat(), (start + timedelta(days=730)).isoformat())
+    )
+    address_id = uuid.uuid4()
+    cursor.execute(
+        'INSERT INTO "Address" ("id", "street", "postal_code", "city") VALUES (?, ?, ?, ?)',
+        (str(address_id), "Teststraße 1", "10115", "Berlin")
+    )
+    location_ids = [str(uuid.uuid4()) for _ in range(location_count)]
+    cursor.executemany(
+        'INSERT INTO "LocationOfWork" ("id", "name", "address") VALUES (?, ?, ?)',
+        [(location_id, f"Ort {i}", str(address_id)) for i, location_id in enumerate(location_ids)]
+    )
+    person_ids = [str(uuid.uuid4()) for _ in range(person_count)]
+    cursor.executemany(
+        'INSERT INTO "Person" ("id", "f_name", "l_name", "email") VALUES (?, ?, ?, ?)',
+        [(person_id, f"Vorname{i}", f"Nachname{i}", "") for i, person_id in enumerate(person_ids)]
+    )
+    appointments, links = [], []
+    for _ in range(appointment_count):
+        appointment_id = str(uuid.uuid4())
+        appointments.append(
+            (
+                appointment_id,
+                str(period_id),
+                (start + timedelta(days=rng.randrange(730))).isoformat(),
+                time(rng.randrange(7, 19), rng.choice((0, 30))).isoformat(),
+                3600.0,
+                rng.choice(location_ids),
+                "[]",
+                "",
+            )
+        )
+        links.extend((appointment_id, person_id) for person_id in rng.sample(person_ids, 2))
+    cursor.executemany(
+        'INSERT INTO "Appointment" ("id", "plan_period", "date", "start_time", "delta", '
+        '"location", "guests", "notes") VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+        appointments,
+    )
+    cursor.executemany(
+        'INSERT INTO "Appointment_Person" ("appointment", "person") VALUES (?, ?)', links
+    )
+    db.commit()
+    return location_ids[0], person_ids[0]
+
+
+def _queries(location_id: str, person_id: str):
+    """Repräsentative Abfragen in der Form, wie PonyORM sie für die Services erzeugt."""
+    today = date.today()
+    month_start = today.replace(day=1) - timedelta(days=7)
+    month_end = month_start + timedelta(days=42)
+    return {
+        "Kalender (Monatsbereich)": (
+            'SELECT "a"."id" FROM "Appointment" "a" WHERE "a"."date" >= ? AND "a"."date" <= ? '
+            'ORDER BY "a"."start_time", "a"."delta"',
+            (month_start.isoformat(), month_end.isoformat())
+        ),
+        "Tagesansicht": (
+            'SELECT "a"."id" FROM "Appointment" "a" WHERE "a"."date" = ? ORDER BY "a"."start_time"',
+            (today.isoformat(),)
+        ),
+        "Überschneidung (Ort, Tag)": (
+            'SELECT "a"."id" FROM "Appointment" "a" WHERE "a"."date" = ? AND "a"."location" = ?',
+            (today.isoformat(), location_id)
+        ),
+        "Ortsverlauf (zukünftig)": (
+            'SELECT "a"."id" FROM "Appointment" "a" WHERE "a"."location" = ? AND "a"."date" >= ? '
+            'ORDER BY "a"."date", "a"."start_time"',
+            (location_id, today.isoformat())
+        ),
+        "Personenverlauf (zukünftig)": (
+            'SELECT "a"."id" FROM "Appointment" "a" WHERE "a"."date" >= ? AND "a"."id" IN '
+            '(SELECT "t"."appointment" FROM "Appointment_Person" "t" WHERE "t"."person" = ?) '
+            'ORDER BY "a"."date", "a"."start_time"',
+            (today.isoformat(), person_id)
+        ),
+    }
+
+
+def _measure(queries: dict, repeat: int) -> dict:
+    """Ermittelt Abfrageplan und beste Laufzeit je Abfrage."""
+    cursor = db.get_connection().cursor()
+    results = {}
+    for name, (sql, arguments) in queries.items():
+        plan = [
+            row[-1] for row in cursor.execute(f"EXPLAIN QUERY PLAN {sql}", arguments).fetchall()
+        ]
+        timings = []
+        for _ in range(repeat):
+            started = time_module.perf_counter()
+            cursor.execute(sql, arguments).fetchall()
+            timings.append(time_module.perf_counter() - started)
+        results[name] = (plan, min(timings) * 1000)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--appointments", type=int, default=100_000)
+    parser.add_argument("--locations", type=int, default=200)
+    parser.add_argument("--persons", type=int, default=2_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db.bind(provider="sqlite", filename=os.path.join(tmp_dir, "bench.sqlite"), create_db=True)
+        db.generate_mapping(create_tables=True)
+
+        with db_session:
+            location_id, person_id = _fill_database(
+                args.appointments, args.locations, args.persons, random.Random(args.seed)
+            )
+            queries = _queries(location_id, person_id)
+
+            for index_name, _, _ in get_index_definitions(db):
+                db.execute(f'DROP INDEX IF EXISTS "{index_name}"')
+            db.execute("ANALYZE")
+            before = _measure(queries, args.repeat)
+
+        ensure_indexes(db)
+        with db_session:
+            db.execute("ANALYZE")
+            after = _measure(queries, args.repeat)
+
+    print(f"{args.appointments} Termine, {args.locations} Orte, {args.persons} Personen\n")
+    for name in queries:
+        (plan_before, ms_before), (plan_after, ms_after) = before[name], after[name]
+        print(f"{name}: {ms_before:.2f} ms -> {ms_after:.2f} ms")
+        print(f"  ohne Indizes: {' | '.join(plan_before)}")
+        print(f"  mit Indizes:  {' | '.join(plan_after)}\n")
+
+
+if __name__ == "__main__":
+    main()
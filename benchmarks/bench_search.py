@@ -0,0 +1,153 @@
+"""
+Vergleicht die Latenz der Suche mit Volltext-Suchindex und mit Teilstring-Suche.
+
+Legt für jede Größe eine temporäre SQLite-Datenbank mit synthetischen Terminen an, baut den
+Suchindex auf und misst für typische Eingaben die Terminsuche (AppointmentService), die
+gemeinsame Suche über alle Typen (SearchService.search) und die Vorschläge für das Suchfeld
+(SearchService.autocomplete), jeweils über den Index und über die Teilstring-Suche (LIKE),
+die ohne Index verwendet wird.
+
+Ausführen mit: python -m benchmarks.bench_search [--sizes 10000 100000]
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time as time_module
+import uuid
+from datetime import date, time, timedelta
+
+from pony.orm import db_session
+
+from database import search_index
+from database.models import db
+
+FIRST_NAMES = ["Anna", "Bernd", "Clara", "Dieter", "Emma", "Felix", "Greta", "Hans", "Ida", "Jonas"]
+LAST_NAMES = ["Müller", "Schmidt", "Schneider", "Fischer", "Weber", "Meyer", "Wagner", "Becker"]
+TOPICS = ["Besprechung", "Wartung", "Schulung", "Lieferung", "Inventur", "Beratung", "Aufbau"]
+
+SEARCH_TERMS = ["Be", "Bespr", "Müller", "Anna Weber", "Ort 17", "Inventur Lager"]
+
+
+def _fill_database(appointment_count: int, rng: random.Random) -> None:
+    """
+    Füllt die Tabellen per executemany mit Terminen, Personen und Orten.
+    PonyORM speichert UUIDs in SQLite als Bytes, damit die Entitäten später ladbar sind.
+    """
+    cursor = db.get_connection().cursor()
+    period_id = uuid.uuid4().bytes
+    start = date.today() - timedelta(days=365)
+    cursor.execute(
+        'INSERT INTO "PlanPeriod" ("id", "name", "start_date", "end_date") VALUES (?, ?, ?, ?)',
+        (period_id, "Benchmark", start.isoformat(), (start + timedelta(days=730)).isoformat())
+    )
+    address_id = uuid.uuid4().bytes
+    cursor.execute(
+        'INSERT INTO "Address" ("id", "street", "postal_code", "city") VALUES (?, ?, ?, ?)',
+        (address_id, "Teststraße 1", "10115", "Berlin")
+    )
+    location_ids = [uuid.uuid4().bytes for _ in range(100)]
+    cursor.executemany(
+        'INSERT INTO "LocationOfWork" ("id", "name", "address") VALUES (?, ?, ?)',
+        [(location_id, f"Ort {i} Lager", address_id) for i, location_id in enumerate(location_ids)]
+    )
+    persons = [
+        (uuid.uuid4().bytes, rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)) for _ in range(500)
+    ]
+    cursor.executemany(
+        'INSERT INTO "Person" ("id", "f_name", "l_name", "email") VALUES (?, ?, ?, \'\')', persons
+    )
+    appointments, links = [], []
+    for i in range(appointment_count):
+        appointment_id = uuid.uuid4().bytes
+        appointments.append((
+            appointment_id, period_id, (start + timedelta(days=rng.randrange(730))).isoformat(),
+            time(rng.randrange(7, 19), 0).isoformat(), 1 / 24, rng.choice(location_ids),
+            '["Gast %d"]' % (i % 50), f"{rng.choice(TOPICS)} Nummer {i}"
+        ))
+        links.extend((appointment_id, person[0]) for person in rng.sample(persons, 2))
+    cursor.executemany(
+        'INSERT INTO "Appointment" ("id", "plan_period", "date", "start_time", "delta", '
+        '"location", "guests", "notes") VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+        appointments,
+    )
+    cursor.executemany(
+        'INSERT INTO "Appointment_Person" ("appointment", "person") VALUES (?, ?)', links
+    )
+
+
+def _measure(repeat: int, limit: int) -> dict:
+    """Misst je Suchbegriff und Operation den Median der Laufzeit in ms sowie die Trefferzahl."""
+    from api.services import AppointmentService, SearchService
+
+    operations = {
+        "Termine": lambda term: AppointmentService.search_appointments(term, limit=limit),
+        "Gesamt": lambda term: [hit for _, hits in SearchService.search(term) for hit in hits],
+        "Vorschläge": lambda term: SearchService.autocomplete(term),
+    }
+    results = {}
+    for term in SEARCH_TERMS:
+        for operation, call in operations.items():
+            timings = []
+            for _ in range(repeat):
+                started = time_module.perf_counter()
+                found = call(term)
+                timings.append((time_module.perf_counter() - started) * 1000)
+            results[term, operation] = (statistics.median(timings), len(found))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db.bind(provider="sqlite", filename=os.path.join(tmp_dir, "bench.sqlite"), create_db=True)
+        db.generate_mapping(create_tables=True)
+        rng = random.Random(args.seed)
+
+        for size in args.sizes:
+            with db_session:
+                for table in (
+                    "Appointment_Person",
+                    "Appointment",
+                    "Person",
+                    "LocationOfWork",
+                    "Address",
+                    "PlanPeriod",
+                ):
+                    db.execute(f'DELETE FROM "{table}"')
+                _fill_database(size, rng)
+
+            started = time_module.perf_counter()
+            search_index.ensure_search_index(db)
+            build_seconds = time_module.perf_counter() - started
+
+            indexed = _measure(args.repeat, args.limit)
+            search_index._available[id(db)] = False
+            fallback = _measure(args.repeat, args.limit)
+            search_index._available[id(db)] = True
+
+            print(f"\n{size} Termine (Indexaufbau {build_seconds:.1f} s)")
+            print(
+                f"{'Suchbegriff':<16} {'Operation':<12} {'Index ms':>10} {'LIKE ms':>10} "
+                f"{'Treffer':>9}"
+            )
+            for term, operation in indexed:
+                index_ms, index_hits = indexed[term, operation]
+                like_ms, like_hits = fallback[term, operation]
+                print(
+                    f"{term:<16} {operation:<12} {index_ms:>10.2f} {like_ms:>10.2f} "
+                    f"{index_hits:>4}/{like_hits:<4}"
+                )
+
+
+if __name__ == "__main__":
+    main()
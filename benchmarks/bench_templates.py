@@ -0,0 +1,104 @@
+"""
+Misst die Renderzeiten der Templates kalt und warm, mit und ohne Bytecode-Cache.
+
+Jede Variante läuft in einem eigenen Prozess, wie ein frisch gestarteter Worker:
+- "ohne Cache": kein Bytecode-Cache, jedes Template wird beim ersten Aufruf geparst und kompiliert
+- "Cache leer": Bytecode-Cache in einem leeren Verzeichnis (erster Worker nach einem Deploy)
+- "Cache gefüllt": derselbe Cache, neuer Prozess (weitere Worker und Neustarts)
+
+Gemessen werden das Laden aller Templates (wie beim Vorkompilieren in main.lifespan), die erste
+Anfrage an die Startseite ohne und mit vorherigem Vorkompilieren sowie die zweite Anfrage (warm,
+Templates im Speicher).
+
+Ausführen mit: python -m benchmarks.bench_templates [--repeat 3]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time as time_module
+
+
+def _child(mode: str) -> None:
+    """Misst in einem frischen Prozess und gibt das Ergebnis als JSON aus."""
+    from database.models import db
+
+    db.bind(
+        provider="sqlite", filename=os.path.join(tempfile.mkdtemp(), "bench.sqlite"), create_db=True
+    )
+    db.generate_mapping(create_tables=True)
+
+    from fastapi.testclient import TestClient
+    import main
+    from api.templates import precompile_templates, templates
+
+    result = {}
+    if mode == "precompile":
+        started = time_module.perf_counter()
+        result["count"] = precompile_templates()
+        result["precompile_ms"] = (time_module.perf_counter() - started) * 1000
+    else:
+        # Lifespan nicht starten; vorkompiliert wird nur in der Variante "startup"
+        if mode == "startup":
+            precompile_templates()
+        client = TestClient(main.app)
+        for key in ("first_request_ms", "second_request_ms"):
+            started = time_module.perf_counter()
+            client.get("/")
+            result[key] = (time_module.perf_counter() - started) * 1000
+        result["loaded"] = len(templates.env.cache or {})
+    print(json.dumps(result))
+
+
+def _run(mode: str, cache_dir: str) -> dict:
+    env = dict(os.environ, TEMPLATE_BYTECODE_CACHE_DIR=cache_dir, PRECOMPILE_TEMPLATES="false")
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_templates", "--child", mode],
+        env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--child", choices=["precompile", "request", "startup"], help=argparse.SUPPRESS
+    )
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args.child)
+        return
+
+    scenarios = {"ohne Cache": [], "Cache leer": [], "Cache gefüllt": []}
+    for _ in range(args.repeat):
+        for mode in ("precompile", "request", "startup"):
+            with tempfile.TemporaryDirectory() as cache_dir:
+                scenarios["ohne Cache"].append((mode, _run(mode, "")))
+                scenarios["Cache leer"].append((mode, _run(mode, cache_dir)))
+                scenarios["Cache gefüllt"].append((mode, _run(mode, cache_dir)))
+
+    print(f"{'Variante':<16} {'Alle laden ms':>14} {'1. Anfrage ms':>14} {'1. nach Vork. ms':>17} "
+          f"{'2. Anfrage ms':>14}")
+    for label, runs in scenarios.items():
+        precompile = statistics.median(
+            r["precompile_ms"] for mode, r in runs if mode == "precompile"
+        )
+        first = statistics.median(r["first_request_ms"] for mode, r in runs if mode == "request")
+        precompiled = statistics.median(
+            r["first_request_ms"] for mode, r in runs if mode == "startup"
+        )
+        second = statistics.median(r["second_request_ms"] for mode, r in runs if mode == "request")
+        print(
+            f"{label:<16} {precompile:>14.1f} {first:>14.1f} {precompiled:>17.1f} {second:>14.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
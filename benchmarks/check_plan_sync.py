@@ -0,0 +1,153 @@
+"""
+Prüft den Abgleich von Planungsperioden mit einem externen System (PUT /api/plans/periods/sync).
+
+Legt eine SQLite-Datenbank im Speicher an und spielt Abläufe durch, die über die Lebensdauer
+einer Periode auftreten, z.B. ein erneuter Abgleich, nachdem die Periode außerhalb des Abgleichs
+gelöscht wurde. Schlägt ein Ablauf fehl, endet das Skript mit Exit-Code 1.
+
+Ausführen mit: python -m benchmarks.check_plan_sync
+"""
+import argparse
+import sys
+from datetime import date, time, timedelta
+
+from pony.orm import db_session, select
+
+from database.models import (
+    db,
+    Address,
+    Appointment,
+    ExternalKey,
+    LocationOfWork,
+    Person,
+    PlanPeriod,
+)
+
+
+@db_session
+def _create_base_data() -> dict:
+    """Legt einen Arbeitsort und eine Person an, auf die sich die Termine beziehen."""
+    address = Address(street="Teststraße 1", postal_code="10115", city="Berlin")
+    location = LocationOfWork(name="Abgleichsort", address=address)
+    person = Person(f_name="Vorname", l_name="Nachname")
+    return {"location_id": location.id, "person_id": person.id}
+
+
+def _payload(ids: dict, appointment_count: int):
+    from api.models import schemas
+
+    start = date.today().replace(day=1)
+    return schemas.PlanPeriodSync(
+        external_id="periode-1",
+        name="Abgleichsperiode",
+        start_date=start,
+        end_date=start + timedelta(days=27),
+        plan=schemas.PlanPeriodSyncPlan(external_id="plan-1", name="Abgleichsplan"),
+        appointments=[
+            schemas.PlanPeriodSyncAppointment(
+                external_id=f"termin-{i}",
+                date=start + timedelta(days=i % 28),
+                start_time=time(8 + i % 10, 0),
+                delta=timedelta(hours=1),
+                location_id=ids["location_id"],
+                person_ids=[ids["person_id"]],
+            )
+            for i in range(appointment_count)
+        ],
+    )
+
+
+def _check_resync_after_period_deleted(ids: dict) -> list:
+    """
+    Die Periode wird außerhalb des Abgleichs gelöscht; derselbe Stand muss erneut anlegbar sein.
+    """
+    from api.exceptions.plan import PlanValidationException
+    from api.services import PlanService
+
+    sync_data = _payload(ids, 20)
+    first = PlanService.sync_plan_period(sync_data)
+    with db_session:
+        period = PlanPeriod[first.plan_period_id]
+        period.plan.delete()
+        period.delete()
+
+    try:
+        second = PlanService.sync_plan_period(sync_data)
+    except PlanValidationException as e:
+        return [f"erneuter Abgleich abgelehnt: {e.details}"]
+
+    problems = []
+    if second.period != "created" or second.appointments_created != 20:
+        problems.append(
+            f"erwartet: Periode angelegt, 20 Termine; erhalten: {second.period}, "
+            f"{second.appointments_created} Termine"
+        )
+    with db_session:
+        appointment_count = Appointment.select().count()
+        orphaned = select(
+            k for k in ExternalKey if k.plan_period_id == first.plan_period_id
+        ).count()
+    if appointment_count != 20:
+        problems.append(f"{appointment_count} statt 20 Termine gespeichert")
+    if orphaned:
+        problems.append(f"{orphaned} verwaiste externe Schlüssel der gelöschten Periode")
+    return problems
+
+
+def _check_rename_invalidates_views(ids: dict) -> list:
+    """
+    Nach dem Umbenennen der Periode zeigen gecachte Monats- und Tagesansichten den neuen Namen,
+    und der Änderungszähler des Monats ist erhöht (neues ETag).
+    """
+    from api.services import CalendarService, DataVersionService, PlanService
+
+    sync_data = _payload(ids, 20)
+    PlanService.sync_plan_period(sync_data)
+    first_date = min(a.date for a in sync_data.appointments)
+    month_scope = DataVersionService.month_scope(first_date.year, first_date.month)
+    version_before = DataVersionService.get_versions([month_scope])[month_scope][0]
+    CalendarService.get_calendar_page(first_date.year, first_date.month)
+
+    renamed = sync_data.model_copy(update={"name": "Umbenannte Periode"})
+    result = PlanService.sync_plan_period(renamed)
+
+    problems = []
+    if result.period != "updated":
+        problems.append(f"erwartet: Periode aktualisiert; erhalten: {result.period}")
+    if DataVersionService.get_versions([month_scope])[month_scope][0] == version_before:
+        problems.append(f"Änderungszähler {month_scope} nicht erhöht")
+    appointments = CalendarService.get_day_view_data(first_date.isoformat())["appointments"]
+    names = {a.plan_period.name for a in appointments}
+    if names != {"Umbenannte Periode"}:
+        problems.append(f"Tagesansicht zeigt Periodennamen {sorted(names)}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.parse_args()
+
+    db.bind(provider="sqlite", filename=":memory:")
+    db.generate_mapping(create_tables=True)
+    ids = _create_base_data()
+
+    checks = {
+        "Erneuter Abgleich nach Löschen der Periode": _check_resync_after_period_deleted,
+        "Umbenennen der Periode verwirft Ansichten": _check_rename_invalidates_views,
+    }
+    failed = False
+    for name, check in checks.items():
+        problems = check(ids)
+        failed = failed or bool(problems)
+        print(f"{name}: {'FEHLER' if problems else 'OK'}")
+        for problem in problems:
+            print(f"  {problem}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Prüft, dass die Anzahl der SQL-Abfragen der Termin-Lesepfade nicht mit der Ergebnisgröße wächst.
+
+Legt eine temporäre SQLite-Datenbank an, füllt sie nacheinander mit einer kleinen und einer
+größeren Anzahl von Terminen und zählt die SQL-Anweisungen der Service-Methoden, die Termindetails
+liefern. Weicht die Anzahl zwischen den Datenmengen ab, endet das Skript mit Exit-Code 1.
+
+Ausführen mit: python -m benchmarks.check_query_counts
+"""
+import argparse
+import logging
+import sys
+from datetime import date, time, timedelta
+
+from pony.orm import db_session, set_sql_debug
+
+from database.models import db, Address, LocationOfWork, Person, PlanPeriod, Appointment
+
+
+class _SQLCounter(logging.Handler):
+    """Zählt die von PonyORM protokollierten SQL-Anweisungen."""
+
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+
+    def emit(self, record: logging.LogRecord):
+        message = record.getMessage().lstrip()
+        if message.split(" ", 1)[0].upper() in ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH"):
+            self.count += 1
+
+
+@db_session
+def _create_dataset(appointment_count: int, start: date) -> dict:
+    """
+    Legt Termine ab start über 28 Tage an, jeweils mit eigener Adresse und zwei Personen.
+    Jeder zweite Termin liegt am gemeinsamen Anker-Ort, alle Termine haben die Anker-Person.
+    """
+    period = PlanPeriod(name="Zählperiode", start_date=start, end_date=start + timedelta(days=27))
+    anchor_person = Person(f_name="Anker", l_name="Person")
+    anchor_location = None
+    for i in range(appointment_count):
+        address = Address(street=f"Straße {i}", postal_code="10115", city="Berlin")
+        location = LocationOfWork(name=f"Ort {i}", address=address)
+        anchor_location = anchor_location or location
+        appointment = Appointment(
+            plan_period=period,
+            date=start + timedelta(days=(i * 7 + i // 4) % 28),
+            start_time=time(9 + i % 8, 0),
+            delta=timedelta(hours=1),
+            location=anchor_location if i % 2 else location,
+            notes=f"Zähltermin {i}"
+        )
+        appointment.persons.add(anchor_person)
+        appointment.persons.add(Person(f_name=f"Vorname{i}", l_name=f"Nachname{i}"))
+    return {"person_id": anchor_person.id, "location_id": anchor_location.id}
+
+
+@db_session
+def _clear_dataset():
+    for entity in (Appointment, PlanPeriod, LocationOfWork, Address, Person):
+        entity.select().delete(bulk=False)
+
+
+def _measure(counter: _SQLCounter, today: date, ids: dict) -> dict:
+    """Zählt die SQL-Anweisungen je Service-Methode."""
+    from api.services import AppointmentService, CalendarService
+
+    calls = {
+        "CalendarService.fill_calendar_with_appointments": lambda: (
+            CalendarService.fill_calendar_with_appointments(
+                CalendarService.get_calendar_data(today.year, today.month)
+            )
+        ),
+        "CalendarService.get_day_view_data": lambda: (
+            CalendarService.get_day_view_data(today.isoformat())
+        ),
+        "AppointmentService.get_appointments_by_date": lambda: (
+            AppointmentService.get_appointments_by_date(today.isoformat())
+        ),
+        "AppointmentService.get_future_appointments_for_person": lambda: (
+            AppointmentService.get_future_appointments_for_person(ids["person_id"])
+        ),
+        "AppointmentService.get_past_appointments_for_person": lambda: (
+            AppointmentService.get_past_appointments_for_person(ids["person_id"], days=30)
+        ),
+        "AppointmentService.get_future_appointments_for_location": lambda: (
+            AppointmentService.get_future_appointments_for_location(ids["location_id"])
+        ),
+        "AppointmentService.get_past_appointments_for_location": lambda: (
+            AppointmentService.get_past_appointments_for_location(ids["location_id"], days=30)
+        ),
+        "AppointmentService.search_appointments": lambda: (
+            AppointmentService.search_appointments("Zähltermin", limit=500)
+        ),
+    }
+
+    counts = {}
+    for name, call in calls.items():
+        counter.count = 0
+        call()
+        counts[name] = counter.count
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--sizes", type=int, nargs=2, default=[5, 200])
+    args = parser.parse_args()
+
+    db.bind(provider="sqlite", filename=":memory:")
+    db.generate_mapping(create_tables=True)
+
+    counter = _SQLCounter()
+    sql_logger = logging.getLogger("pony.orm.sql")
+    sql_logger.addHandler(counter)
+    sql_logger.setLevel(logging.INFO)
+    sql_logger.propagate = False
+    # Verbindungsmeldungen von PonyORM unterdrücken
+    logging.getLogger("pony.orm").addHandler(logging.NullHandler())
+
+    # Termine liegen vor und nach heute, damit jede Methode bei beiden Größen Ergebnisse liefert
+    today = date.today()
+    start = today - timedelta(days=14)
+    results = []
+    for size in args.sizes:
+        ids = _create_dataset(size, start)
+        set_sql_debug(True)
+        results.append((size, _measure(counter, today, ids)))
+        set_sql_debug(False)
+        _clear_dataset()
+
+    failed = False
+    (small_size, small_counts), (large_size, large_counts) = results
+    print(f"{'Methode':<55} {f'n={small_size}':>8} {f'n={large_size}':>8}")
+    for name, small_count in small_counts.items():
+        grows = large_counts[name] > small_count
+        failed = failed or grows
+        print(
+            f"{name:<55} {small_count:>8} {large_counts[name]:>8}"
+            + ("  <-- wächst" if grows else "")
+        )
+
+    if failed:
+        print("\nFEHLER: Die Anzahl der SQL-Abfragen wächst mit der Ergebnisgröße.")
+        sys.exit(1)
+    print("\nOK: Konstante Anzahl von SQL-Abfragen.")
+
+
+if __name__ == "__main__":
+    main()
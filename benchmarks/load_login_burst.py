@@ -0,0 +1,213 @@
+"""
+Lasttest: Latenz anderer Endpunkte während eines Ansturms von Anmeldungen.
+
+Startet die Anwendung mit uvicorn gegen eine temporäre SQLite-Datenbank und misst mit
+parallelen Prüf-Clients die Latenz von /api/auth/me und der Kalender-Teilansicht, zuerst ohne
+Last und dann während eines Ansturms von Anmeldungen an /api/auth/token.
+
+"vorher" bildet den früheren Ablauf nach: synchrone Route, bcrypt im allgemeinen Thread-Pool
+ohne Begrenzung. "nachher" prüft die Passwörter im begrenzten Passwort-Pool; überzählige
+Anmeldungen werden mit 503 und Retry-After abgewiesen.
+
+Ausführen mit: python -m benchmarks.load_login_burst [--logins 200] [--rounds 10]
+"""
+import argparse
+import os
+import socket
+import statistics
+import tempfile
+import threading
+import time as time_module
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, time, timedelta
+
+import httpx
+
+
+def _percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else 0.0
+
+
+def _create_dataset(password_hash: str) -> None:
+    """Legt einige Termine sowie die Benutzer "bench" (Prüf-Clients) und "login" (Ansturm) an."""
+    from pony.orm import db_session
+    from database.models import Address, Appointment, LocationOfWork, Person, PlanPeriod, User
+
+    with db_session:
+        today = date.today()
+        start = today.replace(day=1) - timedelta(days=7)
+        period = PlanPeriod(
+            name="Lastperiode", start_date=start, end_date=start + timedelta(days=41)
+        )
+        location = LocationOfWork(
+            name="Ort", address=Address(street="Teststraße 1", postal_code="10115", city="Berlin")
+        )
+        person = Person(f_name="Vorname", l_name="Nachname")
+        for i in range(200):
+            appointment = Appointment(
+                plan_period=period,
+                date=start + timedelta(days=i % 42),
+                start_time=time(8 + i % 10, 0),
+                delta=timedelta(hours=1),
+                location=location,
+            )
+            appointment.persons.add(person)
+        User(username="bench", hashed_password=password_hash, person=person, role="employee")
+        User(
+            username="login",
+            hashed_password=password_hash,
+            person=Person(f_name="Login", l_name="Test"),
+            role="employee",
+        )
+
+
+def _legacy_login():
+    """Früherer Token-Endpunkt: synchrone Prüfung im allgemeinen Thread-Pool der Routen."""
+    from starlette.concurrency import run_in_threadpool
+    from api.auth.models import User
+    from api.auth.oauth2 import get_user, pwd_context
+
+    def authenticate(username, password):
+        user = get_user(username)
+        if not user or not pwd_context.verify(password, user.hashed_password):
+            return False
+        return User(
+            username=user.username, person_id=user.person_id, role=user.role, disabled=user.disabled
+        )
+
+    async def authenticate_user_async(username, password):
+        return await run_in_threadpool(authenticate, username, password)
+
+    return authenticate_user_async
+
+
+def _run_phase(base_url: str, token: str, probes: int, duration: float, logins: int) -> dict:
+    """
+    Misst die Prüf-Endpunkte für die angegebene Dauer bzw. bis der Ansturm abgearbeitet ist.
+
+    Returns:
+        Dictionary mit Latenzen der Prüf-Anfragen (ms) sowie Status und Latenzen der Anmeldungen
+    """
+    today = date.today()
+    probe_paths = [
+        "/api/auth/me",
+        f"/calendar/hx/calendar-partial?year={today.year}&month={today.month}",
+    ]
+    probe_latencies, login_latencies, login_status = [], [], []
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def probe(index: int):
+        with httpx.Client(base_url=base_url, timeout=120, cookies={"appointments_token": token},
+                          headers={"Authorization": f"Bearer {token}"}) as client:
+            position = index
+            while not stop.is_set():
+                started = time_module.perf_counter()
+                client.get(probe_paths[position % len(probe_paths)])
+                with lock:
+                    probe_latencies.append((time_module.perf_counter() - started) * 1000)
+                position += 1
+
+    def login(_):
+        with httpx.Client(base_url=base_url, timeout=300) as client:
+            started = time_module.perf_counter()
+            response = client.post(
+                "/api/auth/token", data={"username": "login", "password": "geheim"}
+            )
+            with lock:
+                login_latencies.append((time_module.perf_counter() - started) * 1000)
+                login_status.append(response.status_code)
+
+    probe_threads = [threading.Thread(target=probe, args=(i,), daemon=True) for i in range(probes)]
+    started = time_module.perf_counter()
+    for thread in probe_threads:
+        thread.start()
+    if logins:
+        with ThreadPoolExecutor(max_workers=logins) as pool:
+            list(pool.map(login, range(logins)))
+    else:
+        time_module.sleep(duration)
+    stop.set()
+    for thread in probe_threads:
+        thread.join()
+    return {
+        "seconds": time_module.perf_counter() - started,
+        "probe": probe_latencies,
+        "login": login_latencies,
+        "status": login_status,
+    }
+
+
+def _report(label: str, result: dict) -> None:
+    probe = result["probe"]
+    line = (
+        f"{label:<22} {len(probe):>6} {statistics.median(probe):>8.1f} "
+        f"{_percentile(probe, 0.95):>8.1f} {_percentile(probe, 0.99):>8.1f}"
+    )
+    if result["login"]:
+        accepted = sum(1 for status in result["status"] if status == 200)
+        throttled = sum(1 for status in result["status"] if status == 503)
+        line += (f"   Anmeldungen: {accepted} ok, {throttled} abgewiesen (503), "
+                 f"p99 {_percentile(result['login'], 0.99):.0f} ms, {result['seconds']:.1f} s")
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--logins", type=int, default=200, help="Anzahl gleichzeitiger Anmeldungen")
+    parser.add_argument("--probes", type=int, default=4, help="Anzahl paralleler Prüf-Clients")
+    parser.add_argument(
+        "--idle-seconds", type=float, default=5.0, help="Dauer der Messung ohne Last"
+    )
+    parser.add_argument("--rounds", type=int, default=10, help="bcrypt-Kostenfaktor")
+    args = parser.parse_args()
+
+    os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+
+    import uvicorn
+    from database.models import db
+    from api.auth import create_access_token
+    from api.auth.oauth2 import pwd_context
+    import api.routes.api.auth as auth_routes
+    import main as application
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db.bind(provider="sqlite", filename=os.path.join(tmp_dir, "bench.sqlite"), create_db=True)
+        db.generate_mapping(create_tables=True)
+        _create_dataset(pwd_context.hash("geheim"))
+        token = create_access_token({"sub": "bench", "role": "employee"})
+
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        server = uvicorn.Server(
+            uvicorn.Config(application.app, host="127.0.0.1", port=port, log_level="warning")
+        )
+        server_thread = threading.Thread(target=server.run, daemon=True)
+        server_thread.start()
+        while not server.started:
+            time_module.sleep(0.05)
+        base_url = f"http://127.0.0.1:{port}"
+
+        print(
+            f"{args.logins} Anmeldungen, bcrypt rounds={args.rounds}, {args.probes} Prüf-Clients, "
+            f"{os.cpu_count()} CPU(s)\n"
+        )
+        print(f"{'Phase':<22} {'Anfr.':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+        _report("ohne Last", _run_phase(base_url, token, args.probes, args.idle_seconds, 0))
+
+        current_login = auth_routes.authenticate_user_async
+        auth_routes.authenticate_user_async = _legacy_login()
+        _report("Ansturm, vorher", _run_phase(base_url, token, args.probes, 0, args.logins))
+        auth_routes.authenticate_user_async = current_login
+        _report("Ansturm, nachher", _run_phase(base_url, token, args.probes, 0, args.logins))
+
+        server.should_exit = True
+        server_thread.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,416 @@
+"""
+Benchmark-Suite für Services und HTTP-Routen mit JSON-Ergebnissen und Regressionsprüfung.
+
+Misst auf einem mit seed.seed_large_database erzeugten Datenbestand (Größe small, medium oder
+large) die Laufzeit von:
+- CalendarService.fill_calendar_with_appointments (aktueller Monat, ohne und mit Filter)
+- AppointmentService.get_appointments (aktueller Monat)
+- den search_*-Methoden der Services und SearchService.search
+- PlanService.get_plan_detail
+- den JWT-Abhängigkeiten get_current_user und get_current_user_from_cookie (mit und ohne
+  Cache der angemeldeten Benutzer)
+- vollständigen Anfragen über TestClient (Routing, Authentifizierung, Rendern/Serialisieren)
+
+Vor jedem Durchlauf werden die Caches der Kalenderansichten bzw. der angemeldeten Benutzer
+geleert, soweit der Benchmark nicht ausdrücklich den Cache misst. Je Benchmark werden Median,
+p95, Minimum und die Anzahl der SQL-Anweisungen je Aufruf als JSON geschrieben (--output). Mit
+--compare wird gegen eine frühere Ergebnisdatei verglichen: Das Skript endet mit Exit-Code 1,
+wenn ein Median um mehr als --threshold (Anteil, Standard 0.2 bzw.
+BENCHMARK_REGRESSION_THRESHOLD) langsamer ist oder ein Benchmark mehr SQL-Anweisungen als zuvor
+ausführt. Vergleichbar sind nur Läufe derselben Größe auf derselben Maschine.
+
+Der Datenbestand wird in einer temporären SQLite-Datenbank erzeugt; mit --database wird er in
+der angegebenen Datei angelegt bzw. wiederverwendet, was bei "large" die Erzeugung erspart.
+
+Ausführen mit: python -m benchmarks.suite [--size small] [--output results.json]
+    [--compare baseline.json] [--threshold 0.2] [--filter calendar]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time as time_module
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from pony.orm import count, db_session, select
+
+from database.models import db, Appointment, LocationOfWork, Person, Plan, User
+
+# Parameter für seed_large_database je Größe
+DATASET_SIZES = {
+    "small": dict(persons=200, locations=20, appointments=5000, teams=4, months=6),
+    "medium": dict(persons=2000, locations=100, appointments=50000, teams=10, months=12),
+    "large": dict(persons=20000, locations=300, appointments=500000, teams=40, months=24),
+}
+DATASET_SEED = 42
+
+REGRESSION_THRESHOLD = float(os.environ.get("BENCHMARK_REGRESSION_THRESHOLD", "0.2"))
+
+# Suchbegriffe mit Treffern im erzeugten Datenbestand (Nachnamen bzw. Art der Arbeitsorte)
+SEARCH_TERM = "Mül"
+LOCATION_SEARCH_TERM = "Klinik"
+
+
+class Benchmark(NamedTuple):
+    name: str
+    func: Callable[[], Any]
+    # Wird vor jedem Durchlauf ausgeführt und nicht mitgemessen
+    setup: Optional[Callable[[], None]] = None
+
+
+def _clear_view_caches() -> None:
+    """Leert die Caches der Kalenderansichten, nicht aber den der angemeldeten Benutzer."""
+    from api.services import CalendarService
+
+    CalendarService.invalidate_month_cache()
+    CalendarService.invalidate_day_fragments()
+    CalendarService.invalidate_filter_options()
+
+
+def _prepare_database(size: str, path: Optional[str]) -> None:
+    """Bindet die Datenbank und erzeugt den Datenbestand, sofern die Datei noch leer ist."""
+    import seed
+    from database.migrations import ensure_indexes
+    from database.search_index import ensure_search_index
+
+    db.bind(provider="sqlite", filename=path, create_db=True)
+    db.generate_mapping(create_tables=True)
+    ensure_indexes(db)
+    ensure_search_index(db)
+    with db_session:
+        populated = Appointment.select().exists()
+    if populated:
+        print(f"Verwende vorhandenen Datenbestand in {path}")
+        return
+    started = time_module.perf_counter()
+    seed.seed_large_database(seed=DATASET_SEED, with_base_data=False, **DATASET_SIZES[size])
+    print(f"Datenbestand '{size}' in {time_module.perf_counter() - started:.1f} s erzeugt\n")
+
+
+@db_session
+def _pick_fixtures() -> Dict[str, Any]:
+    """Wählt Person, Arbeitsort und Plan mit den meisten Terminen als Benchmark-Parameter."""
+    person = select(p for p in Person).order_by(lambda p: (-count(p.appointments), p.id)).first()
+    location = (
+        select(l for l in LocationOfWork).order_by(lambda l: (-count(l.appointments), l.id)).first()
+    )
+    plan = select(p for p in Plan).order_by(lambda p: (-count(p.appointments), p.id)).first()
+    user = User.get(username="benchmark") or User(
+        username="benchmark", hashed_password="-", person=person, role="admin"
+    )
+    return {
+        "person_id": person.id,
+        "location_id": location.id,
+        "plan_id": plan.id,
+        "user": user.username,
+    }
+
+
+def _build_benchmarks(fixtures: Dict[str, Any], client, token: str) -> List[Benchmark]:
+    from api.auth import get_current_user, invalidate_principal
+    from api.auth.cookie_auth import get_current_user_from_cookie
+    from api.services import (
+        AppointmentService,
+        CalendarService,
+        LocationService,
+        PersonService,
+        PlanService,
+        SearchService,
+    )
+
+    today = date.today()
+    year, month = today.year, today.month
+    person_id, location_id, plan_id = (
+        fixtures["person_id"],
+        fixtures["location_id"],
+        fixtures["plan_id"],
+    )
+    month_start = date(year, month, 1)
+    month_end = CalendarService.get_calendar_data(year, month)[-1][-1]["date"]
+    loop = asyncio.new_event_loop()
+    headers = {"Authorization": f"Bearer {token}"}
+
+    def get(url: str, **kwargs) -> Callable[[], Any]:
+        def request():
+            response = client.get(url, headers=headers, **kwargs)
+            if response.status_code != 200:
+                raise RuntimeError(f"{url} lieferte Status {response.status_code}")
+            return response
+
+        return request
+
+    return [
+        Benchmark(
+            "calendar.fill_month",
+            lambda: CalendarService.fill_calendar_with_appointments(
+                CalendarService.get_calendar_data(year, month)
+            ),
+        ),
+        Benchmark(
+            "calendar.fill_month_person_filter",
+            lambda: CalendarService.fill_calendar_with_appointments(
+                CalendarService.get_calendar_data(year, month), filter_person_id=str(person_id)
+            ),
+        ),
+        Benchmark(
+            "calendar.fill_month_location_filter",
+            lambda: CalendarService.fill_calendar_with_appointments(
+                CalendarService.get_calendar_data(year, month), filter_location_id=str(location_id)
+            ),
+        ),
+        Benchmark(
+            "appointments.get_month",
+            lambda: AppointmentService.get_appointments(start_date=month_start, end_date=month_end),
+        ),
+        Benchmark(
+            "search.appointments", lambda: AppointmentService.search_appointments(SEARCH_TERM)
+        ),
+        Benchmark("search.persons", lambda: PersonService.search_persons(SEARCH_TERM)),
+        Benchmark(
+            "search.locations", lambda: LocationService.search_locations(LOCATION_SEARCH_TERM)
+        ),
+        Benchmark("search.plans", lambda: PlanService.search_plans("Plan")),
+        Benchmark("search.grouped", lambda: list(SearchService.search(SEARCH_TERM))),
+        Benchmark("plans.get_all_plans", PlanService.get_all_plans),
+        Benchmark("plans.get_plan_detail", lambda: PlanService.get_plan_detail(plan_id)),
+        Benchmark(
+            "auth.bearer_uncached",
+            lambda: loop.run_until_complete(get_current_user(token)),
+            setup=invalidate_principal,
+        ),
+        Benchmark("auth.bearer_cached", lambda: loop.run_until_complete(get_current_user(token))),
+        Benchmark(
+            "auth.cookie_cached",
+            lambda: loop.run_until_complete(get_current_user_from_cookie(token)),
+        ),
+        Benchmark("route.calendar", get("/calendar/"), setup=_clear_view_caches),
+        Benchmark("route.calendar_cached", get("/calendar/")),
+        Benchmark(
+            "route.calendar_partial",
+            get(
+                f"/calendar/hx/calendar-partial?year={year}&month={month}"
+                f"&filter_person_id={person_id}"
+            ),
+            setup=_clear_view_caches,
+        ),
+        Benchmark(
+            "route.day_view",
+            get(f"/calendar/hx/day-view/{today.isoformat()}"),
+            setup=_clear_view_caches,
+        ),
+        Benchmark("route.search", get(f"/calendar/search/?q={SEARCH_TERM}")),
+        Benchmark("route.api_appointments_page", get("/api/appointments/?limit=500")),
+        Benchmark(
+            "route.api_appointments_month",
+            get(f"/api/appointments/by-month/{year}/{month}"),
+            setup=_clear_view_caches,
+        ),
+        Benchmark("route.api_plans", get("/api/plans/")),
+        Benchmark("route.plans", get("/calendar/plans/")),
+        Benchmark("route.api_plan_detail", get(f"/api/plans/{plan_id}")),
+    ]
+
+
+def _server_timing_sql_count(result: Any) -> int:
+    """
+    Liest die Anzahl der SQL-Anweisungen aus dem Server-Timing-Header einer Antwort.
+
+    TestClient führt die Anwendung in einem eigenen Thread mit eigenem Kontext aus; die
+    Anweisungen einer Anfrage zählt daher die MetricsMiddleware und nicht run_benchmark.
+    """
+    server_timing = getattr(result, "headers", {}).get("server-timing", "")
+    match = re.search(r'desc="(\d+) SQL"', server_timing)
+    return int(match.group(1)) if match else 0
+
+
+def run_benchmark(benchmark: Benchmark, repeat: int, min_time: float) -> Dict[str, Any]:
+    """
+    Führt einen Benchmark nach einem Aufwärmdurchlauf mindestens repeat-mal bzw. min_time
+    Sekunden lang aus.
+
+    Args:
+        benchmark: Der Benchmark
+        repeat: Mindestanzahl der gemessenen Durchläufe
+        min_time: Mindestdauer aller gemessenen Durchläufe in Sekunden
+
+    Returns:
+        Ergebnis mit Median, p95, Minimum und Mittelwert in Millisekunden, Anzahl der Durchläufe
+        und SQL-Anweisungen je Aufruf
+    """
+    from api.utils.metrics import end_request, start_request
+
+    if benchmark.setup:
+        benchmark.setup()
+    benchmark.func()
+
+    timings, statement_counts = [], []
+    while len(timings) < repeat or sum(timings) < min_time:
+        if benchmark.setup:
+            benchmark.setup()
+        metrics, token = start_request()
+        started = time_module.perf_counter()
+        try:
+            result = benchmark.func()
+        finally:
+            timings.append(time_module.perf_counter() - started)
+            end_request(token)
+        statement_counts.append(metrics.sql_count or _server_timing_sql_count(result))
+
+    timings_ms = sorted(t * 1000 for t in timings)
+    return {
+        "median_ms": round(statistics.median(timings_ms), 3),
+        "p95_ms": round(timings_ms[min(len(timings_ms) - 1, int(len(timings_ms) * 0.95))], 3),
+        "min_ms": round(timings_ms[0], 3),
+        "mean_ms": round(statistics.fmean(timings_ms), 3),
+        "rounds": len(timings_ms),
+        "sql_statements": max(statement_counts),
+    }
+
+
+def compare_results(
+    results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any], threshold: float
+) -> List[str]:
+    """
+    Vergleicht Ergebnisse mit einer früheren Ergebnisdatei.
+
+    Args:
+        results: Die aktuellen Ergebnisse je Benchmark
+        baseline: Der Inhalt der früheren Ergebnisdatei
+        threshold: Zulässige Verlangsamung des Medians als Anteil, z.B. 0.2 für 20 %
+
+    Returns:
+        Beschreibungen der Regressionen; leer, wenn keine vorliegen
+    """
+    regressions = []
+    for name, result in results.items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            continue
+        change = result["median_ms"] / previous["median_ms"] - 1 if previous["median_ms"] else 0.0
+        if change > threshold:
+            regressions.append(
+                f"{name}: Median {previous['median_ms']:.2f} -> {result['median_ms']:.2f} ms "
+                f"({change:+.0%})"
+            )
+        if result["sql_statements"] > previous["sql_statements"]:
+            regressions.append(
+                f"{name}: SQL-Anweisungen {previous['sql_statements']} -> "
+                f"{result['sql_statements']}"
+            )
+    return regressions
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--size", choices=sorted(DATASET_SIZES), default="small")
+    parser.add_argument(
+        "--database", help="SQLite-Datei des Datenbestands (wird angelegt oder wiederverwendet)"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=10, help="Mindestanzahl Durchläufe je Benchmark"
+    )
+    parser.add_argument(
+        "--min-time", type=float, default=0.5, help="Mindestdauer je Benchmark in Sekunden"
+    )
+    parser.add_argument(
+        "--filter", default="", help="Nur Benchmarks, deren Name diesen Text enthält"
+    )
+    parser.add_argument("--output", help="Ergebnisse als JSON in diese Datei schreiben")
+    parser.add_argument("--compare", help="Mit dieser früheren Ergebnisdatei vergleichen")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        _prepare_database(args.size, args.database or os.path.join(tmp_dir, "bench.sqlite"))
+
+        from fastapi.testclient import TestClient
+
+        import main as app_module
+        from api.auth import create_access_token
+        from api.utils.metrics import instrument_database
+
+        instrument_database(db)
+        fixtures = _pick_fixtures()
+        token = create_access_token(
+            {"sub": fixtures["user"], "role": "admin", "person_id": str(fixtures["person_id"])}
+        )
+
+        with TestClient(app_module.app) as client:
+            client.cookies.set("appointments_token", token)
+            benchmarks = [
+                b for b in _build_benchmarks(fixtures, client, token) if args.filter in b.name
+            ]
+
+            print(
+                f"Datenbestand '{args.size}', mindestens {args.repeat} Durchläufe bzw. "
+                f"{args.min_time} s\n"
+            )
+            print(
+                f"{'Benchmark':<36} {'Median ms':>10} {'p95 ms':>10} {'Min ms':>10} "
+                f"{'Runden':>7} {'SQL':>5}"
+            )
+            results = {}
+            for benchmark in benchmarks:
+                result = results[benchmark.name] = run_benchmark(
+                    benchmark, args.repeat, args.min_time
+                )
+                print(
+                    f"{benchmark.name:<36} {result['median_ms']:>10.2f} {result['p95_ms']:>10.2f} "
+                    f"{result['min_ms']:>10.2f} {result['rounds']:>7} {result['sql_statements']:>5}"
+                )
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "size": args.size,
+            "dataset": DATASET_SIZES[args.size],
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+        print(f"\nErgebnisse in {args.output} geschrieben")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+        if baseline["meta"].get("size") != args.size:
+            print(f"\nWarnung: Vergleich mit Datenbestand '{baseline['meta'].get('size')}'")
+        regressions = compare_results(results, baseline, args.threshold)
+        if regressions:
+            print(f"\nRegressionen gegenüber {baseline['meta'].get('commit') or args.compare}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(
+            f"\nKeine Regression gegenüber {baseline['meta'].get('commit') or args.compare} "
+            f"(Schwelle {args.threshold:.0%})"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,12 @@
+"""
+Dieses Skript erzeugt static/dist/ mit gehashten und vorkomprimierten statischen Dateien.
+
+Nach Änderungen an static/ erneut ausführen; ohne static/dist/ verweisen die Templates auf die
+ursprünglichen Dateien.
+"""
+from api.static_assets import build_static_assets
+
+if __name__ == "__main__":
+    manifest = build_static_assets()
+    for original, hashed in sorted(manifest.items()):
+        print(f"{original} -> dist/{hashed}")
@@ -0,0 +1,146 @@
+"""
+Gesammeltes Schreiben und Löschen vieler Zeilen mit executemany, ohne PonyORM-Entitäten zu laden.
+
+PonyORM schreibt jede neue Entität mit einem eigenen INSERT und hält sie bis zum Ende der
+db_session im Cache; beim Löschen lädt es zudem die Verknüpfungen der Entität. Für Importe,
+Abgleiche und große Testdatenbestände schreiben BulkInserter und BulkDeleter die Zeilen
+stattdessen direkt über die Verbindung der aktuellen db_session. Die Änderungen sind damit erst
+nach einer neuen Abfrage sichtbar; betroffene Entitäten dürfen in derselben db_session nicht
+geladen sein. Suchindex und Caches muss der Aufrufer pflegen.
+"""
+from typing import Any, List, Sequence
+
+from pony.orm import Database
+
+
+class BulkInserter:
+    """
+    Schreibt Zeilen gesammelt mit executemany in die Tabelle einer Entität oder Verknüpfungstabelle.
+
+    Tabellen- und Spaltennamen sowie die Umwandlung der Werte stammen aus dem Pony-Mapping,
+    sodass dieselben Zeilen unter SQLite und PostgreSQL geschrieben werden können.
+    """
+
+    def __init__(self, db: Database, table: str, columns: Sequence[str], converters: Sequence[Any]):
+        """
+        Args:
+            db: Die gemappte Datenbank
+            table: Der Tabellenname
+            columns: Die Spaltennamen
+            converters: Die Pony-Konverter der Spalten, in derselben Reihenfolge
+        """
+        quote = db.provider.quote_name
+        placeholder = "%s" if db.provider.paramstyle in ("format", "pyformat") else "?"
+        self.db = db
+        self.sql = (
+            f"INSERT INTO {quote(table)} ({', '.join(quote(column) for column in columns)}) "
+            f"VALUES ({', '.join([placeholder] * len(columns))})"
+        )
+        self.converters = converters
+        self.rows: List[tuple] = []
+        self.written = 0
+
+    @classmethod
+    def for_entity(cls, entity, attr_names: Sequence[str]) -> "BulkInserter":
+        """Tabelle einer Entität mit den Spalten der angegebenen Attribute (auch Fremdschlüssel)."""
+        attrs = [getattr(entity, name) for name in attr_names]
+        return cls(
+            entity._database_,
+            entity._table_,
+            [attr.columns[0] for attr in attrs],
+            [attr.converters[0] for attr in attrs],
+        )
+
+    @classmethod
+    def for_link(cls, attr) -> "BulkInserter":
+        """
+        Verknüpfungstabelle einer Set-Beziehung, Zeilen als (ID dieser Seite, ID der Gegenseite).
+        """
+        entity_pk = attr.entity._pk_attrs_[0]
+        reverse_pk = attr.reverse.entity._pk_attrs_[0]
+        return cls(
+            attr.entity._database_,
+            attr.table,
+            [attr.reverse.columns[0], attr.columns[0]],
+            [entity_pk.converters[0], reverse_pk.converters[0]]
+        )
+
+    def add(self, *values: Any) -> None:
+        """Nimmt eine Zeile auf; die Werte in der Reihenfolge der Spalten, als Python-Werte."""
+        self.rows.append(tuple(
+            None if value is None else converter.py2sql(converter.val2dbval(value, None))
+            for converter, value in zip(self.converters, values)
+        ))
+
+    def flush(self) -> None:
+        """Schreibt die gesammelten Zeilen in der Transaktion der aktuellen db_session."""
+        if self.rows:
+            self.db.get_connection().cursor().executemany(self.sql, self.rows)
+            self.written += len(self.rows)
+            self.rows = []
+
+
+class BulkDeleter:
+    """
+    Löscht Zeilen gesammelt mit executemany anhand von Schlüsselspalten.
+    """
+
+    def __init__(self, db: Database, table: str, columns: Sequence[str], converters: Sequence[Any]):
+        """
+        Args:
+            db: Die gemappte Datenbank
+            table: Der Tabellenname
+            columns: Die Schlüsselspalten; eine Zeile wird gelöscht, wenn alle übereinstimmen
+            converters: Die Pony-Konverter der Spalten, in derselben Reihenfolge
+        """
+        quote = db.provider.quote_name
+        placeholder = "%s" if db.provider.paramstyle in ("format", "pyformat") else "?"
+        self.db = db
+        self.sql = (
+            f"DELETE FROM {quote(table)} WHERE "
+            + " AND ".join(f"{quote(column)} = {placeholder}" for column in columns)
+        )
+        self.converters = converters
+        self.rows: List[tuple] = []
+
+    @classmethod
+    def for_entity(cls, entity, attr_names: Sequence[str] = ("id",)) -> "BulkDeleter":
+        """
+        Tabelle einer Entität, Zeilen anhand der angegebenen Attribute (Standard: Primärschlüssel).
+        """
+        attrs = [getattr(entity, name) for name in attr_names]
+        return cls(
+            entity._database_,
+            entity._table_,
+            [attr.columns[0] for attr in attrs],
+            [attr.converters[0] for attr in attrs],
+        )
+
+    @classmethod
+    def for_link(cls, attr, owner_only: bool = False) -> "BulkDeleter":
+        """
+        Verknüpfungstabelle einer Set-Beziehung, Zeilen als (ID dieser Seite, ID der Gegenseite).
+        Mit owner_only werden alle Verknüpfungen einer Entität dieser Seite gelöscht.
+        """
+        entity_pk = attr.entity._pk_attrs_[0]
+        columns = [attr.reverse.columns[0]]
+        converters = [entity_pk.converters[0]]
+        if not owner_only:
+            columns.append(attr.columns[0])
+            converters.append(attr.reverse.entity._pk_attrs_[0].converters[0])
+        return cls(attr.entity._database_, attr.table, columns, converters)
+
+    def add(self, *values: Any) -> None:
+        """Nimmt den Schlüssel einer zu löschenden Zeile auf, als Python-Werte."""
+        self.rows.append(
+            tuple(
+                converter.py2sql(converter.val2dbval(value, None))
+                for converter, value in zip(self.converters, values)
+            )
+        )
+
+    def flush(self) -> None:
+        """Löscht die gesammelten Zeilen in der Transaktion der aktuellen db_session."""
+        if self.rows:
+            self.db.get_connection().cursor().executemany(self.sql, self.rows)
+            self.rows = []
@@ -1,6 +1,8 @@
 import os
 from pony.orm import db_session
 from .models import db
+from .migrations import ensure_indexes
+from .search_index import ensure_search_index
 from .models.entities import *  # Importiert alle Entity-Definitionen
 from .models.auth import *      # Importiert alle Auth-Entity-Definitionen
 
@@ -33,4 +35,10 @@ def setup_database(database_url=None):
     # Datenbank-Schema erstellen (Tabellen, etc.)
     db.generate_mapping(create_tables=True)
     
+    # Nachträglich eingeführte Indizes in bestehenden Datenbanken ergänzen
+    ensure_indexes(db)
+    
+    # Volltext-Suchindex anlegen und bei Bedarf neu aufbauen
+    ensure_search_index(db)
+    
     return db
@@ -0,0 +1,75 @@
+"""
+Migrationsschritte für bestehende Datenbanken.
+
+Neue Datenbanken erhalten Tabellen und die in den Entitäten deklarierten Indizes über
+db.generate_mapping(). Die Schritte hier ergänzen bestehende Datenbanken (SQLite und PostgreSQL)
+idempotent um nachträglich eingeführte Indizes, auch für Verknüpfungstabellen, für die PonyORM
+keine eigenen Indizes deklarieren kann.
+
+Ausführen mit: python -m database.migrations
+"""
+from typing import List, Tuple
+
+from pony.orm import Database, db_session
+
+
+def get_index_definitions(db: Database) -> List[Tuple[str, str, List[str]]]:
+    """
+    Liefert die Sekundär- und Verbundindizes für Termine.
+
+    Tabellen- und Spaltennamen werden aus dem Mapping gelesen, damit die Namenskonventionen
+    des jeweiligen Providers (z.B. Kleinschreibung bei PostgreSQL) berücksichtigt werden.
+
+    Args:
+        db: Die gemappte Datenbank
+
+    Returns:
+        Liste von Tupeln (Indexname, Tabellenname, Spaltennamen)
+    """
+    appointment = db.entities["Appointment"]
+    person = db.entities["Person"]
+
+    date_column = appointment.date.columns[0]
+    start_time_column = appointment.start_time.columns[0]
+    location_column = appointment.location.columns[0]
+    # Spalten der Verknüpfungstabelle Appointment <-> Person
+    link_person_column = appointment.persons.columns[0]
+    link_appointment_column = person.appointments.columns[0]
+
+    return [
+        ("idx_appointment__date_start_time", appointment._table_, [date_column, start_time_column]),
+        ("idx_appointment__location_date", appointment._table_, [location_column, date_column]),
+        ("idx_appointment_person__person_appointment", appointment.persons.table,
+         [link_person_column, link_appointment_column]),
+    ]
+
+
+@db_session
+def ensure_indexes(db: Database) -> List[str]:
+    """
+    Legt fehlende Indizes an. Bereits vorhandene Indizes bleiben unverändert.
+
+    Args:
+        db: Die gemappte Datenbank
+
+    Returns:
+        Liste der Namen aller sichergestellten Indizes
+    """
+    quote = db.provider.quote_name
+    ensured = []
+    for index_name, table_name, columns in get_index_definitions(db):
+        column_list = ", ".join(quote(column) for column in columns)
+        db.execute(
+            f"CREATE INDEX IF NOT EXISTS {quote(index_name)} ON {quote(table_name)} ({column_list})"
+        )
+        ensured.append(index_name)
+    return ensured
+
+
+if __name__ == "__main__":
+    from database import setup_database
+
+    # setup_database führt ensure_indexes bereits aus
+    database = setup_database()
+    for name in ensure_indexes(database):
+        print(f"Index vorhanden: {name}")
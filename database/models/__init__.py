@@ -1,5 +1,16 @@
 from .base import db
-from .entities import Person, Address, LocationOfWork, Appointment, Plan, PlanPeriod, Team, Project
+from .entities import (
+    Person,
+    Address,
+    LocationOfWork,
+    Appointment,
+    Plan,
+    PlanPeriod,
+    Team,
+    Project,
+    DataVersion,
+    ExternalKey,
+)
 from .auth import User
 
 __all__ = [
@@ -12,5 +23,7 @@ __all__ = [
     'PlanPeriod',
     'Team',
     'Project',
+    'DataVersion',
+    'ExternalKey',
     'User'
 ]
\ No newline at end of file
@@ -2,7 +2,7 @@ import datetime
 from datetime import date, time, timedelta
 from uuid import UUID
 
-from pony.orm import Required, Optional as PonyOptional, Set, Json, PrimaryKey
+from pony.orm import Required, Optional as PonyOptional, Set, Json, PrimaryKey, composite_index
 
 from .base import db
 
@@ -54,6 +54,9 @@ class Appointment(db.Entity):
     guests = Required(Json, default=[])
     notes = PonyOptional(str)
     plans = Set('Plan')
+    # Indizes für Kalender-, Überschneidungs- und Verlaufsabfragen
+    composite_index(date, start_time)
+    composite_index(location, date)
 
 class Plan(db.Entity):
     id = PrimaryKey(UUID, auto=True)
@@ -75,3 +78,26 @@ class Project(db.Entity):
     active = Required(bool, default=False)
     persons = Set('Person', reverse='project')
     admin = PonyOptional('Person', reverse='project_of_admin')
+
+class DataVersion(db.Entity):
+    """
+    Änderungszähler je Datenbereich (z.B. Termine eines Monats), Grundlage für ETags.
+    """
+    _table_ = "data_version"
+    scope = PrimaryKey(str)
+    version = Required(int, size=64, default=0)
+    changed_at = Required(float)  # Unix-Zeitstempel der letzten Änderung
+
+class ExternalKey(db.Entity):
+    """
+    Stabiler Schlüssel eines externen Systems und Inhalts-Hash einer synchronisierten Entität
+    (Planungsperiode, Plan oder Termin), Grundlage des Abgleichs von Planungsperioden.
+    """
+    _table_ = "external_key"
+    entity_type = Required(str, 20)
+    external_id = Required(str)
+    PrimaryKey(entity_type, external_id)
+    entity_id = Required(UUID, unique=True)
+    plan_period_id = Required(UUID)
+    content_hash = Required(str, 64)
+    composite_index(plan_period_id, entity_type)
@@ -0,0 +1,412 @@
+"""
+Volltext-Suchindex für Termine, Personen und Arbeitsorte.
+
+SQLite nutzt eine FTS5-Tabelle, PostgreSQL eine Tabelle mit generierter tsvector-Spalte und
+GIN-Index. Beide speichern je Eintrag Entitätstyp, Entitäts-ID und den durchsuchbaren Text,
+sodass weitere Entitätstypen ohne Schemaänderung aufgenommen werden können.
+
+Der Index wird von der Anwendung gepflegt: Services indizieren geänderte Entitäten in derselben
+Transaktion wie die Änderung. Beim Start gleicht ensure_search_index() den Index je Entitätstyp
+mit dem Datenbestand ab und baut ihn neu auf, wenn außerhalb der Anwendung geschrieben wurde.
+
+Neu aufbauen mit: python -m database.search_index
+"""
+import os
+import re
+from typing import Dict, Iterable, List, Optional
+from uuid import UUID
+
+from pony.orm import Database, db_session, count
+
+SEARCH_INDEX_TABLE = "search_index"
+
+APPOINTMENT = "appointment"
+PERSON = "person"
+LOCATION = "location"
+
+# Anzahl der Entitäten, die beim Neuaufbau gemeinsam geladen und geschrieben werden
+REBUILD_BATCH_SIZE = 1000
+
+# Anzahl der IDs je DELETE; hält die Zahl der Parameter unter den Grenzen der Provider
+# (z.B. 999 bei älteren SQLite-Versionen)
+REMOVE_BATCH_SIZE = 500
+
+# Obergrenze der Treffer, die nach Relevanz sortiert werden. Hält die Latenz bei sehr
+# allgemeinen Suchbegriffen (z.B. zwei Buchstaben) unabhängig von der Tabellengröße.
+SEARCH_CANDIDATE_LIMIT = int(os.environ.get("SEARCH_CANDIDATE_LIMIT", "1000"))
+
+# Verfügbarkeit des Index je gebundener Datenbank, wird von ensure_search_index() gesetzt
+_available = {}
+
+
+def _is_postgres(db: Database) -> bool:
+    return db.provider.dialect == "PostgreSQL"
+
+
+def _placeholder(db: Database) -> str:
+    return "%s" if _is_postgres(db) else "?"
+
+
+def _create_search_index(db: Database) -> None:
+    """Legt die providerspezifischen Tabellen und Indizes an, sofern sie fehlen."""
+    if _is_postgres(db):
+        db.execute(
+            f"CREATE TABLE IF NOT EXISTS {SEARCH_INDEX_TABLE} ("
+            "entity_type VARCHAR(20) NOT NULL, "
+            "entity_id UUID NOT NULL, "
+            "content TEXT NOT NULL, "
+            "document TSVECTOR GENERATED ALWAYS AS (to_tsvector('simple', content)) STORED, "
+            "PRIMARY KEY (entity_type, entity_id))"
+        )
+        db.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{SEARCH_INDEX_TABLE}__document "
+            f"ON {SEARCH_INDEX_TABLE} USING GIN (document)"
+        )
+    else:
+        # Ältere Indizes führten entity_type als UNINDEXED-Spalte; die Suche je Typ muss den Typ
+        # aber im Volltextindex nachschlagen können. Solche Tabellen werden neu angelegt.
+        existing = db.select(f"SELECT sql FROM sqlite_master WHERE name = '{SEARCH_INDEX_TABLE}'")
+        if existing and "entity_type UNINDEXED" in existing[0]:
+            db.execute(f"DROP TABLE {SEARCH_INDEX_TABLE}")
+        # Präfix-Indizes für 2 und 3 Zeichen machen Suchen während der Eingabe günstig
+        db.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_INDEX_TABLE} USING fts5("
+            "entity_type, entity_id UNINDEXED, content, "
+            "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+        )
+
+
+def ensure_search_index(db: Database) -> bool:
+    """
+    Legt den Suchindex an und baut die Einträge der Entitätstypen neu auf, deren Anzahl nicht
+    zum Datenbestand passt.
+
+    Args:
+        db: Die gemappte Datenbank
+
+    Returns:
+        True, wenn der Suchindex verfügbar ist; sonst False (z.B. SQLite ohne FTS5)
+    """
+    try:
+        with db_session:
+            _create_search_index(db)
+    except Exception:
+        _available[id(db)] = False
+        return False
+    _available[id(db)] = True
+
+    with db_session:
+        stale_types = [
+            entity_type for entity_type, (entity_name, _, _) in _DOCUMENT_SOURCES.items()
+            if count(e for e in db.entities[entity_name]) != db.select(
+                f"SELECT COUNT(*) FROM {SEARCH_INDEX_TABLE} WHERE entity_type = $entity_type"
+            )[0]
+        ]
+    if stale_types:
+        rebuild_search_index(db, stale_types)
+    return True
+
+
+def is_search_index_available(db: Database) -> bool:
+    """
+    Gibt an, ob der Suchindex für die Datenbank angelegt wurde und genutzt werden kann.
+
+    Args:
+        db: Die gemappte Datenbank
+
+    Returns:
+        True, wenn ensure_search_index() den Index erfolgreich angelegt hat
+    """
+    return _available.get(id(db), False)
+
+
+def build_appointment_document(appointment) -> str:
+    """
+    Baut den durchsuchbaren Text eines Termins aus Notizen, Personen, Arbeitsort und Gästen.
+
+    Args:
+        appointment: Der Termin (PonyORM-Entität)
+
+    Returns:
+        Der zu indizierende Text
+    """
+    return compose_appointment_document(
+        appointment.notes,
+        appointment.location.name,
+        [(p.f_name, p.l_name) for p in appointment.persons],
+        appointment.guests
+    )
+
+
+def compose_appointment_document(
+    notes: Optional[str],
+    location_name: str,
+    person_names: Iterable[tuple],
+    guests: Optional[Iterable] = None,
+) -> str:
+    """
+    Baut den durchsuchbaren Text eines Termins aus seinen Bestandteilen, ohne die Entität zu laden.
+
+    Args:
+        notes: Die Notizen des Termins
+        location_name: Der Name des Arbeitsortes
+        person_names: (Vorname, Nachname) der zugeordneten Personen
+        guests: Optional. Die Gäste des Termins
+
+    Returns:
+        Der zu indizierende Text
+    """
+    parts = [notes or "", location_name]
+    parts.extend(f"{f_name} {l_name}" for f_name, l_name in person_names)
+    parts.extend(str(guest) for guest in guests or [])
+    return " ".join(part for part in parts if part)
+
+
+def build_person_document(person) -> str:
+    """
+    Baut den durchsuchbaren Text einer Person aus Namen und E-Mail-Adresse.
+
+    Args:
+        person: Die Person (PonyORM-Entität)
+
+    Returns:
+        Der zu indizierende Text
+    """
+    return " ".join(part for part in (person.f_name, person.l_name, person.email) if part)
+
+
+def build_location_document(location) -> str:
+    """
+    Baut den durchsuchbaren Text eines Arbeitsortes aus Namen und Adresse.
+
+    Args:
+        location: Der Arbeitsort (PonyORM-Entität)
+
+    Returns:
+        Der zu indizierende Text
+    """
+    address = location.address
+    return " ".join((location.name, address.street, address.postal_code, address.city))
+
+
+# Entitätstyp -> (Entitätsname, Textaufbau, beim Neuaufbau vorab zu ladende Beziehungen)
+_DOCUMENT_SOURCES = {
+    APPOINTMENT: ("Appointment", build_appointment_document, ("location", "persons")),
+    PERSON: ("Person", build_person_document, ()),
+    LOCATION: ("LocationOfWork", build_location_document, ("address",)),
+}
+
+
+def remove_documents(db: Database, entity_type: str, entity_ids: Iterable[UUID]) -> None:
+    """
+    Entfernt Einträge aus dem Suchindex. Muss innerhalb einer db_session aufgerufen werden.
+
+    Die IDs werden in Gruppen zu je REMOVE_BATCH_SIZE gelöscht, sodass beliebig viele IDs
+    übergeben werden können.
+
+    Args:
+        db: Die gemappte Datenbank
+        entity_type: Der Entitätstyp (z.B. APPOINTMENT)
+        entity_ids: Die IDs der zu entfernenden Entitäten
+    """
+    ids = [str(entity_id) for entity_id in entity_ids]
+    if not ids or not is_search_index_available(db):
+        return
+    placeholder = _placeholder(db)
+    cursor = db.get_connection().cursor()
+    for offset in range(0, len(ids), REMOVE_BATCH_SIZE):
+        batch = ids[offset:offset + REMOVE_BATCH_SIZE]
+        id_list = ", ".join([placeholder] * len(batch))
+        cursor.execute(
+            f"DELETE FROM {SEARCH_INDEX_TABLE} "
+            f"WHERE entity_type = {placeholder} AND entity_id IN ({id_list})",
+            [entity_type, *batch],
+        )
+
+
+def _insert_documents(db: Database, documents: List[tuple]) -> None:
+    """Fügt Einträge (Entitätstyp, Entitäts-ID, Text) gesammelt in den Suchindex ein."""
+    placeholder = _placeholder(db)
+    cursor = db.get_connection().cursor()
+    cursor.executemany(
+        f"INSERT INTO {SEARCH_INDEX_TABLE} (entity_type, entity_id, content) "
+        f"VALUES ({placeholder}, {placeholder}, {placeholder})",
+        documents
+    )
+
+
+def index_entities(db: Database, entity_type: str, entities: Iterable) -> None:
+    """
+    Schreibt die Einträge der übergebenen Entitäten neu in den Suchindex.
+
+    Muss innerhalb der db_session aufgerufen werden, in der die Entitäten geändert wurden,
+    damit Index und Daten gemeinsam gespeichert werden.
+
+    Args:
+        db: Die gemappte Datenbank
+        entity_type: Der Entitätstyp (APPOINTMENT, PERSON oder LOCATION)
+        entities: Die Entitäten (PonyORM-Entitäten des Typs)
+    """
+    if not is_search_index_available(db):
+        return
+    build_document = _DOCUMENT_SOURCES[entity_type][1]
+    documents = [(entity_type, str(e.id), build_document(e)) for e in entities]
+    if not documents:
+        return
+    # Ausstehende Änderungen der Entitäten vor dem direkten Zugriff auf die Verbindung schreiben
+    db.flush()
+    remove_documents(db, entity_type, [document[1] for document in documents])
+    _insert_documents(db, documents)
+
+
+def index_new_documents(db: Database, entity_type: str, documents: Iterable[tuple]) -> None:
+    """
+    Nimmt Einträge neu angelegter Entitäten in den Suchindex auf, z.B. nach einem Import mit
+    BulkInserter. Vorhandene Einträge werden nicht entfernt; für geänderte Entitäten
+    index_entities() verwenden. Muss innerhalb der db_session des Imports aufgerufen werden.
+
+    Args:
+        db: Die gemappte Datenbank
+        entity_type: Der Entitätstyp (APPOINTMENT, PERSON oder LOCATION)
+        documents: (Entitäts-ID, Text) je neuer Entität
+    """
+    if not is_search_index_available(db):
+        return
+    rows = [(entity_type, str(entity_id), content) for entity_id, content in documents]
+    if rows:
+        _insert_documents(db, rows)
+
+
+def rebuild_search_index(db: Database, entity_types: Optional[Iterable[str]] = None) -> int:
+    """
+    Baut den Suchindex neu auf.
+
+    Args:
+        db: Die gemappte Datenbank
+        entity_types: Optional. Neu aufzubauende Entitätstypen; ohne Angabe alle
+
+    Returns:
+        Anzahl der indizierten Entitäten
+    """
+    indexed = 0
+    with db_session:
+        for entity_type in entity_types or _DOCUMENT_SOURCES:
+            entity_name, build_document, prefetch = _DOCUMENT_SOURCES[entity_type]
+            entity = db.entities[entity_name]
+            db.execute(f"DELETE FROM {SEARCH_INDEX_TABLE} WHERE entity_type = $entity_type")
+            query = entity.select().order_by(entity.id)
+            if prefetch:
+                query = query.prefetch(*(getattr(entity, name) for name in prefetch))
+            page = 1
+            while True:
+                batch = query.page(page, REBUILD_BATCH_SIZE)
+                if not batch:
+                    break
+                _insert_documents(db, [(entity_type, str(e.id), build_document(e)) for e in batch])
+                indexed += len(batch)
+                page += 1
+    return indexed
+
+
+def build_match_query(db: Database, search_term: str) -> Optional[str]:
+    """
+    Wandelt einen Suchbegriff in eine Präfix-Abfrage für den jeweiligen Provider um.
+
+    Jedes Wort muss als Wortanfang vorkommen; Sonderzeichen der Abfragesprachen werden verworfen.
+
+    Args:
+        db: Die gemappte Datenbank
+        search_term: Der eingegebene Suchbegriff
+
+    Returns:
+        Die Abfrage für MATCH bzw. to_tsquery, oder None, wenn der Begriff keine Wörter enthält
+    """
+    tokens = re.findall(r"\w+", search_term.lower())
+    if not tokens:
+        return None
+    if _is_postgres(db):
+        return " & ".join(f"{token}:*" for token in tokens)
+    return "content : (" + " ".join(f'"{token}"*' for token in tokens) + ")"
+
+
+def search_entity_ids(db: Database, entity_type: str, search_term: str, limit: int) -> List[UUID]:
+    """
+    Sucht im Index und liefert die IDs der besten Treffer eines Entitätstyps nach Relevanz.
+
+    Muss innerhalb einer db_session aufgerufen werden.
+
+    Args:
+        db: Die gemappte Datenbank
+        entity_type: Der Entitätstyp (APPOINTMENT, PERSON oder LOCATION)
+        search_term: Der Suchbegriff
+        limit: Maximale Anzahl der Treffer
+
+    Returns:
+        Liste der Entitäts-IDs, beste Treffer zuerst
+    """
+    return search_grouped_entity_ids(db, search_term, {entity_type: limit})[entity_type]
+
+
+def search_grouped_entity_ids(
+    db: Database, search_term: str, limits: Dict[str, int]
+) -> Dict[str, List[UUID]]:
+    """
+    Sucht mit einer einzigen Abfrage über mehrere Entitätstypen, mit eigener Obergrenze je Typ.
+
+    Sortiert werden je Typ höchstens SEARCH_CANDIDATE_LIMIT Treffer; bei mehr Treffern ist die
+    Reihenfolge daher nur innerhalb dieser Kandidaten nach Relevanz. Muss innerhalb einer
+    db_session aufgerufen werden.
+
+    Args:
+        db: Die gemappte Datenbank
+        search_term: Der Suchbegriff
+        limits: Entitätstyp -> maximale Anzahl der Treffer
+
+    Returns:
+        Entitätstyp -> Liste der Entitäts-IDs, beste Treffer zuerst
+    """
+    results = {entity_type: [] for entity_type in limits}
+    match_query = build_match_query(db, search_term)
+    selected = [(entity_type, int(limit)) for entity_type, limit in limits.items() if limit > 0]
+    if match_query is None or not selected:
+        return results
+
+    candidate_limit = max(SEARCH_CANDIDATE_LIMIT, *(limit for _, limit in selected))
+    if _is_postgres(db):
+        # Rang negiert, damit in beiden Providern kleinere Werte besser sind
+        branch = (
+            "SELECT entity_type, entity_id, "
+            "-ts_rank(document, to_tsquery('simple', $match_query)) AS score "
+            f"FROM (SELECT entity_type, entity_id, document FROM {SEARCH_INDEX_TABLE} "
+            "WHERE entity_type = '{entity_type}' "
+            "AND document @@ to_tsquery('simple', $match_query) "
+            "LIMIT $candidate_limit) candidates ORDER BY score LIMIT {limit}"
+        )
+    else:
+        branch = (
+            "SELECT entity_type, entity_id, score "
+            f"FROM (SELECT entity_type, entity_id, rank AS score FROM {SEARCH_INDEX_TABLE} "
+            f"WHERE {SEARCH_INDEX_TABLE} "
+            "MATCH ('entity_type : {entity_type} AND ' || $match_query) "
+            "LIMIT $candidate_limit) candidates ORDER BY score LIMIT {limit}"
+        )
+    # Entitätstypen stammen aus _DOCUMENT_SOURCES und werden daher direkt eingesetzt
+    sql = " UNION ALL ".join(
+        f"SELECT * FROM ({branch.format(entity_type=entity_type, limit=limit)}) {entity_type}_hits"
+        for entity_type, limit in selected
+        if entity_type in _DOCUMENT_SOURCES
+    )
+    rows = sorted(db.select(sql), key=lambda row: row[2])
+    for entity_type, entity_id, _ in rows:
+        results[entity_type].append(entity_id if isinstance(entity_id, UUID) else UUID(entity_id))
+    return results
+
+
+if __name__ == "__main__":
+    from database import setup_database
+
+    database = setup_database()
+    if is_search_index_available(database):
+        print(f"{rebuild_search_index(database)} Einträge indiziert")
+    else:
+        print("Suchindex nicht verfügbar")
@@ -3,11 +3,15 @@ from contextlib import asynccontextmanager
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 
-from api.routes import api_router, web_router
-from database import setup_database
+from api.routes import api_router, web_router, metrics_router
+from database import setup_database, db
+from api.middleware.compression import CompressionMiddleware
 from api.middleware.error_handler import register_exception_handlers
+from api.middleware.metrics import MetricsMiddleware
+from api.static_assets import PrecompressedStaticFiles
+from api.templates import precompile_templates_on_startup
+from api.utils.metrics import instrument_database
 
 # Lifespan-Kontext-Manager für Anwendungsstart und -ende
 @asynccontextmanager
@@ -15,6 +19,8 @@ async def lifespan(app: FastAPI):
     # Startup
     setup_database()
     print("Datenbank initialisiert")
+    instrument_database(db)
+    precompile_templates_on_startup()
     yield
     # Shutdown
     pass
@@ -28,8 +34,12 @@ app.include_router(api_router, prefix="/api")
 # Web-Routen einbinden (beinhaltet jetzt auch die Planning-Routen)
 app.include_router(web_router, tags=["web"])
 
-# Statische Dateien
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# Prometheus-Metriken
+app.include_router(metrics_router)
+
+# Statische Dateien (gehashte, vorkomprimierte Varianten unter /static/dist,
+# siehe api/static_assets.py)
+app.mount("/static", PrecompressedStaticFiles(directory="static"), name="static")
 
 # CORS-Middleware hinzufügen
 app.add_middleware(
@@ -38,8 +48,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Link"],  # Paginierung der Terminliste
 )
 
+# Komprimierung von HTML- und JSON-Antworten (nach CORS hinzugefügt, umschließt also CORS)
+app.add_middleware(CompressionMiddleware)
+
+# Messung von Antwortzeit, SQL-Anweisungen und Renderzeit (äußerste Middleware)
+app.add_middleware(MetricsMiddleware)
+
 # Exception-Handler registrieren
 register_exception_handlers(app)
 
@@ -1,18 +1,36 @@
 """
 Dieses Skript fügt Testdaten in die Datenbank ein.
 Ausführen mit: python seed.py
+
+Große, reproduzierbare Datenbestände für Benchmarks und Profiling (siehe seed_large_database):
+python seed.py --large [--persons 20000] [--locations 300] [--appointments 1000000] [--teams 40]
+    [--months 24] [--start-date 2025-01-01] [--seed 42] [--batch-size 10000] [--with-base-data]
 """
 
+import argparse
 import datetime
 import uuid
 from datetime import date, timedelta
 import json
 import random
+from typing import Dict, List, Optional, Sequence
 
 from pony.orm import db_session, commit
 
 from database import setup_database
-from database.models import Address, LocationOfWork, Person, PlanPeriod, Appointment, Plan, Team, Project
+from database.models import (
+    db,
+    Address,
+    LocationOfWork,
+    Person,
+    PlanPeriod,
+    Appointment,
+    Plan,
+    Team,
+    Project,
+)
+from database.bulk_insert import BulkInserter
+from database.search_index import is_search_index_available, rebuild_search_index
 
 
 @db_session
@@ -320,9 +338,453 @@ def seed_database():
     print("Testdaten erfolgreich eingefügt!")
 
 
+# Stammdaten für den großen Datenbestand; Gewichte bilden die ungleiche Verteilung realer Daten ab
+FIRST_NAMES = [
+    "Anna",
+    "Ben",
+    "Clara",
+    "David",
+    "Emma",
+    "Felix",
+    "Greta",
+    "Hannah",
+    "Jonas",
+    "Karl",
+    "Lea",
+    "Lukas",
+    "Marie",
+    "Noah",
+    "Paul",
+    "Sophie",
+    "Tim",
+    "Uwe",
+    "Vera",
+    "Lena",
+    "Elias",
+    "Mia",
+    "Finn",
+    "Laura",
+    "Leon",
+    "Sarah",
+    "Jan",
+    "Julia",
+    "Moritz",
+    "Katrin",
+    "Stefan",
+    "Sabine",
+    "Thomas",
+    "Petra",
+    "Jürgen",
+    "Özlem",
+    "Mehmet",
+    "Aylin",
+    "Nikola",
+    "Ivana",
+]
+LAST_NAMES = [
+    "Müller",
+    "Schmidt",
+    "Schneider",
+    "Fischer",
+    "Weber",
+    "Meyer",
+    "Wagner",
+    "Becker",
+    "Schulz",
+    "Hoffmann",
+    "Schäfer",
+    "Koch",
+    "Bauer",
+    "Richter",
+    "Klein",
+    "Wolf",
+    "Schröder",
+    "Neumann",
+    "Schwarz",
+    "Zimmermann",
+    "Braun",
+    "Krüger",
+    "Hofmann",
+    "Hartmann",
+    "Lange",
+    "Schmitt",
+    "Werner",
+    "Krause",
+    "Meier",
+    "Lehmann",
+    "Yilmaz",
+    "Kaya",
+    "Nowak",
+    "Kowalski",
+    "Petrović",
+    "Jansen",
+    "Peters",
+    "Vogel",
+    "Fuchs",
+    "Keller",
+]
+# (Stadt, Postleitzahl-Präfix, Gewicht)
+CITIES = [
+    ("Berlin", "10", 10),
+    ("Hamburg", "20", 7),
+    ("München", "80", 7),
+    ("Köln", "50", 5),
+    ("Frankfurt", "60", 4),
+    ("Stuttgart", "70", 4),
+    ("Düsseldorf", "40", 3),
+    ("Leipzig", "04", 3),
+    ("Dortmund", "44", 3),
+    ("Essen", "45", 2),
+    ("Bremen", "28", 2),
+    ("Dresden", "01", 2),
+    ("Hannover", "30", 2),
+    ("Nürnberg", "90", 2),
+    ("Mainz", "55", 1),
+    ("Freiburg", "79", 1),
+    ("Heidelberg", "69", 1),
+    ("Kassel", "34", 1),
+    ("Rostock", "18", 1),
+    ("Ulm", "89", 1),
+]
+STREETS = [
+    "Hauptstraße",
+    "Bahnhofstraße",
+    "Schulstraße",
+    "Gartenstraße",
+    "Dorfstraße",
+    "Bergstraße",
+    "Kirchstraße",
+    "Lindenstraße",
+    "Waldstraße",
+    "Ringstraße",
+    "Marktplatz",
+    "Parkallee",
+    "Goethestraße",
+    "Schillerstraße",
+]
+LOCATION_KINDS = [
+    "Klinikum",
+    "Kinderklinik",
+    "Seniorenheim",
+    "Hospiz",
+    "Reha-Zentrum",
+    "Krankenhaus",
+    "Pflegeheim",
+]
+
+# Wochentage Montag bis Sonntag; am Wochenende finden deutlich weniger Termine statt
+WEEKDAY_WEIGHTS = [10, 10, 10, 10, 9, 3, 1]
+# Startzeiten im Viertelstundenraster von 7:00 bis 18:45, Schwerpunkt vormittags und am frühen
+# Nachmittag
+START_TIMES = [datetime.time(hour, minute) for hour in range(7, 19) for minute in (0, 15, 30, 45)]
+START_TIME_WEIGHTS = [
+    {7: 2, 8: 6, 9: 10, 10: 10, 11: 8, 12: 3, 13: 6, 14: 8, 15: 7, 16: 5, 17: 3, 18: 1}[t.hour]
+    * (3 if t.minute in (0, 30) else 1)
+    for t in START_TIMES
+]
+DURATIONS = [timedelta(minutes=minutes) for minutes in (30, 45, 60, 90, 120, 180, 240)]
+DURATION_WEIGHTS = [3, 4, 10, 8, 6, 2, 1]
+PARTICIPANT_COUNTS = [1, 2, 3, 4]
+PARTICIPANT_WEIGHTS = [45, 35, 15, 5]
+GUEST_COUNTS = [0, 1, 2, 3]
+GUEST_WEIGHTS = [75, 15, 7, 3]
+
+# Anteil der Personen ohne Team (u.a. die Dispatcher) und Anzahl Arbeitsorte je Team
+PERSONS_WITHOUT_TEAM_SHARE = 0.05
+LOCATIONS_PER_TEAM = 15
+
+
+def _flush_batch(*inserters: BulkInserter) -> None:
+    """Schreibt die Zeilen mehrerer Tabellen in Abhängigkeitsreihenfolge und bestätigt sie."""
+    with db_session:
+        for inserter in inserters:
+            inserter.flush()
+
+
+def _zipf_weights(count: int, exponent: float = 1.0) -> List[float]:
+    """Gewichte 1/rang^exponent: wenige große, viele kleine Einträge."""
+    return [1 / (rank + 1) ** exponent for rank in range(count)]
+
+
+def _distribute(total: int, weights: Sequence[float]) -> List[int]:
+    """Verteilt total ganzzahlig proportional zu den Gewichten (Verfahren der größten Reste)."""
+    weight_sum = sum(weights)
+    exact = [total * weight / weight_sum for weight in weights]
+    counts = [int(value) for value in exact]
+    remainders = sorted(range(len(weights)), key=lambda i: exact[i] - counts[i], reverse=True)
+    for i in remainders[: total - sum(counts)]:
+        counts[i] += 1
+    return counts
+
+
+def _email_local_part(*names: str) -> str:
+    name = ".".join(names).lower()
+    for umlaut, replacement in (("ä", "ae"), ("ö", "oe"), ("ü", "ue"), ("ß", "ss"), ("ć", "c")):
+        name = name.replace(umlaut, replacement)
+    return name
+
+
+def _add_months(start: date, months: int) -> date:
+    month_index = start.month - 1 + months
+    return date(start.year + month_index // 12, month_index % 12 + 1, 1)
+
+
+def seed_large_database(
+    persons: int = 20000,
+    locations: int = 300,
+    appointments: int = 1000000,
+    teams: int = 40,
+    months: int = 24,
+    start_date: Optional[date] = None,
+    seed: int = 42,
+    batch_size: int = 10000,
+    with_base_data: bool = False,
+) -> Dict[str, int]:
+    """
+    Erzeugt einen großen, reproduzierbaren Datenbestand für Benchmarks und Profiling.
+
+    Teams erhalten je Monat eine Planungsperiode mit Plan; die Termine einer Periode finden an
+    den Arbeitsorten des Teams statt und werden mit dessen Mitarbeitern besetzt. Teamgrößen und
+    die Auslastung der Arbeitsorte folgen einer Zipf-Verteilung, Wochentage, Startzeiten, Dauern,
+    Teilnehmer- und Gästezahlen realistischen Gewichten. Mit gleichem seed und start_date
+    entstehen identische Daten einschließlich der IDs; ausgenommen sind die mit with_base_data
+    eingefügten Testdaten, deren IDs zufällig vergeben werden.
+
+    Die Zeilen werden ohne PonyORM-Entitäten gesammelt mit executemany geschrieben und je
+    batch_size Terminen in einer eigenen Transaktion bestätigt, sodass der Speicherbedarf
+    unabhängig von der Anzahl der Termine bleibt. Der Suchindex wird abschließend neu aufgebaut.
+
+    Args:
+        persons: Anzahl der Personen
+        locations: Anzahl der Arbeitsorte (mit je einer Adresse)
+        appointments: Anzahl der Termine
+        teams: Anzahl der Teams
+        months: Anzahl der Monate mit Planungsperioden
+        start_date: Optional. Erster Monat der Planungsperioden; ohne Angabe so gewählt, dass
+            der aktuelle Monat in der Mitte liegt
+        seed: Startwert des Zufallsgenerators
+        batch_size: Anzahl der Termine je Transaktion
+        with_base_data: Zuvor die Testdaten aus seed_database() einfügen (nicht reproduzierbar)
+
+    Returns:
+        Anzahl der geschriebenen Zeilen je Tabelle
+    """
+    if teams < 1 or persons < 2 * teams or locations < 1 or months < 1:
+        raise ValueError(
+            "Mindestens ein Team mit Dispatcher und Mitarbeiter, ein Arbeitsort und ein Monat"
+        )
+
+    if with_base_data:
+        random.seed(seed)
+        seed_database()
+
+    rng = random.Random(seed)
+
+    def new_id() -> uuid.UUID:
+        return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+    if start_date is None:
+        start_date = _add_months(date.today().replace(day=1), -(months // 2))
+    start_date = start_date.replace(day=1)
+
+    print("Erstelle Adressen und Arbeitsorte...")
+    address_inserter = BulkInserter.for_entity(Address, ["id", "street", "postal_code", "city"])
+    location_inserter = BulkInserter.for_entity(LocationOfWork, ["id", "name", "address"])
+    city_weights = [weight for _, _, weight in CITIES]
+    location_ids = []
+    for i in range(locations):
+        city, postal_prefix, _ = rng.choices(CITIES, city_weights)[0]
+        address_id, location_id = new_id(), new_id()
+        address_inserter.add(
+            address_id,
+            f"{rng.choice(STREETS)} {rng.randint(1, 150)}",
+            f"{postal_prefix}{rng.randint(0, 999):03d}",
+            city,
+        )
+        location_inserter.add(
+            location_id, f"{rng.choice(LOCATION_KINDS)} {city} {i + 1}", address_id
+        )
+        location_ids.append(location_id)
+    _flush_batch(address_inserter, location_inserter)
+    # Wenige Arbeitsorte mit sehr vielen Terminen, viele mit wenigen
+    location_weights = _zipf_weights(locations, 0.8)
+
+    print("Erstelle Projekte, Personen und Teams...")
+    project_count = max(3, teams // 4)
+    project_inserter = BulkInserter.for_entity(Project, ["id", "name", "active"])
+    project_ids = [new_id() for _ in range(project_count)]
+    for i, project_id in enumerate(project_ids):
+        project_inserter.add(project_id, f"Projekt {i + 1}", rng.random() < 0.8)
+
+    person_inserter = BulkInserter.for_entity(
+        Person,
+        ["id", "f_name", "l_name", "email", "project", "team_of_employee", "project_of_admin"],
+    )
+    team_inserter = BulkInserter.for_entity(Team, ["id", "name", "dispatcher"])
+
+    def add_person(team_id: Optional[uuid.UUID], admin_of: Optional[uuid.UUID] = None) -> uuid.UUID:
+        person_id = new_id()
+        f_name, l_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        project_id = rng.choice(project_ids) if rng.random() < 0.3 else None
+        number = person_inserter.written + len(person_inserter.rows) + 1
+        email = f"{_email_local_part(f_name, l_name)}.{number}@example.com"
+        person_inserter.add(person_id, f_name, l_name, email, project_id, team_id, admin_of)
+        return person_id
+
+    # Dispatcher gehören keinem Team als Mitarbeiter an; die ersten verwalten die Projekte
+    team_ids = [new_id() for _ in range(teams)]
+    for i, team_id in enumerate(team_ids):
+        dispatcher_id = add_person(None, project_ids[i] if i < project_count else None)
+        team_inserter.add(team_id, f"Team {i + 1}", dispatcher_id)
+    _flush_batch(project_inserter, person_inserter, team_inserter)
+
+    # Übrige Personen: ein kleiner Teil ohne Team, sonst Zipf-verteilt auf die Teams
+    team_weights = _zipf_weights(teams, 0.7)
+    employees_by_team: List[List[uuid.UUID]] = [[] for _ in range(teams)]
+    for i in range(persons - teams):
+        if i >= teams and rng.random() < PERSONS_WITHOUT_TEAM_SHARE:
+            add_person(None)
+        else:
+            # Die ersten Personen verteilen sich reihum, damit jedes Team Mitarbeiter hat
+            team_index = i if i < teams else rng.choices(range(teams), team_weights)[0]
+            employees_by_team[team_index].append(add_person(team_ids[team_index]))
+        if len(person_inserter.rows) >= batch_size:
+            _flush_batch(person_inserter)
+    _flush_batch(person_inserter)
+
+    print("Erstelle Planungsperioden und Pläne...")
+    period_inserter = BulkInserter.for_entity(PlanPeriod, ["id", "name", "start_date", "end_date"])
+    period_team_inserter = BulkInserter.for_link(Team.plan_periods)
+    plan_inserter = BulkInserter.for_entity(Plan, ["id", "name", "notes", "plan_period"])
+    # Je Periode: (Perioden-ID, Plan-ID, Tage, Team-Index)
+    periods = []
+    for month in range(months):
+        period_start = _add_months(start_date, month)
+        period_end = _add_months(start_date, month + 1) - timedelta(days=1)
+        for team_index, team_id in enumerate(team_ids):
+            period_id, plan_id = new_id(), new_id()
+            label = f"Team {team_index + 1} {period_start.strftime('%Y-%m')}"
+            period_inserter.add(period_id, f"Planungsperiode {label}", period_start, period_end)
+            period_team_inserter.add(team_id, period_id)
+            plan_inserter.add(plan_id, f"Plan {label}", "", period_id)
+            days = [
+                period_start + timedelta(days=offset)
+                for offset in range((period_end - period_start).days + 1)
+            ]
+            periods.append((period_id, plan_id, days, team_index))
+    _flush_batch(period_inserter, period_team_inserter, plan_inserter)
+
+    # Jedes Team bedient einen festen Kreis von Arbeitsorten
+    team_locations = []
+    for _ in range(teams):
+        indices = sorted(set(rng.choices(range(locations), location_weights, k=LOCATIONS_PER_TEAM)))
+        team_locations.append(
+            ([location_ids[i] for i in indices], [location_weights[i] for i in indices])
+        )
+
+    print("Erstelle Termine...")
+    appointment_inserter = BulkInserter.for_entity(
+        Appointment,
+        ["id", "plan_period", "date", "start_time", "delta", "location", "guests", "notes"],
+    )
+    appointment_person_inserter = BulkInserter.for_link(Appointment.persons)
+    appointment_plan_inserter = BulkInserter.for_link(Appointment.plans)
+    # Termine je Periode proportional zur Teamgröße
+    counts = _distribute(
+        appointments, [len(employees_by_team[team_index]) for _, _, _, team_index in periods]
+    )
+    for (period_id, plan_id, days, team_index), count in zip(periods, counts):
+        employees = employees_by_team[team_index]
+        team_location_ids, team_location_weights = team_locations[team_index]
+        day_weights = [WEEKDAY_WEIGHTS[day.weekday()] for day in days]
+        appointment_dates = rng.choices(days, day_weights, k=count)
+        for appointment_date in appointment_dates:
+            appointment_id = new_id()
+            location_id = rng.choices(team_location_ids, team_location_weights)[0]
+            guests = [f"Gast {j + 1}" for j in range(rng.choices(GUEST_COUNTS, GUEST_WEIGHTS)[0])]
+            notes = (
+                f"Termin {appointment_inserter.written + len(appointment_inserter.rows) + 1}"
+                if rng.random() < 0.5
+                else ""
+            )
+            appointment_inserter.add(
+                appointment_id,
+                period_id,
+                appointment_date,
+                rng.choices(START_TIMES, START_TIME_WEIGHTS)[0],
+                rng.choices(DURATIONS, DURATION_WEIGHTS)[0],
+                location_id,
+                guests,
+                notes,
+            )
+            participant_count = min(
+                rng.choices(PARTICIPANT_COUNTS, PARTICIPANT_WEIGHTS)[0], len(employees)
+            )
+            for person_id in rng.sample(employees, participant_count):
+                appointment_person_inserter.add(appointment_id, person_id)
+            appointment_plan_inserter.add(appointment_id, plan_id)
+
+            if len(appointment_inserter.rows) >= batch_size:
+                _flush_batch(
+                    appointment_inserter, appointment_person_inserter, appointment_plan_inserter
+                )
+                print(f"  {appointment_inserter.written} von {appointments} Terminen")
+    _flush_batch(appointment_inserter, appointment_person_inserter, appointment_plan_inserter)
+
+    if is_search_index_available(db):
+        print("Baue Suchindex neu auf...")
+        rebuild_search_index(db)
+
+    written = {
+        "addresses": address_inserter.written,
+        "locations": location_inserter.written,
+        "projects": project_inserter.written,
+        "persons": person_inserter.written,
+        "teams": team_inserter.written,
+        "plan_periods": period_inserter.written,
+        "plans": plan_inserter.written,
+        "appointments": appointment_inserter.written,
+        "appointment_persons": appointment_person_inserter.written,
+    }
+    print(f"Großer Datenbestand erfolgreich eingefügt: {written}")
+    return written
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--large", action="store_true", help="Großen Datenbestand erzeugen")
+    parser.add_argument("--persons", type=int, default=20000)
+    parser.add_argument("--locations", type=int, default=300)
+    parser.add_argument("--appointments", type=int, default=1000000)
+    parser.add_argument("--teams", type=int, default=40)
+    parser.add_argument("--months", type=int, default=24)
+    parser.add_argument("--start-date", type=date.fromisoformat, default=None)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument(
+        "--with-base-data",
+        action="store_true",
+        help="Zuvor die Testdaten aus seed_database() einfügen",
+    )
+    args = parser.parse_args()
+
     # Datenbank einrichten
-    db = setup_database()
+    setup_database()
     
     # Testdaten einfügen
-    seed_database()
+    if args.large:
+        seed_large_database(
+            persons=args.persons,
+            locations=args.locations,
+            appointments=args.appointments,
+            teams=args.teams,
+            months=args.months,
+            start_date=args.start_date,
+            seed=args.seed,
+            batch_size=args.batch_size,
+            with_base_data=args.with_base_data,
+        )
+    else:
+        seed_database()